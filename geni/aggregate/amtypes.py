@@ -54,7 +54,7 @@ class ProtoGENI(AMType):
 
   def parseManifest (self, data):
     from ..rspec import pgmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = pgmanifest.Manifest(xml = data)
     else:
       manifest = pgmanifest.Manifest(xml = data["value"])
@@ -103,7 +103,7 @@ class VTS(AMType):
 
   def parseManifest (self, data):
     from ..rspec import vtsmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = vtsmanifest.Manifest(xml = data)
     else:
       manifest = vtsmanifest.Manifest(xml = data["value"])
@@ -121,7 +121,7 @@ class OESS(AMType):
 
   def parseManifest (self, data):
     from ..rspec import oessmanifest
-    if isinstance(data, (six.string_types)):
+    if isinstance(data, (six.string_types, bytes)):
       manifest = oessmanifest.Manifest(xml = data)
     else:
       manifest = oessmanifest.Manifest(xml = data["value"])
@@ -22,8 +22,15 @@ class ProvisionError(AMError): pass
 class RenewSliverError(AMError): pass
 class SliverStatusError(AMError): pass
 class POAError(AMError): pass
+class DeleteError(ProvisionError): pass
 # pylint: enable=multiple-statements
 
+def _raiseAMError (res, errclass):
+  if "am_type" in res["code"]:
+    if res["code"]["am_type"] == "protogeni":
+      ProtoGENI.raiseError(res)
+  raise errclass(res["output"], res)
+
 
 class AMAPIv3(object):
   @staticmethod
@@ -91,6 +98,8 @@ class AMAPIv3(object):
 
   @staticmethod
   def delete (context, url, sname, urns, options = None):
+    """Raises :py:class:`DeleteError` (a :py:class:`ProvisionError`, which older versions raised)
+    on failure, as does :py:meth:`adelete`."""
     from ..minigcf import amapi3 as AM3
 
     if not options: options = {}
@@ -101,18 +110,90 @@ class AMAPIv3(object):
     res = AM3.delete(url, False, context.cf.cert, context.cf.key, [sinfo], urns, options)
     if res["code"]["geni_code"] == 0:
       return res
-    if res["code"].has_key("am_type"):
-      if res["code"]["am_type"] == "protogeni":
-        ProtoGENI.raiseError(res)
-    raise ProvisionError(res["output"], res)
+    _raiseAMError(res, DeleteError)
+
+  @staticmethod
+  async def apoa (context, url, sname, action, urns = None, options = None):
+    """Coroutine version of :py:meth:`poa`."""
+    from ..minigcf.aio import amapi3 as AM3
+
+    sinfo = context.getSliceInfo(sname)
+    if not urns:
+      urns = [sinfo.urn]
+
+    res = await AM3.poa(url, False, context.cf.cert, context.cf.key, [sinfo], urns, action, options)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    _raiseAMError(res, POAError)
+
+  @staticmethod
+  async def apaa (context, url, action, options = None):
+    """Coroutine version of :py:meth:`paa`."""
+    from ..minigcf.aio import amapi3 as AM3
+
+    res = await AM3.paa(url, False, context.cf.cert, context.cf.key, action, options)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    raise POAError(res["output"], res)
+
+  @staticmethod
+  async def aallocate (context, url, sname, rspec, options = None):
+    """Coroutine version of :py:meth:`allocate`."""
+    if not options: options = {}
+    from ..minigcf.aio import amapi3 as AM3
+
+    sinfo = context.getSliceInfo(sname)
+
+    res = await AM3.allocate(url, False, context.cf.cert, context.cf.key, [sinfo], sinfo.urn, rspec, options)
+    if res["code"]["geni_code"] == 0:
+      return res
+    _raiseAMError(res, AllocateError)
+
+  @staticmethod
+  async def aprovision (context, url, sname, urns = None, options = None):
+    """Coroutine version of :py:meth:`provision`."""
+    from ..minigcf.aio import amapi3 as AM3
+
+    if not options: options = {}
+    if urns is not None:
+      if not isinstance(urns, list): urns = [urns]
+
+    sinfo = context.getSliceInfo(sname)
+    if not urns:
+      urns = [sinfo.urn]
+
+    res = await AM3.provision(url, False, context.cf.cert, context.cf.key, [sinfo], urns, options)
+    if res["code"]["geni_code"] == 0:
+      return res
+    _raiseAMError(res, ProvisionError)
+
+  @staticmethod
+  async def adelete (context, url, sname, urns, options = None):
+    """Coroutine version of :py:meth:`delete`."""
+    from ..minigcf.aio import amapi3 as AM3
+
+    if not options: options = {}
+    if not isinstance(urns, list): urns = [urns]
+
+    sinfo = context.getSliceInfo(sname)
+
+    res = await AM3.delete(url, False, context.cf.cert, context.cf.key, [sinfo], urns, options)
+    if res["code"]["geni_code"] == 0:
+      return res
+    _raiseAMError(res, DeleteError)
 
 
 class AMAPIv2(object):
   @staticmethod
-  def listresources (context, url, sname, options = None):
+  def listresources (context, url, sname, options = None, stream = False):
+    """If `options` contains a true `geni_compressed` value the returned `value` is
+    decompressed to a `bytes` XML document.  If `stream` is `True` the response is
+    decoded incrementally and `value` is an lxml root element instead (or the result of
+    a custom streaming parser, if `stream` is a parser factory)."""
     if not options: options = {}
 
     from ..minigcf import amapi2 as AM2
+    from ..minigcf.util import decompress
     creds = []
 
     surn = None
@@ -123,8 +204,10 @@ class AMAPIv2(object):
 
     creds.append(open(context.usercred_path, "r", encoding="latin-1").read())
 
-    res = AM2.listresources(url, False, context.cf.cert, context.cf.key, creds, options, surn)
+    res = AM2.listresources(url, False, context.cf.cert, context.cf.key, creds, options, surn, stream)
     if res["code"]["geni_code"] == 0:
+      if options.get("geni_compressed") and not stream:
+        res["value"] = decompress(res["value"])
       return res
     if "am_type" in res["code"]:
       if res["code"]["am_type"] == "protogeni":
@@ -200,6 +283,97 @@ class AMAPIv2(object):
       return res["value"]
     raise GetVersionError(res["output"], res)
 
+  @staticmethod
+  async def alistresources (context, url, sname, options = None):
+    """Coroutine version of :py:meth:`listresources`."""
+    if not options: options = {}
+
+    from ..minigcf.aio import amapi2 as AM2
+    from ..minigcf.util import decompress
+    creds = []
+
+    surn = None
+    if sname:
+      sinfo = context.getSliceInfo(sname)
+      surn = sinfo.urn
+      creds.append(open(sinfo.path, "r", encoding="latin-1").read())
+
+    creds.append(open(context.usercred_path, "r", encoding="latin-1").read())
+
+    res = await AM2.listresources(url, False, context.cf.cert, context.cf.key, creds, options, surn)
+    if res["code"]["geni_code"] == 0:
+      if options.get("geni_compressed"):
+        res["value"] = decompress(res["value"])
+      return res
+    _raiseAMError(res, ListResourcesError)
+
+  @staticmethod
+  async def acreatesliver (context, url, sname, rspec):
+    """Coroutine version of :py:meth:`createsliver`."""
+    from ..minigcf.aio import amapi2 as AM2
+
+    sinfo = context.getSliceInfo(sname)
+    cred_data = open(sinfo.path, "r", encoding="latin-1").read()
+
+    udata = []
+    for user in context._users:
+      data = {"urn" : user.urn, "keys" : [open(x, "r", encoding="latin-1").read() for x in user._keys]}
+      udata.append(data)
+
+    res = await AM2.createsliver(url, False, context.cf.cert, context.cf.key, [cred_data], sinfo.urn, rspec, udata)
+    if res["code"]["geni_code"] == 0:
+      return res
+    _raiseAMError(res, CreateSliverError)
+
+  @staticmethod
+  async def asliverstatus (context, url, sname):
+    """Coroutine version of :py:meth:`sliverstatus`."""
+    from ..minigcf.aio import amapi2 as AM2
+
+    sinfo = context.getSliceInfo(sname)
+    cred_data = open(sinfo.path, "r", encoding="latin-1").read()
+
+    res = await AM2.sliverstatus(url, False, context.cf.cert, context.cf.key, [cred_data], sinfo.urn)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    _raiseAMError(res, SliverStatusError)
+
+  @staticmethod
+  async def arenewsliver (context, url, sname, date):
+    """Coroutine version of :py:meth:`renewsliver`."""
+    from ..minigcf.aio import amapi2 as AM2
+
+    sinfo = context.getSliceInfo(sname)
+    cred_data = open(sinfo.path, "r", encoding="latin-1").read()
+
+    res = await AM2.renewsliver(url, False, context.cf.cert, context.cf.key, [cred_data], sinfo.urn, date)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    raise RenewSliverError(res["output"], res)
+
+  @staticmethod
+  async def adeletesliver (context, url, sname):
+    """Coroutine version of :py:meth:`deletesliver`."""
+    from ..minigcf.aio import amapi2 as AM2
+
+    sinfo = context.getSliceInfo(sname)
+    cred_data = open(sinfo.path, "r", encoding="latin-1").read()
+
+    res = await AM2.deletesliver(url, False, context.cf.cert, context.cf.key, [cred_data], sinfo.urn)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    raise DeleteSliverError(res["output"], res)
+
+  @staticmethod
+  async def agetversion (context, url):
+    """Coroutine version of :py:meth:`getversion`."""
+    from ..minigcf.aio import amapi2 as AM2
+
+    res = await AM2.getversion(url, False, context.cf.cert, context.cf.key)
+    if res["code"]["geni_code"] == 0:
+      return res["value"]
+    raise GetVersionError(res["output"], res)
+
 
 APIRegistry.register("amapiv2", AMAPIv2())
 APIRegistry.register("amapiv3", AMAPIv3())
@@ -0,0 +1,192 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from __future__ import absolute_import
+
+import hashlib
+import os
+import os.path
+import pickle
+import threading
+import time
+
+USE = "use"
+"""Serve a cached advertisement if it is younger than `max_age`, otherwise fetch and re-cache it."""
+
+REFRESH = "refresh"
+"""Always fetch from the aggregate, and update the cache."""
+
+DEFAULT_MAX_AGE = 3600
+
+_FORMAT = 1
+
+class AdvertisementCache(object):
+  """On-disk cache of parsed advertisements under `<context.datadir>/adcache`.
+
+  Entries are keyed by aggregate URN (the component manager ID, or the URL for aggregates without one)
+  and the `available` flag.  They hold the pickled advertisement object (see
+  :py:class:`geni.rspec.pgad.Advertisement`) and a digest of the document it was parsed from, so that
+  a stale entry whose document has not changed can be revalidated without re-parsing.
+
+  Advertisement types that cannot be pickled are silently not cached.
+  """
+
+  def __init__ (self, context):
+    self.path = os.path.join(context.datadir, "adcache")
+
+  @staticmethod
+  def _amkey (am):
+    try:
+      return am.component_manager_id
+    except Exception: # pylint: disable=broad-except
+      return am.url
+
+  def _entryPath (self, am, available):
+    digest = hashlib.sha1(AdvertisementCache._amkey(am).encode("utf-8")).hexdigest()
+    return os.path.join(self.path, "%s-%s.pickle" % (digest, "avail" if available else "all"))
+
+  def _read (self, am, available, max_age, header_only):
+    path = self._entryPath(am, available)
+    try:
+      if max_age is not None and (time.time() - os.path.getmtime(path)) > max_age:
+        return None
+      with open(path, "rb") as f:
+        (fmt, digest) = pickle.load(f)
+        if fmt != _FORMAT:
+          return None
+        if header_only:
+          return digest
+        return (pickle.load(f), digest)
+    except (OSError, IOError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+      return None
+
+  def load (self, am, available, max_age = None):
+    """Returns the cached advertisement, or `None` if there is no usable entry (or it is older than
+    `max_age` seconds, if given)."""
+    res = self._read(am, available, max_age, False)
+    if res is None:
+      return None
+    return res[0]
+
+  def digest (self, am, available):
+    """Returns the document digest of the cached entry (regardless of age), without loading the advertisement."""
+    return self._read(am, available, None, True)
+
+  def store (self, am, available, ad, digest = None):
+    """Cache `ad`.  Returns `False` if the advertisement could not be pickled."""
+    try:
+      data = (pickle.dumps((_FORMAT, digest), pickle.HIGHEST_PROTOCOL) +
+              pickle.dumps(ad, pickle.HIGHEST_PROTOCOL))
+    except (TypeError, AttributeError, pickle.PicklingError):
+      return False
+
+    os.makedirs(self.path, exist_ok = True)
+    path = self._entryPath(am, available)
+    tmp = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+    try:
+      with open(tmp, "wb") as f:
+        f.write(data)
+      os.replace(tmp, path)
+    except BaseException:
+      try:
+        os.remove(tmp)
+      except OSError:
+        pass
+      raise
+    return True
+
+  def touch (self, am, available):
+    """Mark the cached entry as fresh."""
+    try:
+      os.utime(self._entryPath(am, available), None)
+    except OSError:
+      pass
+
+  def clear (self, am = None):
+    """Remove the entries for `am`, or all entries if `am` is `None`."""
+    if am is not None:
+      paths = [self._entryPath(am, x) for x in (True, False)]
+    elif os.path.exists(self.path):
+      paths = [os.path.join(self.path, x) for x in os.listdir(self.path)]
+    else:
+      paths = []
+    for path in paths:
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+
+
+def documentDigest (value):
+  """Digest of a raw ListResources `value` (text or bytes), or `None` for already-parsed values."""
+  if isinstance(value, bytes):
+    return hashlib.sha1(value).hexdigest()
+  if isinstance(value, str):
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+  return None
+
+
+class RequestCache(object):
+  """In-memory record of the requests submitted to each aggregate and slice.
+
+  Each entry holds the digest of the request rspec submitted to `(aggregate, slice, method)`
+  and the manifest it returned, so that re-submitting an identical rspec can be answered
+  without contacting the aggregate again.  See :py:meth:`geni.aggregate.core.AM.enableRequestDedup`.
+
+  Args:
+    ttl (int): Lifetime of an entry in seconds (`None` for no limit)
+  """
+
+  def __init__ (self, ttl = None):
+    self.ttl = ttl
+    self._entries = {}
+    self._lock = threading.Lock()
+
+  def lookup (self, am, sname, method, digest):
+    """Returns the manifest returned for an identical request, or `None`."""
+    key = (am.url, sname, method)
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      (edigest, manifest, stamp) = entry
+      if self.ttl is not None and (time.time() - stamp) > self.ttl:
+        del self._entries[key]
+        return None
+      if edigest != digest:
+        return None
+      return manifest
+
+  def store (self, am, sname, method, digest, manifest):
+    with self._lock:
+      self._entries[(am.url, sname, method)] = (digest, manifest, time.time())
+
+  def invalidate (self, am = None, sname = None):
+    """Drop the entries for slice `sname` at `am` (either may be `None` to match all)."""
+    with self._lock:
+      for key in list(self._entries):
+        if (am is None or key[0] == am.url) and (sname is None or key[1] == sname):
+          del self._entries[key]
+
+  def __len__ (self):
+    return len(self._entries)
+
+
+def requestDigest (rspec):
+  """Stable digest of a request: a :py:class:`geni.rspec.RSpec`, any object with `toXMLString`,
+  XML text, or a path to a request file."""
+  from ..rspec import canonicalXML
+
+  if hasattr(rspec, "digest"):
+    return rspec.digest()
+  if hasattr(rspec, "toXMLString"):
+    data = rspec.toXMLString()
+  elif isinstance(rspec, str) and not rspec.lstrip().startswith("<"):
+    with open(rspec, "rb") as f:
+      data = f.read()
+  else:
+    data = rspec
+  return hashlib.sha256(canonicalXML(data)).hexdigest()
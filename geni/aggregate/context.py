@@ -10,6 +10,7 @@ import datetime
 from io import open
 import os
 import os.path
+import threading
 
 import lxml.etree as ET
 
@@ -59,10 +60,7 @@ class SliceCredInfo(object):
 
   def _downloadCredential (self):
     cred = self.context.cf.getSliceCredentials(self.context, self.slicename)
-
-    f = open(self._path, "wb+")
-    f.write(cred)
-    f.close()
+    Context._writeCred(self._path, cred)
     self._parseInfo()
 
   def _parseInfo (self):
@@ -223,6 +221,14 @@ class Context(object):
       os.makedirs(nval)
     self._data_dir = nval
 
+  @staticmethod
+  def _writeCred (path, cred):
+    # Parallel callers sharing this context may read the file while it is being written
+    tmp = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+    with open(tmp, "wb") as f:
+      f.write(cred.encode("utf-8") if isinstance(cred, str) else cred)
+    os.replace(tmp, path)
+
 ### TODO: User credentials need to belong to Users, or fix up this profile nonsense
   @property
   def _ucred_info (self):
@@ -230,19 +236,14 @@ class Context(object):
       ucpath = "%s/%s-%s-usercred.xml" % (self.datadir, self.cf.name, self.uname)
       if not os.path.exists(ucpath):
         cred = self.cf.getUserCredentials(self.userurn)
-
-        f = open(ucpath, "wb+")
-        f.write(cred)
-        f.close()
+        Context._writeCred(ucpath, cred)
 
       (expires, urn, typ, version) = self._getCredInfo(ucpath)
       self._usercred_info = (ucpath, expires, urn, typ, version)
 
     if self._usercred_info[1] < datetime.datetime.now():
       cred = self.cf.getUserCredentials(self.userurn)
-      f = open(ucpath, "wb+")
-      f.write(cred)
-      f.close()
+      Context._writeCred(ucpath, cred)
       (expires, urn, typ, version) = self._getCredInfo(ucpath)
       self._usercred_info = (ucpath, expires, urn, typ, version)
 
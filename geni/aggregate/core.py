@@ -6,12 +6,18 @@
 
 from __future__ import absolute_import
 
+import copy
+import hashlib
 from io import open
 import os
 import os.path
+import threading
+import time
 
 import six
 
+from .exceptions import AMError
+
 class _Registry(object):
   def __init__ (self):
     self._data = {}
@@ -122,6 +128,11 @@ class AM(object):
     self._typestr = amtype
     self._type = None
     self._amspec = None
+    self.compression = None
+    self._gv_ttl = None
+    self._gv_persist = False
+    self._gv = None   # (getversion value, time fetched)
+    self._reqcache = None
 
   @property
   def component_manager_id (self):
@@ -141,7 +152,31 @@ class AM(object):
       self._type = AMTypeRegistry.get(self._typestr)
     return self._type
 
-  def listresources (self, context, sname = None, available = False):
+  @staticmethod
+  def _versionSupportsCompression (gv):
+    if "geni_compressed" in gv:
+      return bool(gv["geni_compressed"])
+    try:
+      return int(gv.get("geni_api", 0)) >= 2
+    except (TypeError, ValueError):
+      return False
+
+  def supportsCompression (self, context):
+    """Returns `True` if this aggregate is known to support `geni_compressed` ListResources results.
+
+    The `compression` attribute may be set to `True` or `False` to force the answer, otherwise it is
+    learned from GetVersion output the first time this method is called."""
+
+    if self.compression is None:
+      try:
+        gv = self.getversion(context)
+      except AMError:
+        return False
+      self.compression = AM._versionSupportsCompression(gv)
+    return self.compression
+
+  def listresources (self, context, sname = None, available = False, compressed = False, stream = False,
+                     cache = None, max_age = None):
     """GENI AM APIv2 method to get available resources from an aggregate, or resources allocated to
     a specific sliver.
 
@@ -149,6 +184,18 @@ class AM(object):
       context: geni-lib context
       sname (str): Slice name (optional)
       available (bool): Only list available resources
+      compressed (bool): Request a compressed response if the aggregate supports it (see
+        :py:meth:`supportsCompression`).  The response is decompressed straight into bytes
+        for the rspec parser.
+      stream (bool): Decode the advertisement incrementally as it is received, so that the
+        rspec text is never held in memory as a single string.  Ignored for manifests.
+      cache (str): Advertisement cache policy (ignored for manifests).  `None` (the default) does not
+        use the cache, `geni.aggregate.cache.USE` (or `True`) returns a cached advertisement younger
+        than `max_age` and otherwise fetches and caches a new one, `geni.aggregate.cache.REFRESH`
+        always fetches and caches.  When a stale entry is refreshed and the aggregate returns an
+        identical document the cached parse is reused.  See :py:class:`geni.aggregate.cache.AdvertisementCache`.
+      max_age (int): Maximum age in seconds of a cached advertisement (defaults to
+        `geni.aggregate.cache.DEFAULT_MAX_AGE`)
 
     Returns:
       geni.rspec.RSpec:
@@ -156,11 +203,59 @@ class AM(object):
         `listresources` will return the advertisement rspec for the given aggregate.
     """
 
-    rspec_data = self.api.listresources(context, self.url, sname, {"geni_available" : available})
-    if sname is None:
-      return self.amtype.parseAdvertisement(rspec_data)
+    adcache = None
+    if sname is None and cache:
+      from . import cache as ADC
+      adcache = ADC.AdvertisementCache(context)
+      if cache != ADC.REFRESH:
+        ad = adcache.load(self, available, ADC.DEFAULT_MAX_AGE if max_age is None else max_age)
+        if ad is not None:
+          return ad
+
+    options = {"geni_available" : available}
+    if compressed and self.supportsCompression(context):
+      options["geni_compressed"] = True
+
+    if sname is None and stream:
+      rspec_data = self.api.listresources(context, self.url, sname, options, stream = True)
     else:
+      rspec_data = self.api.listresources(context, self.url, sname, options)
+    if sname is not None:
       return self.amtype.parseManifest(rspec_data)
+    if adcache is None:
+      return self.amtype.parseAdvertisement(rspec_data)
+
+    digest = ADC.documentDigest(rspec_data["value"])
+    if digest is not None and digest == adcache.digest(self, available):
+      ad = adcache.load(self, available)
+      if ad is not None:
+        adcache.touch(self, available)
+        return ad
+    ad = self.amtype.parseAdvertisement(rspec_data)
+    adcache.store(self, available, ad, digest)
+    return ad
+
+  def availabilitySummary (self, context, compressed = True):
+    """Count available nodes per hardware type at this aggregate.  Unlike :py:meth:`listresources`
+    the advertisement is scanned as it is received for node availability, exclusivity, sliver type
+    and hardware type only, without building the document tree or node objects.
+
+    Args:
+      context: geni-lib context
+      compressed (bool): Request a compressed response if the aggregate supports it
+
+    Returns:
+      geni.rspec.pgad.AvailabilitySummary
+    """
+
+    from ..rspec.pgad import AvailabilityScanner
+
+    options = {"geni_available" : False}
+    if compressed and self.supportsCompression(context):
+      options["geni_compressed"] = True
+
+    res = self.api.listresources(context, self.url, None, options, stream = AvailabilityScanner)
+    return res["value"]
 
   def sliverstatus (self, context, sname):
     """GENI AM APIv2 method to get the status of a current sliver at the given aggregate.
@@ -202,36 +297,263 @@ class AM(object):
       sname (str): Slice name
     """
     self.api.deletesliver(context, self.url, sname)
+    self._dedupInvalidate(sname)
 
-  def createsliver (self, context, sname, rspec):
+  def createsliver (self, context, sname, rspec, spool = False, validate = False):
     """GENI AM APIv2 method to reserve resources at this aggregate.
 
     Args:
       context: geni-lib context
       sname (str): Slice name
       rspec (geni.rspec.RSpec): Valid request RSpec
+      spool (bool): Serialize the request rspec incrementally (see
+        :py:meth:`geni.rspec.pg.Request.writeXMLStream`) straight into a spooled request body
+        instead of building it as a string.  Only for rspec objects that support streaming.
+      validate (bool): Check the request against the local schema mirror (see
+        :py:mod:`geni.rspec.validate`) before sending it, raising
+        :py:class:`geni.rspec.validate.RSpecValidationError` if it is not valid
     """
     if isinstance(rspec, (six.string_types)):
       rspec = os.path.normpath(os.path.expanduser(rspec))
       if not os.path.exists(rspec):
         raise AM.InvalidRSpecPathError(rspec)
+    if validate:
+      from ..rspec.validate import assertValid
+      assertValid(rspec)
+
+    (digest, manifest) = self._dedupLookup(sname, "createsliver", rspec)
+    if manifest is not None:
+      return manifest
+
+    if isinstance(rspec, (six.string_types)):
       rspec_data = open(rspec, "r", encoding="latin-1").read()
+    elif spool and hasattr(rspec, "writeXMLStream"):
+      rspec_data = rspec.writeXMLStream
     else:
       rspec_data = rspec.toXMLString(ucode=True)
     res = self.api.createsliver(context, self.url, sname, rspec_data)
-    return self.amtype.parseManifest(res)
+    manifest = self.amtype.parseManifest(res)
+    self._dedupStore(sname, "createsliver", digest, manifest)
+    return manifest
+
+  def enableRequestDedup (self, cache = None, ttl = None):
+    """Skip re-submitting identical requests to this aggregate.
+
+    Once enabled, :py:meth:`createsliver` (and `allocate`, where supported) compares the
+    canonical digest of the request (see :py:meth:`geni.rspec.RSpec.digest`) with the last
+    request that succeeded for the same slice, and if they match returns the manifest from
+    that call without contacting the aggregate.  :py:meth:`deletesliver` forgets the slice.
+
+    Args:
+      cache (geni.aggregate.cache.RequestCache): Cache to use, which may be shared between
+        aggregates (default: a new cache for this aggregate)
+      ttl (int): Lifetime of entries in a new cache, in seconds (`None` for no limit)
+
+    Returns:
+      geni.aggregate.cache.RequestCache: The cache in use
+    """
+    if cache is None:
+      from .cache import RequestCache
+      cache = RequestCache(ttl)
+    self._reqcache = cache
+    return cache
+
+  def disableRequestDedup (self):
+    self._reqcache = None
+
+  def _dedupLookup (self, sname, method, rspec):
+    if self._reqcache is None:
+      return (None, None)
+    from .cache import requestDigest
+    digest = requestDigest(rspec)
+    return (digest, self._reqcache.lookup(self, sname, method, digest))
+
+  def _dedupStore (self, sname, method, digest, manifest):
+    if self._reqcache is not None and digest is not None:
+      self._reqcache.store(self, sname, method, digest, manifest)
+
+  def _dedupInvalidate (self, sname):
+    if self._reqcache is not None:
+      self._reqcache.invalidate(self, sname)
+
+  def enableVersionCache (self, ttl = 3600, persist = False):
+    """Cache GetVersion results for this aggregate.
+
+    Once enabled, :py:meth:`getversion` (and everything that uses it, such as
+    :py:meth:`supportsCompression` and :py:meth:`apiURL`) only contacts the aggregate when the
+    cached result is older than `ttl` seconds.
 
-  def getversion (self, context):
+    Args:
+      ttl (int): Lifetime of a cached result in seconds
+      persist (bool): Also keep the result on disk under the context `datadir`, so that it
+        survives across processes
+    """
+    self._gv_ttl = ttl
+    self._gv_persist = persist
+
+  def disableVersionCache (self):
+    self._gv_ttl = None
+    self._gv_persist = False
+    self._gv = None
+
+  def clearVersionCache (self, context = None):
+    """Drop the cached GetVersion result (and the on-disk copy, if `context` is given)."""
+    self._gv = None
+    if context is not None:
+      try:
+        os.remove(self._versionCachePath(context))
+      except OSError:
+        pass
+
+  def _versionCachePath (self, context):
+    digest = hashlib.sha1(self.url.encode("utf-8")).hexdigest()
+    return os.path.join(context.datadir, "getversion", "%s.xml" % (digest))
+
+  def _cachedVersion (self, context):
+    if not self._gv_ttl:
+      return None
+
+    now = time.time()
+    if self._gv and (now - self._gv[1]) < self._gv_ttl:
+      return copy.deepcopy(self._gv[0])
+
+    if self._gv_persist:
+      from xml.parsers.expat import ExpatError
+      from six.moves import xmlrpc_client as xmlrpclib
+      path = self._versionCachePath(context)
+      try:
+        mtime = os.path.getmtime(path)
+        if (now - mtime) < self._gv_ttl:
+          with open(path, "rb") as f:
+            gv = xmlrpclib.loads(f.read(), use_datetime = True)[0][0]
+          self._gv = (gv, mtime)
+          return copy.deepcopy(gv)
+      except (OSError, IOError, IndexError):
+        pass
+      except (ExpatError, ValueError, xmlrpclib.Error):
+        # Truncated or corrupt cache file - drop it and fall back to a live call
+        try:
+          os.remove(path)
+        except OSError:
+          pass
+    return None
+
+  def _storeVersion (self, context, gv):
+    if not self._gv_ttl:
+      return
+    self._gv = (copy.deepcopy(gv), time.time())
+
+    if self._gv_persist:
+      from six.moves import xmlrpc_client as xmlrpclib
+      path = self._versionCachePath(context)
+      os.makedirs(os.path.dirname(path), exist_ok = True)
+      data = xmlrpclib.dumps((gv,), methodresponse = True, allow_none = True).encode("utf-8")
+      tmp = "%s.%d.%d.tmp" % (path, os.getpid(), threading.get_ident())
+      try:
+        with open(tmp, "wb") as f:
+          f.write(data)
+        os.replace(tmp, path)
+      except BaseException:
+        try:
+          os.remove(tmp)
+        except OSError:
+          pass
+        raise
+
+  def getversion (self, context, refresh = False):
     """GENI AM API method to get the version information for this aggregate.
 
     Args:
       context: geni-lib context
+      refresh (bool): Bypass the version cache (see :py:meth:`enableVersionCache`) and
+        re-fetch (and re-cache) the result from the aggregate
 
     Returns:
       dict: Dictionary of key/value pairs with version information from this aggregate.
     """
 
-    return self.api.getversion(context, self.url)
+    if not refresh:
+      gv = self._cachedVersion(context)
+      if gv is not None:
+        return gv
+
+    gv = self.api.getversion(context, self.url)
+    self._storeVersion(context, gv)
+    return gv
+
+  def apiURL (self, context, version):
+    """Returns the URL for AM API `version` at this aggregate, as advertised in the `geni_api_versions`
+    GetVersion field, or `None` if the aggregate does not advertise one."""
+
+    versions = self.getversion(context).get("geni_api_versions", {})
+    return versions.get(str(version), versions.get(version))
+
+  async def alistresources (self, context, sname = None, available = False, compressed = False):
+    """Coroutine version of :py:meth:`listresources`, for driving many aggregates from one event loop."""
+
+    options = {"geni_available" : available}
+    if compressed:
+      if self.compression is None:
+        try:
+          self.compression = AM._versionSupportsCompression(await self.agetversion(context))
+        except AMError:
+          pass
+      if self.compression:
+        options["geni_compressed"] = True
+
+    rspec_data = await self.api.alistresources(context, self.url, sname, options)
+    if sname is None:
+      return self.amtype.parseAdvertisement(rspec_data)
+    else:
+      return self.amtype.parseManifest(rspec_data)
+
+  async def asliverstatus (self, context, sname):
+    """Coroutine version of :py:meth:`sliverstatus`."""
+
+    return await self.api.asliverstatus(context, self.url, sname)
+
+  async def arenewsliver (self, context, sname, date):
+    """Coroutine version of :py:meth:`renewsliver`."""
+
+    return await self.api.arenewsliver(context, self.url, sname, date)
+
+  async def adeletesliver (self, context, sname):
+    """Coroutine version of :py:meth:`deletesliver`."""
+
+    await self.api.adeletesliver(context, self.url, sname)
+    self._dedupInvalidate(sname)
+
+  async def acreatesliver (self, context, sname, rspec):
+    """Coroutine version of :py:meth:`createsliver`."""
+    if isinstance(rspec, (six.string_types)):
+      rspec = os.path.normpath(os.path.expanduser(rspec))
+      if not os.path.exists(rspec):
+        raise AM.InvalidRSpecPathError(rspec)
+
+    (digest, manifest) = self._dedupLookup(sname, "createsliver", rspec)
+    if manifest is not None:
+      return manifest
+
+    if isinstance(rspec, (six.string_types)):
+      rspec_data = open(rspec, "r", encoding="latin-1").read()
+    else:
+      rspec_data = rspec.toXMLString(ucode=True)
+    res = await self.api.acreatesliver(context, self.url, sname, rspec_data)
+    manifest = self.amtype.parseManifest(res)
+    self._dedupStore(sname, "createsliver", digest, manifest)
+    return manifest
+
+  async def agetversion (self, context, refresh = False):
+    """Coroutine version of :py:meth:`getversion`."""
+
+    if not refresh:
+      gv = self._cachedVersion(context)
+      if gv is not None:
+        return gv
+
+    gv = await self.api.agetversion(context, self.url)
+    self._storeVersion(context, gv)
+    return gv
 
 
 APIRegistry = _Registry()
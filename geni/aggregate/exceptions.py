@@ -11,4 +11,7 @@ class AMError(Exception):
     self.data = data
   def __str__ (self):
     return self.text
+  def __reduce__ (self):
+    # Rebuild from our own arguments (the default uses self.args, which is empty)
+    return (self.__class__, (self.text, self.data))
 
@@ -119,9 +119,14 @@ class VTS(AM):
     self.Policy = Policy(self)
 
   def allocate (self, context, sname, rspec):
+    (digest, manifest) = self._dedupLookup(sname, "allocate", rspec)
+    if manifest is not None:
+      return manifest
+
     rspec_data = rspec.toXMLString(ucode=True)
-    manifest = self._apiv3.allocate(context, self.urlv3, sname, rspec_data)
-    return self.amtype.parseManifest(manifest)
+    manifest = self.amtype.parseManifest(self._apiv3.allocate(context, self.urlv3, sname, rspec_data))
+    self._dedupStore(sname, "allocate", digest, manifest)
+    return manifest
 
   def provision (self, context, sname):
     udata = []
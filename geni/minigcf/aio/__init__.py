@@ -0,0 +1,19 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""
+Coroutine versions of the MiniGCF AM API and CH API bindings.
+
+Every function in :py:mod:`geni.minigcf.aio.amapi2`, :py:mod:`geni.minigcf.aio.amapi3`,
+:py:mod:`geni.minigcf.aio.chapi2` and :py:mod:`geni.minigcf.aio.pgch1` takes the same arguments
+and returns the same decoded XML-RPC result as its blocking twin in :py:mod:`geni.minigcf`, but must
+be awaited.  Calls are made over an asyncio-native HTTPS transport with client certificate
+authentication, so a single event loop can drive many aggregates concurrently::
+
+  results = await asyncio.gather(*[amapi2.getversion(url, False, cert, key) for url in urls])
+
+The transport honours the timeout, redirect and logging settings in :py:class:`geni.minigcf.config.HTTP`.
+"""
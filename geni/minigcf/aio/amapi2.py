@@ -0,0 +1,60 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Coroutine twin of geni.minigcf.amapi2 - see that module for call semantics
+
+from __future__ import absolute_import
+
+from six.moves import xmlrpc_client as xmlrpclib
+
+from .util import _rpcpost
+
+# pylint: disable=unsubscriptable-object
+async def getversion (url, root_bundle, cert, key, options = None):
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((options,), methodname="GetVersion")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def listresources (url, root_bundle, cert, key, cred_strings, options = None, sliceurn = None):
+  if not options: options = {}
+  opts = {"geni_rspec_version" : {"version" : "3", "type" : "GENI"},
+          "geni_available" : False,
+          "geni_compressed" : False}
+
+  if sliceurn:
+    opts["geni_slice_urn"] = sliceurn
+
+  # Allow all options to be overridden by the caller
+  opts.update(options)
+
+  req_data = xmlrpclib.dumps((cred_strings, opts), methodname="ListResources")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def deletesliver (url, root_bundle, cert, key, creds, slice_urn, options = None):
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((slice_urn, creds, options), methodname="DeleteSliver")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def sliverstatus (url, root_bundle, cert, key, creds, slice_urn, options = None):
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((slice_urn, creds, options), methodname="SliverStatus")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def renewsliver (url, root_bundle, cert, key, creds, slice_urn, date, options = None):
+  FMT = "%Y-%m-%dT%H:%M:%S+00:00"
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((slice_urn, creds, date.strftime(FMT), options), methodname="RenewSliver")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def listimages (url, root_bundle, cert, key, cred_strings, owner_urn, options = None):
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((owner_urn, cred_strings, options), methodname="ListImages")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
+
+async def createsliver (url, root_bundle, cert, key, creds, slice_urn, rspec, users, options = None):
+  if not options: options = {}
+  req_data = xmlrpclib.dumps((slice_urn, creds, rspec, users, options), methodname="CreateSliver")
+  return await _rpcpost(url, req_data, (cert, key), root_bundle)
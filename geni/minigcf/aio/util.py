@@ -0,0 +1,242 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from __future__ import absolute_import
+
+import asyncio
+import ssl
+import threading
+import time
+
+from six.moves import xmlrpc_client as xmlrpclib
+from six.moves.urllib.parse import urlparse, urljoin
+
+import requests
+
+from .. import config
+from ..util import headers
+
+MAX_REDIRECTS = 5
+
+_ctx_lock = threading.Lock()
+_contexts = {}
+
+def _sslcontext (cert, root_bundle):
+  key = (cert, root_bundle)
+  with _ctx_lock:
+    try:
+      return _contexts[key]
+    except KeyError:
+      pass
+
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if root_bundle is False or root_bundle is None:
+      ctx.check_hostname = False
+      ctx.verify_mode = ssl.CERT_NONE
+    elif root_bundle is True:
+      ctx.load_default_certs()
+    else:
+      ctx.load_verify_locations(root_bundle)
+
+    if isinstance(cert, tuple):
+      ctx.load_cert_chain(cert[0], cert[1])
+    elif cert:
+      ctx.load_cert_chain(cert)
+
+    _contexts[key] = ctx
+    return ctx
+
+
+async def _readbody (reader, hdrs):
+  if hdrs.get("transfer-encoding", "").lower() == "chunked":
+    chunks = []
+    while True:
+      line = await asyncio.wait_for(reader.readline(), config.HTTP.TIMEOUT)
+      size = int(line.split(b";")[0].strip(), 16)
+      if size == 0:
+        # Discard trailers
+        while (await asyncio.wait_for(reader.readline(), config.HTTP.TIMEOUT)) not in (b"\r\n", b"\n", b""):
+          pass
+        break
+      chunks.append(await asyncio.wait_for(reader.readexactly(size), config.HTTP.TIMEOUT))
+      await asyncio.wait_for(reader.readline(), config.HTTP.TIMEOUT)
+    return b"".join(chunks)
+
+  if "content-length" in hdrs:
+    return await asyncio.wait_for(reader.readexactly(int(hdrs["content-length"])), config.HTTP.TIMEOUT)
+
+  return await asyncio.wait_for(reader.read(), config.HTTP.TIMEOUT)
+
+
+async def _post (url, req_data, cert, root_bundle, info = None):
+  pr = urlparse(url)
+  secure = (pr.scheme == "https")
+  port = pr.port or (443 if secure else 80)
+  path = pr.path or "/"
+  if pr.query:
+    path = "%s?%s" % (path, pr.query)
+
+  if isinstance(req_data, bytes):
+    body = req_data
+  else:
+    body = req_data.encode("utf-8")
+
+  hdrs = headers()
+  hdrs["Host"] = pr.netloc
+  hdrs["Content-Type"] = "text/xml"
+  hdrs["Content-Length"] = str(len(body))
+  hdrs["Connection"] = "close"
+  head = "POST %s HTTP/1.1\r\n%s\r\n\r\n" % (path, "\r\n".join(["%s: %s" % (k, v) for k, v in hdrs.items()]))
+
+  sslctx = None
+  if secure:
+    sslctx = _sslcontext(cert, root_bundle)
+
+  t0 = time.perf_counter()
+  try:
+    (reader, writer) = await asyncio.wait_for(
+      asyncio.open_connection(pr.hostname, port, ssl = sslctx,
+                              server_hostname = pr.hostname if secure else None),
+      config.HTTP.TIMEOUT)
+  except asyncio.TimeoutError:
+    raise requests.exceptions.ConnectTimeout("Connection to %s timed out" % (url))
+  except OSError as e:
+    raise requests.exceptions.ConnectionError("Connection to %s failed: %s" % (url, e))
+  if info is not None:
+    info.new_connection = True
+    info.timings["connect"] = time.perf_counter() - t0
+
+  try:
+    try:
+      writer.write(head.encode("latin-1"))
+      writer.write(body)
+      await asyncio.wait_for(writer.drain(), config.HTTP.TIMEOUT)
+
+      t1 = time.perf_counter()
+      status = await asyncio.wait_for(reader.readline(), config.HTTP.TIMEOUT)
+      if info is not None:
+        info.timings["first_byte"] = time.perf_counter() - t1
+      parts = status.decode("latin-1").split(None, 2)
+      code = int(parts[1])
+      reason = parts[2].strip() if len(parts) > 2 else ""
+
+      resp_hdrs = {}
+      while True:
+        line = await asyncio.wait_for(reader.readline(), config.HTTP.TIMEOUT)
+        if line in (b"\r\n", b"\n", b""):
+          break
+        (name, value) = line.decode("latin-1").split(":", 1)
+        resp_hdrs[name.strip().lower()] = value.strip()
+      content = await _readbody(reader, resp_hdrs)
+    except asyncio.TimeoutError:
+      raise requests.exceptions.ReadTimeout("Read from %s timed out" % (url))
+    except (asyncio.IncompleteReadError, OSError, IndexError, ValueError) as e:
+      # Dropped connections, TLS errors and malformed responses, reported the way requests
+      # reports them so the retry policy and circuit breaker see them
+      raise requests.exceptions.ConnectionError("Connection to %s failed: %s" % (url, e))
+  finally:
+    writer.close()
+    try:
+      await asyncio.wait_for(writer.wait_closed(), config.HTTP.TIMEOUT)
+    except (asyncio.TimeoutError, OSError):
+      pass
+
+  return (code, reason, resp_hdrs, content)
+
+
+async def _rpcpost (url, req_data, cert, root_bundle):
+  policy = config.HTTP.RETRY_POLICY
+  breaker = config.HTTP.CIRCUIT_BREAKER
+  if policy is None and breaker is None:
+    return await _instrumented(url, req_data, cert, root_bundle)
+
+  from ..retry import methodName
+  method = methodName(req_data)
+  attempt = 0
+  trial = breaker.before(url) if breaker else False
+  try:
+    while True:
+      try:
+        res = await _instrumented(url, req_data, cert, root_bundle)
+      except requests.exceptions.RequestException as e:
+        if breaker:
+          breaker.record(url, e)
+          trial = False
+          if breaker.isOpen(url):
+            raise
+        delay = policy.backoffFor(method, attempt, exc = e) if policy else None
+        if delay is None:
+          raise
+      except Exception:
+        # Faults and unparseable responses still mean the aggregate is reachable
+        if breaker:
+          breaker.record(url)
+          trial = False
+        raise
+      else:
+        if breaker:
+          breaker.record(url)
+          trial = False
+        delay = policy.backoffFor(method, attempt, result = res) if policy else None
+        if delay is None:
+          return res
+      attempt += 1
+      await asyncio.sleep(delay)
+  finally:
+    if trial:
+      breaker.abandon(url)
+
+async def _instrumented (url, req_data, cert, root_bundle):
+  pre_hooks = config.HTTP.PRE_CALL_HOOKS
+  post_hooks = config.HTTP.POST_CALL_HOOKS
+  if not pre_hooks and not post_hooks:
+    return await _rpcpostonce(url, req_data, cert, root_bundle)
+
+  from ..metrics import CallInfo
+  info = CallInfo(url, req_data)
+  for hook in pre_hooks:
+    hook(info)
+
+  start = time.perf_counter()
+  try:
+    res = await _rpcpostonce(url, req_data, cert, root_bundle, info)
+    info.setResult(res)
+    return res
+  except Exception as e:
+    info.error = e
+    raise
+  finally:
+    info.timings["total"] = time.perf_counter() - start
+    for hook in post_hooks:
+      hook(info)
+
+# pylint: disable=unsubscriptable-object
+async def _rpcpostonce (url, req_data, cert, root_bundle, info = None):
+  if isinstance(config.HTTP.LOG_URLS, tuple):
+    config.HTTP.LOG_URLS[0].log(config.HTTP.LOG_URLS[1], "POST: %s" % (url))
+  if isinstance(config.HTTP.LOG_RAW_REQUESTS, tuple):
+    config.HTTP.LOG_RAW_REQUESTS[0].log(config.HTTP.LOG_RAW_REQUESTS[1], req_data)
+
+  for _ in range(MAX_REDIRECTS + 1):
+    (code, reason, hdrs, content) = await _post(url, req_data, cert, root_bundle, info)
+    if code in (301, 302, 307, 308) and config.HTTP.ALLOW_REDIRECTS and "location" in hdrs:
+      url = urljoin(url, hdrs["location"])
+      continue
+    break
+
+  if info is not None:
+    info.status = code
+    info.response = content
+    info.response_size = len(content)
+  if code != 200:
+    resp = requests.models.Response()
+    resp.status_code = code
+    resp.reason = reason
+    resp.url = url
+    raise requests.exceptions.HTTPError("%d %s for url: %s" % (code, reason, url), response = resp)
+  if isinstance(config.HTTP.LOG_RAW_RESPONSES, tuple):
+    config.HTTP.LOG_RAW_RESPONSES[0].log(config.HTTP.LOG_RAW_RESPONSES[1], content)
+  return xmlrpclib.loads(content, use_datetime=True)[0][0]
@@ -11,7 +11,7 @@ from __future__ import absolute_import
 
 from six.moves import xmlrpc_client as xmlrpclib
 
-from .util import _rpcpost
+from .util import _rpcpost, _rpcpoststream, spoolRequest
 
 # pylint: disable=unsubscriptable-object
 def getversion (url, root_bundle, cert, key, options = None):
@@ -19,7 +19,11 @@ def getversion (url, root_bundle, cert, key, options = None):
   req_data = xmlrpclib.dumps((options,), methodname="GetVersion")
   return _rpcpost(url, req_data, (cert, key), root_bundle)
 
-def listresources (url, root_bundle, cert, key, cred_strings, options = None, sliceurn = None):
+def listresources (url, root_bundle, cert, key, cred_strings, options = None, sliceurn = None, stream = False):
+  """If `stream` is `True` the response is parsed incrementally and the result `value` is an lxml
+  root element (already decompressed if `geni_compressed` was requested).  `stream` may instead
+  be a parser factory (see :py:func:`geni.minigcf.util._rpcpoststream`), in which case `value` is
+  whatever that parser's `close()` returns."""
   if not options: options = {}
   opts = {"geni_rspec_version" : {"version" : "3", "type" : "GENI"},
           "geni_available" : False,
@@ -32,6 +36,9 @@ def listresources (url, root_bundle, cert, key, cred_strings, options = None, sl
   opts.update(options)
 
   req_data = xmlrpclib.dumps((cred_strings, opts), methodname="ListResources")
+  if stream:
+    return _rpcpoststream(url, req_data, (cert, key), root_bundle, compressed = bool(opts["geni_compressed"]),
+                          parser_factory = stream if callable(stream) else None)
   return _rpcpost(url, req_data, (cert, key), root_bundle)
 
 def deletesliver (url, root_bundle, cert, key, creds, slice_urn, options = None):
@@ -56,6 +63,14 @@ def listimages (url, root_bundle, cert, key, cred_strings, owner_urn, options =
   return _rpcpost(url, req_data, (cert, key), root_bundle)
 
 def createsliver (url, root_bundle, cert, key, creds, slice_urn, rspec, users, options = None):
+  """If `rspec` is callable it is used as a writer (see :py:func:`geni.minigcf.util.spoolRequest`)
+  and the request is spooled rather than built as a string."""
   if not options: options = {}
+  if callable(rspec):
+    req_data = spoolRequest("CreateSliver", (slice_urn, creds, None, users, options), 2, rspec)
+    try:
+      return _rpcpost(url, req_data, (cert, key), root_bundle)
+    finally:
+      req_data.close()
   req_data = xmlrpclib.dumps((slice_urn, creds, rspec, users, options), methodname="CreateSliver")
   return _rpcpost(url, req_data, (cert, key), root_bundle)
@@ -24,3 +24,32 @@ class HTTP(object):
 
   LOG_URLS = False
   """If set to a valid `(log_handle, log_level)` tuple, will log all URLs as they are used."""
+
+  PERSISTENT_CONNECTIONS = True
+  """Reuse HTTP(S) sessions (and their kept-alive TLS connections) across calls to the same
+  endpoint with the same client certificate.  Set to `False` to open a new connection for every call."""
+
+  POOL_MAXSIZE = 4
+  """Maximum number of idle connections kept open per endpoint when `PERSISTENT_CONNECTIONS` is enabled.
+  Concurrent calls beyond this limit still succeed, but their connections are not retained."""
+
+  POOL_IDLE_TIMEOUT = 300
+  """Seconds after which an unused cached session (and its connections) is closed.  Set to `None` or `0`
+  to keep sessions until the process exits or :py:func:`geni.minigcf.util.drainSessions` is called."""
+
+  RETRY_POLICY = None
+  """If set to a :py:class:`geni.minigcf.retry.RetryPolicy`, transient failures (connection errors, timeouts,
+  HTTP 502/503/504 for idempotent methods, ProtoGENI busy results) are retried with backoff."""
+
+  CIRCUIT_BREAKER = None
+  """If set to a :py:class:`geni.minigcf.retry.CircuitBreaker`, aggregates that repeatedly fail at the transport
+  level are skipped (raising :py:class:`geni.minigcf.retry.CircuitOpenError`) instead of waiting out `TIMEOUT`."""
+
+  PRE_CALL_HOOKS = []
+  """Callables invoked before every MiniGCF HTTP(S) call with a :py:class:`geni.minigcf.metrics.CallInfo`
+  describing the request (method, URL, request bytes)."""
+
+  POST_CALL_HOOKS = []
+  """Callables invoked after every MiniGCF HTTP(S) call (whether it succeeded or raised) with the completed
+  :py:class:`geni.minigcf.metrics.CallInfo` (response bytes, HTTP status, `geni_code`, DNS/connect/TLS/first-byte/total
+  timings).  See :py:class:`geni.minigcf.metrics.MetricsCollector` for a ready-made latency collector."""
@@ -0,0 +1,212 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Call instrumentation for MiniGCF - see geni.minigcf.config.HTTP.PRE_CALL_HOOKS / POST_CALL_HOOKS
+
+from __future__ import absolute_import
+
+import bisect
+import threading
+import time
+
+from .retry import methodName
+
+class CallInfo(object):
+  """Description of a single MiniGCF HTTP(S) call, passed to pre- and post-call hooks.
+
+  Pre-call hooks see the request fields only; post-call hooks see the whole object.  Retries made
+  under a :py:class:`geni.minigcf.retry.RetryPolicy` are reported as separate calls.
+
+  Attributes:
+    method (str): XML-RPC method name
+    url (str): Endpoint URL
+    request (str, bytes, SpooledRequest): Marshalled request
+    request_size (int): Request size in bytes
+    response (bytes): Raw response body (`None` for streamed responses or on error)
+    response_size (int): Response size in bytes
+    status (int): HTTP status code (`None` if no response was received)
+    geni_code (int): `geni_code` (or CH API `code`) of the result, if any
+    error (Exception): Exception raised by the call, if any
+    new_connection (bool): `True` if a new connection was established for this call
+    timings (dict): Seconds spent in `dns`, `connect`, `tls` (all 0 on a reused connection),
+      `first_byte` (request sent to response headers received) and `total` (whole call,
+      including response decoding).  The asyncio transport reports DNS, TCP and TLS setup
+      combined as `connect`.
+    started (float): Wall-clock (`time.time()`) start of the call
+  """
+
+  def __init__ (self, url, request):
+    self.url = url
+    self.request = request
+    self.method = methodName(request)
+    if isinstance(request, str):
+      self.request_size = len(request.encode("utf-8"))
+    else:
+      self.request_size = len(request)
+    self.response = None
+    self.response_size = 0
+    self.status = None
+    self.geni_code = None
+    self.error = None
+    self.new_connection = False
+    self.timings = {"dns" : 0.0, "connect" : 0.0, "tls" : 0.0, "first_byte" : None, "total" : None}
+    self.started = time.time()
+
+  def setResult (self, result):
+    try:
+      code = result["code"]
+      if isinstance(code, dict):
+        self.geni_code = code.get("geni_code")
+      else:
+        self.geni_code = code
+    except (TypeError, KeyError):
+      pass
+
+  def __repr__ (self):
+    return "<CallInfo %s %s status=%s geni_code=%s total=%s>" % (self.method, self.url, self.status,
+                                                                  self.geni_code, self.timings["total"])
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+class Histogram(object):
+  """Fixed-bucket latency histogram (bucket upper bounds in seconds)."""
+
+  def __init__ (self, buckets = DEFAULT_BUCKETS):
+    self.bounds = tuple(buckets)
+    self.counts = [0] * (len(self.bounds) + 1)
+    self.count = 0
+    self.sum = 0.0
+    self.min = None
+    self.max = None
+
+  def observe (self, value):
+    self.counts[bisect.bisect_left(self.bounds, value)] += 1
+    self.count += 1
+    self.sum += value
+    if self.min is None or value < self.min:
+      self.min = value
+    if self.max is None or value > self.max:
+      self.max = value
+
+  @property
+  def mean (self):
+    if not self.count:
+      return None
+    return self.sum / self.count
+
+  def quantile (self, q):
+    """Estimate quantile `q` (0-1) by linear interpolation within the containing bucket."""
+    if not self.count:
+      return None
+    rank = q * self.count
+    seen = 0
+    for (idx, cnt) in enumerate(self.counts):
+      if cnt and seen + cnt >= rank:
+        lo = self.bounds[idx - 1] if idx > 0 else 0.0
+        hi = self.bounds[idx] if idx < len(self.bounds) else self.max
+        lo = max(lo, self.min)
+        hi = min(hi, self.max)
+        return lo + (hi - lo) * ((rank - seen) / float(cnt))
+      seen += cnt
+    return self.max
+
+
+class _Stats(object):
+  def __init__ (self, buckets):
+    self.latency = Histogram(buckets)
+    self.phases = {"dns" : 0.0, "connect" : 0.0, "tls" : 0.0, "first_byte" : 0.0}
+    self.errors = 0
+    self.geni_errors = 0
+    self.new_connections = 0
+    self.request_bytes = 0
+    self.response_bytes = 0
+
+
+class MetricsCollector(object):
+  """Post-call hook aggregating per-aggregate, per-method latency histograms.
+
+  Usage::
+
+    collector = MetricsCollector().install()
+    ... run a provisioning sweep ...
+    print(collector.report())
+
+  Args:
+    buckets (tuple): Histogram bucket upper bounds, in seconds
+    key (callable): Maps a :py:class:`CallInfo` to the aggregate key (default: the call URL)
+  """
+
+  def __init__ (self, buckets = DEFAULT_BUCKETS, key = None):
+    self._buckets = buckets
+    self._key = key or (lambda info: info.url)
+    self._lock = threading.Lock()
+    self._stats = {}
+
+  def __call__ (self, info):
+    key = (self._key(info), info.method)
+    with self._lock:
+      st = self._stats.get(key)
+      if st is None:
+        st = self._stats[key] = _Stats(self._buckets)
+      if info.timings["total"] is not None:
+        st.latency.observe(info.timings["total"])
+      for phase in st.phases:
+        st.phases[phase] += info.timings[phase] or 0.0
+      if info.error is not None:
+        st.errors += 1
+      elif info.geni_code:
+        st.geni_errors += 1
+      if info.new_connection:
+        st.new_connections += 1
+      st.request_bytes += info.request_size
+      st.response_bytes += info.response_size
+
+  def install (self):
+    """Append this collector to `config.HTTP.POST_CALL_HOOKS`.  Returns `self`."""
+    from .config import HTTP
+    if self not in HTTP.POST_CALL_HOOKS:
+      HTTP.POST_CALL_HOOKS.append(self)
+    return self
+
+  def uninstall (self):
+    from .config import HTTP
+    if self in HTTP.POST_CALL_HOOKS:
+      HTTP.POST_CALL_HOOKS.remove(self)
+
+  def reset (self):
+    with self._lock:
+      self._stats = {}
+
+  def histogram (self, am, method):
+    """Returns the latency :py:class:`Histogram` for `(am, method)`, or `None`."""
+    with self._lock:
+      st = self._stats.get((am, method))
+      return st.latency if st else None
+
+  def summary (self):
+    """Returns a list of per-`(am, method)` dicts, sorted by total time spent (descending)."""
+    out = []
+    with self._lock:
+      for ((am, method), st) in self._stats.items():
+        h = st.latency
+        out.append({"am" : am, "method" : method, "count" : h.count, "total" : h.sum, "mean" : h.mean,
+                    "p50" : h.quantile(0.5), "p95" : h.quantile(0.95), "p99" : h.quantile(0.99),
+                    "max" : h.max, "errors" : st.errors, "geni_errors" : st.geni_errors,
+                    "new_connections" : st.new_connections, "request_bytes" : st.request_bytes,
+                    "response_bytes" : st.response_bytes, "phases" : dict(st.phases)})
+    out.sort(key = lambda x: x["total"], reverse = True)
+    return out
+
+  def report (self):
+    """Returns a plain-text table of :py:meth:`summary`."""
+    lines = ["%-48s %-18s %6s %9s %8s %8s %8s %5s" % ("aggregate", "method", "calls", "total(s)", "p50(ms)",
+                                                     "p95(ms)", "max(ms)", "err")]
+    for row in self.summary():
+      lines.append("%-48s %-18s %6d %9.2f %8.1f %8.1f %8.1f %5d" % (
+        row["am"][-48:], (row["method"] or "?")[:18], row["count"], row["total"], (row["p50"] or 0) * 1000,
+        (row["p95"] or 0) * 1000, (row["max"] or 0) * 1000, row["errors"] + row["geni_errors"]))
+    return "\n".join(lines)
@@ -0,0 +1,208 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Retry and circuit breaker policies for MiniGCF calls.  Neither is active unless
+# installed in geni.minigcf.config.HTTP.RETRY_POLICY / CIRCUIT_BREAKER.
+
+from __future__ import absolute_import
+
+import random
+import re
+import threading
+import time
+
+from six.moves.urllib.parse import urlparse
+
+import requests
+
+IDEMPOTENT_METHODS = frozenset(["GetVersion", "ListResources", "SliverStatus", "Describe", "Status",
+                                "ListImages", "get_version", "lookup", "get_credentials",
+                                "GetCredential", "Resolve", "ListComponents", "GetSSLCertForAggregate"])
+"""XML-RPC methods that are safe to re-send after an ambiguous failure (the request may have reached
+the server).  Notably absent: CreateSliver, Allocate, Provision, DeleteSliver, RenewSliver, create, update."""
+
+RETRY_STATUSES = frozenset([502, 503, 504])
+
+PG_BUSY_CODE = 14
+
+_METHOD_RE = re.compile(r"<methodName>\s*([^<\s]+)\s*</methodName>")
+
+def methodName (req_data):
+  """Extract the XML-RPC method name from a marshalled request, or `None`."""
+  method = getattr(req_data, "method", None)
+  if method is not None:
+    return method
+  if isinstance(req_data, bytes):
+    req_data = req_data[:512].decode("utf-8", "replace")
+  else:
+    req_data = req_data[:512]
+  m = _METHOD_RE.search(req_data)
+  if m:
+    return m.group(1)
+  return None
+
+def isBusy (result):
+  """True if `result` is a ProtoGENI "resource busy" response (`am_code` 14)."""
+  try:
+    code = result["code"]
+    return code.get("am_type") == "protogeni" and code.get("am_code") == PG_BUSY_CODE
+  except (TypeError, KeyError, AttributeError):
+    return False
+
+
+class CircuitOpenError(Exception):
+  def __init__ (self, endpoint, retry_at):
+    super(CircuitOpenError, self).__init__()
+    self.endpoint = endpoint
+    self.retry_at = retry_at
+  def __str__ (self):
+    return "Circuit open for %s (retry in %.1fs)" % (self.endpoint, max(0, self.retry_at - time.time()))
+
+
+class RetryPolicy(object):
+  """Exponential backoff with jitter for transient call failures.
+
+  Connection failures, timeouts and HTTP 502/503/504 responses are only retried for methods in
+  `idempotent`, except for connect timeouts (where the request was never sent), which are retried
+  for any method.  ProtoGENI "resource busy" results are an explicit refusal by the aggregate and
+  are retried for any method when `retry_busy` is set; if attempts run out the busy result is
+  returned to the caller as usual.
+
+  Args:
+    max_attempts (int): Total number of attempts, including the first
+    backoff (float): Base delay in seconds
+    multiplier (float): Growth factor applied per attempt
+    max_backoff (float): Upper bound on any single delay
+    jitter (bool): Use "full jitter" (uniform in `[0, delay]`) rather than a fixed delay
+    idempotent (iterable): Method names that are safe to re-send
+    retry_busy (bool): Retry ProtoGENI busy (`am_code` 14) results
+  """
+
+  def __init__ (self, max_attempts = 4, backoff = 0.5, multiplier = 2.0, max_backoff = 30.0,
+                jitter = True, idempotent = IDEMPOTENT_METHODS, retry_busy = True):
+    self.max_attempts = max_attempts
+    self.backoff = backoff
+    self.multiplier = multiplier
+    self.max_backoff = max_backoff
+    self.jitter = jitter
+    self.idempotent = frozenset(idempotent)
+    self.retry_busy = retry_busy
+
+  def delay (self, attempt):
+    """Seconds to wait before retry number `attempt` (0-based)."""
+    d = min(self.max_backoff, self.backoff * (self.multiplier ** attempt))
+    if self.jitter:
+      return random.uniform(0, d)
+    return d
+
+  def retryable (self, method, exc = None, result = None):
+    """True if the outcome (`exc` raised, or `result` returned) of a call to `method` may be retried."""
+    if exc is not None:
+      if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+      if method not in self.idempotent:
+        return False
+      if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+      if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code in RETRY_STATUSES
+      return False
+    return self.retry_busy and isBusy(result)
+
+  def backoffFor (self, method, attempt, exc = None, result = None):
+    """Returns the delay before the next attempt, or `None` if the call should not be retried."""
+    if attempt + 1 >= self.max_attempts:
+      return None
+    if not self.retryable(method, exc, result):
+      return None
+    return self.delay(attempt)
+
+
+class CircuitBreaker(object):
+  """Per-aggregate (scheme/host/port) circuit breaker.
+
+  After `failure_threshold` consecutive transport failures (connection errors, timeouts, HTTP 5xx)
+  calls to that endpoint fail immediately with :py:class:`CircuitOpenError` for `reset_timeout`
+  seconds.  After that a single trial call is let through; success closes the circuit, failure
+  re-opens it.  Any response from the server (including AM-level errors) counts as success.
+
+  Args:
+    failure_threshold (int): Consecutive failures before the circuit opens
+    reset_timeout (float): Seconds the circuit stays open before a trial call is allowed
+  """
+
+  def __init__ (self, failure_threshold = 3, reset_timeout = 120.0):
+    self.failure_threshold = failure_threshold
+    self.reset_timeout = reset_timeout
+    self._lock = threading.Lock()
+    self._state = {}
+
+  @staticmethod
+  def endpoint (url):
+    pr = urlparse(url)
+    return "%s://%s" % (pr.scheme, pr.netloc)
+
+  @staticmethod
+  def isFailure (exc):
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+      return True
+    if isinstance(exc, requests.exceptions.HTTPError):
+      return exc.response is None or exc.response.status_code >= 500
+    return False
+
+  def before (self, url):
+    """Raises :py:class:`CircuitOpenError` if calls to `url` should not be attempted.
+
+    Returns:
+      bool: `True` if this call is the trial call of a half-open circuit, in which case its
+      outcome must be passed to :py:meth:`record` (or the trial released with :py:meth:`abandon`)
+    """
+    ep = CircuitBreaker.endpoint(url)
+    with self._lock:
+      (failures, opened_at, trial) = self._state.get(ep, (0, None, False))
+      if opened_at is None:
+        return False
+      retry_at = opened_at + self.reset_timeout
+      if time.time() < retry_at or trial:
+        raise CircuitOpenError(ep, retry_at)
+      self._state[ep] = (failures, opened_at, True)
+      return True
+
+  def record (self, url, exc = None):
+    """Record the outcome of a call to `url` (`exc` is the exception raised, if any)."""
+    ep = CircuitBreaker.endpoint(url)
+    with self._lock:
+      if exc is None or not CircuitBreaker.isFailure(exc):
+        self._state.pop(ep, None)
+        return
+      (failures, opened_at, _) = self._state.get(ep, (0, None, False))
+      failures += 1
+      if failures >= self.failure_threshold:
+        opened_at = time.time()
+      self._state[ep] = (failures, opened_at, False)
+
+  def abandon (self, url):
+    """Release the trial call to `url` without recording an outcome (e.g. it was interrupted),
+    so that the next call may be the trial instead."""
+    ep = CircuitBreaker.endpoint(url)
+    with self._lock:
+      (failures, opened_at, trial) = self._state.get(ep, (0, None, False))
+      if trial:
+        self._state[ep] = (failures, opened_at, False)
+
+  def isOpen (self, url):
+    ep = CircuitBreaker.endpoint(url)
+    with self._lock:
+      (_, opened_at, _) = self._state.get(ep, (0, None, False))
+      return opened_at is not None and time.time() < opened_at + self.reset_timeout
+
+  def reset (self, url = None):
+    """Close the circuit for `url`, or all circuits if `url` is `None`."""
+    with self._lock:
+      if url is None:
+        self._state.clear()
+      else:
+        self._state.pop(CircuitBreaker.endpoint(url), None)
@@ -6,9 +6,26 @@
 
 from __future__ import absolute_import
 
+import base64
+import binascii
+import contextlib
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
 from six.moves import xmlrpc_client as xmlrpclib
+from six.moves.urllib.parse import urlparse
 
+from lxml import etree as ET
 import requests
+from urllib3 import connection as U3C, connectionpool as U3P
+from urllib3 import exceptions as U3E
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.timeout import Timeout as U3Timeout
 
 from .. import _coreutil as GCU
 from . import config
@@ -18,16 +35,641 @@ GCU.disableUrllibWarnings()
 def headers ():
   return GCU.defaultHeaders()
 
+def decompress (value):
+  """Decode a `geni_compressed` result value (base64-encoded zlib or gzip data) into the raw
+  bytes of the original document, suitable for passing directly to `lxml`."""
+  if isinstance(value, xmlrpclib.Binary):
+    data = value.data
+  else:
+    data = base64.b64decode(value)
+  # Accept either a zlib or a gzip header, as aggregates differ
+  return zlib.decompress(data, zlib.MAX_WBITS | 32)
+
+
+# Per-thread CallInfo for the call in progress (only set when hooks are configured)
+_calls = threading.local()
+
+def _currentCall ():
+  return getattr(_calls, "info", None)
+
+
+def _createConnection (address, timeout, source_address, socket_options, info):
+  """`urllib3.util.connection.create_connection()`, recording the time spent resolving `address`
+  and connecting to the result as the `dns` and `connect` timings of `info`."""
+  (host, port) = address
+  if host.startswith("["):
+    host = host.strip("[]")
+  try:
+    host.encode("idna")
+  except UnicodeError:
+    raise U3E.LocationParseError("'%s', label empty or too long" % (host))
+
+  t0 = time.perf_counter()
+  try:
+    addrs = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+  finally:
+    t1 = time.perf_counter()
+    info.timings["dns"] = t1 - t0
+
+  err = None
+  try:
+    for (af, socktype, proto, _, sa) in addrs:
+      sock = None
+      try:
+        sock = socket.socket(af, socktype, proto)
+        for opt in socket_options or ():
+          sock.setsockopt(*opt)
+        if timeout is not U3Timeout.DEFAULT_TIMEOUT:
+          sock.settimeout(timeout)
+        if source_address:
+          sock.bind(source_address)
+        sock.connect(sa)
+        return sock
+      except OSError as e:
+        err = e
+        if sock is not None:
+          sock.close()
+    if err is not None:
+      raise err
+    raise OSError("getaddrinfo returns an empty list")
+  finally:
+    info.timings["connect"] = time.perf_counter() - t1
+
+
+class _TimedConnectionMixin(object):
+  """Records DNS/connect/TLS/first-byte timings into the current :py:class:`geni.minigcf.metrics.CallInfo`."""
+
+  def _new_conn (self):
+    info = _currentCall()
+    if info is None:
+      return super(_TimedConnectionMixin, self)._new_conn()
+
+    # Same as urllib3's _new_conn(), but with resolution and connection timed separately
+    info.new_connection = True
+    try:
+      sock = _createConnection((getattr(self, "_dns_host", self.host), self.port), self.timeout,
+                               self.source_address, self.socket_options, info)
+    except socket.gaierror as e:
+      raise U3E.NameResolutionError(self.host, self, e) from e
+    except socket.timeout as e:
+      raise U3E.ConnectTimeoutError(self, "Connection to %s timed out. (connect timeout=%s)"
+                                    % (self.host, self.timeout)) from e
+    except OSError as e:
+      raise U3E.NewConnectionError(self, "Failed to establish a new connection: %s" % (e)) from e
+
+    sys.audit("http.client.connect", self, self.host, self.port)
+    return sock
+
+  def connect (self):
+    info = _currentCall()
+    if info is None:
+      return super(_TimedConnectionMixin, self).connect()
+    t0 = time.perf_counter()
+    try:
+      return super(_TimedConnectionMixin, self).connect()
+    finally:
+      setup = time.perf_counter() - t0
+      info.timings["tls"] = max(0.0, setup - info.timings["dns"] - info.timings["connect"])
+
+  def request (self, *args, **kwargs): # pylint: disable=arguments-differ
+    try:
+      return super(_TimedConnectionMixin, self).request(*args, **kwargs)
+    finally:
+      self._geni_sent = time.perf_counter()
+
+  def getresponse (self, *args, **kwargs): # pylint: disable=arguments-differ
+    resp = super(_TimedConnectionMixin, self).getresponse(*args, **kwargs)
+    info = _currentCall()
+    if info is not None and getattr(self, "_geni_sent", None) is not None:
+      info.timings["first_byte"] = time.perf_counter() - self._geni_sent
+    return resp
+
+class _TimedHTTPConnection(_TimedConnectionMixin, U3C.HTTPConnection):
+  pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, U3C.HTTPSConnection):
+  pass
+
+class _TimedHTTPConnectionPool(U3P.HTTPConnectionPool):
+  ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(U3P.HTTPSConnectionPool):
+  ConnectionCls = _TimedHTTPSConnection
+
+class TimedHttpAdapter(GCU.TLSHttpAdapter):
+  """Transport adapter used for all MiniGCF sessions.  Behaves exactly like
+  :py:class:`geni._coreutil.TLSHttpAdapter`, but when call hooks are configured also records
+  connection setup and time-to-first-byte for each call."""
+
+  def init_poolmanager (self, *args, **kwargs): # pylint: disable=arguments-differ
+    super(TimedHttpAdapter, self).init_poolmanager(*args, **kwargs)
+    self.poolmanager.pool_classes_by_scheme = {"http" : _TimedHTTPConnectionPool,
+                                               "https" : _TimedHTTPSConnectionPool}
+
+
+class SessionPool(object):
+  """Process-wide cache of `requests.Session` objects, keyed by AM endpoint (scheme, host and port)
+  and client certificate/key pair, so that repeated calls to the same aggregate reuse kept-alive
+  TLS connections instead of performing a new handshake for every call.
+
+  Pool sizing and idle eviction are controlled by :py:class:`geni.minigcf.config.HTTP`.
+
+  .. note::
+    Open connections can not be safely shared between processes.  The pool is drained automatically
+    in a child process after `os.fork()` (on platforms that support fork hooks), and on first use in
+    any process other than the one that created the cached sessions.  You may also call
+    :py:meth:`drain` (or :py:func:`drainSessions`) yourself at any time.
+  """
+
+  def __init__ (self):
+    self._lock = threading.Lock()
+    self._sessions = {}
+    self._pid = os.getpid()
+
+  @staticmethod
+  def _endpoint (url):
+    pr = urlparse(url)
+    return "%s://%s/" % (pr.scheme, pr.netloc)
+
+  def _build (self, endpoint):
+    s = requests.Session()
+    s.mount(endpoint, TimedHttpAdapter(pool_connections = 1, pool_maxsize = config.HTTP.POOL_MAXSIZE))
+    return s
+
+  def _evict (self, now):
+    if not config.HTTP.POOL_IDLE_TIMEOUT:
+      return
+    for key, entry in list(self._sessions.items()):
+      (session, last_used, users) = entry
+      # Sessions that are checked out may still have a call in flight
+      if not users and (now - last_used) > config.HTTP.POOL_IDLE_TIMEOUT:
+        del self._sessions[key]
+        session.close()
+
+  def get (self, url, cert):
+    """Check out a session suitable for posting to `url` with the client `cert` (a `(cert, key)` tuple).
+
+    The session is not evicted while it is checked out - every call must be paired with
+    :py:meth:`release` (or use :py:meth:`checkout`)."""
+    endpoint = SessionPool._endpoint(url)
+    key = (endpoint, cert)
+    now = time.time()
+
+    with self._lock:
+      if self._pid != os.getpid():
+        self._sessions = {}
+        self._pid = os.getpid()
+
+      self._evict(now)
+
+      try:
+        entry = self._sessions[key]
+      except KeyError:
+        entry = [self._build(endpoint), now, 0]
+        self._sessions[key] = entry
+      entry[1] = now
+      entry[2] += 1
+
+    return entry[0]
+
+  def release (self, url, cert, session):
+    """Return a session obtained from :py:meth:`get` to the pool; its idle time starts now."""
+    key = (SessionPool._endpoint(url), cert)
+    with self._lock:
+      entry = self._sessions.get(key)
+      if entry is not None and entry[0] is session:
+        entry[1] = time.time()
+        entry[2] = max(entry[2] - 1, 0)
+
+  @contextlib.contextmanager
+  def checkout (self, url, cert):
+    """Context manager form of :py:meth:`get` / :py:meth:`release`."""
+    session = self.get(url, cert)
+    try:
+      yield session
+    finally:
+      self.release(url, cert, session)
+
+  def drain (self, close = True):
+    """Drop all cached sessions.
+
+    Args:
+      close (bool): Close the underlying connections.  Pass `False` in a forked child
+        to drop references without touching sockets shared with the parent process.
+    """
+    with self._lock:
+      sessions = self._sessions
+      self._sessions = {}
+      self._pid = os.getpid()
+
+    if close:
+      for (session, _, _) in sessions.values():
+        session.close()
+
+  def __len__ (self):
+    return len(self._sessions)
+
+
+SESSIONS = SessionPool()
+
+def drainSessions (close = True):
+  """Drain the process-wide session pool used for all MiniGCF calls."""
+  SESSIONS.drain(close)
+
+def _afterFork ():
+  # The child inherits the parent's lock state and connections - start fresh
+  SESSIONS._lock = threading.Lock()
+  SESSIONS.drain(False)
+
+if hasattr(os, "register_at_fork"):
+  os.register_at_fork(after_in_child = _afterFork)
+
+
+@contextlib.contextmanager
+def _session (url, cert):
+  if config.HTTP.PERSISTENT_CONNECTIONS:
+    with SESSIONS.checkout(url, cert) as s:
+      yield s
+    return
+
+  s = requests.Session()
+  s.mount(url, TimedHttpAdapter())
+  yield s
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+class _PayloadSink(object):
+  """Incrementally feeds the text of an XML-RPC string value into an lxml parser, optionally
+  base64/zlib decoding it on the way (for `geni_compressed` results).
+
+  `parser_factory`, if given, is called with the encoding override (`None` or `"utf-8"`) and must
+  return an object with lxml-style `feed(data)` and `close()` methods; the result of `close()`
+  becomes the decoded value.  By default the value is parsed into an lxml tree.
+
+  Error responses carry a plain message in `value`, so the text is held back until it is known
+  to be a document (it starts with `<`, or decodes as base64/zlib when compressed); otherwise
+  `close()` returns it unchanged as a string."""
+
+  def __init__ (self, compressed, parser_factory = None):
+    self._compressed = compressed
+    self._b64 = ""
+    self._zobj = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    self._raw = []      # Text held back while undecided
+    self._state = None  # None (undecided), "doc" or "plain"
+    self.used = False
+    if parser_factory is None:
+      parser_factory = lambda encoding: ET.XMLParser(encoding = encoding)
+    if compressed:
+      # Raw document bytes, honour the document encoding declaration
+      self._parser = parser_factory(None)
+    else:
+      # We re-encode text that has already been decoded by the envelope parser
+      self._parser = parser_factory("utf-8")
+
+  def feed (self, text):
+    self.used = True
+    if self._state is None:
+      self._raw.append(text)
+    elif self._state == "plain":
+      self._raw.append(text)
+      return
+
+    if not self._compressed:
+      if self._state is None:
+        head = "".join(self._raw).lstrip()
+        if not head:
+          return
+        if not head.startswith("<"):
+          self._state = "plain"
+          return
+        self._state = "doc"
+        text = "".join(self._raw)
+        self._raw = []
+      self._parser.feed(text.encode("utf-8"))
+      return
+
+    self._b64 += "".join(text.split())
+    cut = len(self._b64) - (len(self._b64) % 4)
+    if cut:
+      data = self._decode(self._b64[:cut])
+      self._b64 = self._b64[cut:]
+      if data:
+        self._parser.feed(data)
+
+  def _decode (self, b64):
+    if self._state is not None:
+      return self._zobj.decompress(base64.b64decode(b64))
+    try:
+      data = self._zobj.decompress(base64.b64decode(b64, validate = True))
+    except (binascii.Error, ValueError, zlib.error):
+      self._state = "plain"
+      return None
+    if data:
+      self._state = "doc"
+      self._raw = []
+    return data
+
+  def close (self):
+    if self._compressed and self._state != "plain":
+      if self._b64:
+        data = self._decode(self._b64)
+        if data:
+          self._parser.feed(data)
+      if self._state is None:
+        try:
+          data = self._zobj.flush()
+        except zlib.error:
+          data = None
+        if data:
+          self._state = "doc"
+          self._parser.feed(data)
+        else:
+          self._state = "plain"
+      elif self._state == "doc":
+        self._parser.feed(self._zobj.flush())
+    if self._state != "doc":
+      return "".join(self._raw)
+    return self._parser.close()
+
+
+class _StreamingResponseTarget(object):
+  """Expat target that hands the XML-RPC envelope to the stdlib unmarshaller, but diverts the
+  contents of the top-level struct's `value` member into a :py:class:`_PayloadSink`, so the
+  (potentially very large) rspec never exists as a single Python string."""
+
+  # methodResponse/params/param/value/struct/member
+  MEMBER_DEPTH = 6
+
+  def __init__ (self, unmarshaller, sink):
+    self._um = unmarshaller
+    self._sink = sink
+    self._stack = []
+    self._name = []
+    self._member_name = None
+    self._state = None  # None, "pending", "divert"
+    self._ws = []
+
+  def xml (self, encoding, standalone):
+    self._um.xml(encoding, standalone)
+
+  def start (self, tag, attrs):
+    depth = len(self._stack)
+    if self._state == "pending":
+      self._ws = []
+      if tag in ("string", "base64"):
+        self._state = "divert"
+        self._stack.append(tag)
+        self._um.start("string", {})
+        return
+      self._state = None
+    elif self._state == "divert":
+      # Markup inside a string value is not valid XML-RPC
+      raise xmlrpclib.ResponseError("Unexpected element <%s> inside string value" % (tag))
+
+    if depth == self.MEMBER_DEPTH and tag == "value" and self._member_name == "value":
+      self._state = "pending"
+    elif depth == self.MEMBER_DEPTH and tag == "name":
+      self._name = []
+
+    self._stack.append(tag)
+    self._um.start(tag, attrs)
+
+  def data (self, text):
+    if self._state == "divert":
+      self._sink.feed(text)
+      return
+    if self._state == "pending":
+      if not text.strip():
+        self._ws.append(text)
+        return
+      # Implicit string value (no <string> element)
+      self._state = "divert"
+      for ws in self._ws:
+        self._sink.feed(ws)
+      self._ws = []
+      self._sink.feed(text)
+      return
+    if len(self._stack) == self.MEMBER_DEPTH + 1 and self._stack[-1] == "name":
+      self._name.append(text)
+    self._um.data(text)
+
+  def end (self, tag):
+    self._stack.pop()
+    if self._state == "divert":
+      if tag in ("string", "base64"):
+        self._um.end("string")
+        self._state = None
+        return
+      # End of an implicit string value
+      self._state = None
+    elif self._state == "pending":
+      self._state = None
+      for ws in self._ws:
+        self._um.data(ws)
+      self._ws = []
+
+    if len(self._stack) == self.MEMBER_DEPTH and tag == "name":
+      self._member_name = "".join(self._name).strip()
+    self._um.end(tag)
+
+
+class _StreamingResponseParser(object):
+  def __init__ (self, compressed, parser_factory = None):
+    self._um = xmlrpclib.Unmarshaller(use_datetime = True)
+    self._sink = _PayloadSink(compressed, parser_factory)
+    self._parser = xmlrpclib.ExpatParser(_StreamingResponseTarget(self._um, self._sink))
+    # Coalesce character data so entity-heavy payloads don't cost one callback per reference
+    self._parser._parser.buffer_text = True
+    self._parser._parser.buffer_size = STREAM_CHUNK_SIZE
+
+  def feed (self, data):
+    self._parser.feed(data)
+
+  def close (self):
+    self._parser.close()
+    res = self._um.close()[0]
+    if self._sink.used and isinstance(res, dict):
+      res["value"] = self._sink.close()
+    return res
+
+
+SPOOL_MAX_SIZE = 4 * 1024 * 1024
+_SPOOL_TOKEN = "__geni_lib_spooled_parameter__"
+
+class _EscapingWriter(object):
+  """Write XML text into the body of an XML-RPC <string> value."""
+
+  def __init__ (self, f):
+    self._f = f
+
+  def write (self, data):
+    if isinstance(data, str):
+      data = data.encode("utf-8")
+    self._f.write(data.replace(b"&", b"&amp;").replace(b"<", b"&lt;").replace(b">", b"&gt;"))
+
+
+class SpooledRequest(object):
+  """Marshalled XML-RPC request held in a spooled temporary file (in memory up to
+  `SPOOL_MAX_SIZE` bytes, on disk beyond that), built by :py:func:`spoolRequest`.  It is
+  posted with a known `Content-Length` without ever being held as a single string."""
+
+  def __init__ (self, method, f, size):
+    self.method = method
+    self._f = f
+    self._size = size
+
+  def __len__ (self):
+    return self._size
+
+  def __iter__ (self):
+    self._f.seek(0)
+    while True:
+      chunk = self._f.read(STREAM_CHUNK_SIZE)
+      if not chunk:
+        break
+      yield chunk
+
+  def close (self):
+    self._f.close()
+
+  def __repr__ (self):
+    return "<SpooledRequest %s, %d bytes>" % (self.method, self._size)
+
+
+def spoolRequest (methodname, params, index, writer):
+  """Marshal an XML-RPC call to a :py:class:`SpooledRequest`.  The string parameter at position
+  `index` is not taken from `params`: `writer(f)` is called to write its text (as `str` or UTF-8
+  `bytes`) to the file-like object `f`, and it is escaped as it is written."""
+  params = list(params)
+  params[index] = _SPOOL_TOKEN
+  (head, tail) = xmlrpclib.dumps(tuple(params), methodname = methodname).split(_SPOOL_TOKEN)
+
+  f = tempfile.SpooledTemporaryFile(max_size = SPOOL_MAX_SIZE)
+  f.write(head.encode("utf-8"))
+  writer(_EscapingWriter(f))
+  f.write(tail.encode("utf-8"))
+  return SpooledRequest(methodname, f, f.tell())
+
+
+def _instrumented (post, url, req_data, *args, **kwargs):
+  """Call `post(url, req_data, ...)`, running the configured pre/post call hooks around it."""
+  pre_hooks = config.HTTP.PRE_CALL_HOOKS
+  post_hooks = config.HTTP.POST_CALL_HOOKS
+  if not pre_hooks and not post_hooks:
+    return post(url, req_data, *args, **kwargs)
+
+  from .metrics import CallInfo
+  info = CallInfo(url, req_data)
+  for hook in pre_hooks:
+    hook(info)
+
+  _calls.info = info
+  start = time.perf_counter()
+  try:
+    res = post(url, req_data, *args, **kwargs)
+    info.setResult(res)
+    return res
+  except Exception as e:
+    info.error = e
+    raise
+  finally:
+    info.timings["total"] = time.perf_counter() - start
+    _calls.info = None
+    for hook in post_hooks:
+      hook(info)
+
+def _withPolicy (post, url, req_data, *args, **kwargs):
+  """Call `post(url, req_data, ...)` under the configured retry policy and circuit breaker."""
+  policy = config.HTTP.RETRY_POLICY
+  breaker = config.HTTP.CIRCUIT_BREAKER
+  if policy is None and breaker is None:
+    return _instrumented(post, url, req_data, *args, **kwargs)
+
+  from .retry import methodName
+  method = methodName(req_data)
+  attempt = 0
+  trial = breaker.before(url) if breaker else False
+  try:
+    while True:
+      try:
+        res = _instrumented(post, url, req_data, *args, **kwargs)
+      except requests.exceptions.RequestException as e:
+        if breaker:
+          breaker.record(url, e)
+          trial = False
+          if breaker.isOpen(url):
+            raise
+        delay = policy.backoffFor(method, attempt, exc = e) if policy else None
+        if delay is None:
+          raise
+      except Exception:
+        # Faults and unparseable responses still mean the aggregate is reachable
+        if breaker:
+          breaker.record(url)
+          trial = False
+        raise
+      else:
+        if breaker:
+          breaker.record(url)
+          trial = False
+        delay = policy.backoffFor(method, attempt, result = res) if policy else None
+        if delay is None:
+          return res
+      attempt += 1
+      time.sleep(delay)
+  finally:
+    if trial:
+      breaker.abandon(url)
+
+def _rpcpoststream (url, req_data, cert, root_bundle, compressed = False, parser_factory = None):
+  """Version of :py:func:`_rpcpost` for calls whose result struct carries a large XML document in
+  its `value` member (ListResources).  The response is parsed incrementally as it comes off the
+  socket and `value` is returned as an lxml root element instead of a string.  If `compressed` is
+  `True` the value is base64/zlib decoded on the fly.  A `parser_factory` (see :py:class:`_PayloadSink`)
+  replaces the default tree-building parser.  Raw response logging is not supported in this mode."""
+  return _withPolicy(_rpcpoststreamonce, url, req_data, cert, root_bundle, compressed, parser_factory)
+
 # pylint: disable=unsubscriptable-object
+def _rpcpoststreamonce (url, req_data, cert, root_bundle, compressed, parser_factory = None):
+  if isinstance(config.HTTP.LOG_URLS, tuple):
+    config.HTTP.LOG_URLS[0].log(config.HTTP.LOG_URLS[1], "POST: %s" % (url))
+  if isinstance(config.HTTP.LOG_RAW_REQUESTS, tuple):
+    config.HTTP.LOG_RAW_REQUESTS[0].log(config.HTTP.LOG_RAW_REQUESTS[1], req_data)
+  with _session(url, cert) as s:
+    resp = s.post(url, req_data, cert=cert, verify=root_bundle, headers = headers(), stream = True,
+                  timeout = config.HTTP.TIMEOUT, allow_redirects = config.HTTP.ALLOW_REDIRECTS)
+    info = _currentCall()
+    try:
+      if info is not None:
+        info.status = resp.status_code
+      if resp.status_code != 200:
+        resp.raise_for_status()
+      parser = _StreamingResponseParser(compressed, parser_factory)
+      for chunk in resp.iter_content(STREAM_CHUNK_SIZE):
+        if info is not None:
+          info.response_size += len(chunk)
+        parser.feed(chunk)
+      return parser.close()
+    finally:
+      resp.close()
+
 def _rpcpost (url, req_data, cert, root_bundle):
+  return _withPolicy(_rpcpostonce, url, req_data, cert, root_bundle)
+
+# pylint: disable=unsubscriptable-object
+def _rpcpostonce (url, req_data, cert, root_bundle):
   if isinstance(config.HTTP.LOG_URLS, tuple):
     config.HTTP.LOG_URLS[0].log(config.HTTP.LOG_URLS[1], "POST: %s" % (url))
-  s = requests.Session()
-  s.mount(url, GCU.TLSHttpAdapter())
   if isinstance(config.HTTP.LOG_RAW_REQUESTS, tuple):
     config.HTTP.LOG_RAW_REQUESTS[0].log(config.HTTP.LOG_RAW_REQUESTS[1], req_data)
-  resp = s.post(url, req_data, cert=cert, verify=root_bundle, headers = headers(),
-                timeout = config.HTTP.TIMEOUT, allow_redirects = config.HTTP.ALLOW_REDIRECTS)
+  with _session(url, cert) as s:
+    resp = s.post(url, req_data, cert=cert, verify=root_bundle, headers = headers(),
+                  timeout = config.HTTP.TIMEOUT, allow_redirects = config.HTTP.ALLOW_REDIRECTS)
+  info = _currentCall()
+  if info is not None:
+    info.status = resp.status_code
+    info.response = resp.content
+    info.response_size = len(resp.content)
   if resp.status_code != 200:
     resp.raise_for_status()
   if isinstance(config.HTTP.LOG_RAW_RESPONSES, tuple):
@@ -4,6 +4,14 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import sys
+
+def internstr (val):
+  """`sys.intern` for attribute values that may be `None`."""
+  if val is None:
+    return None
+  return sys.intern(val)
+
 class XPathXRange(object):
   def __init__ (self, xp, klass):
     self._data = xp
@@ -15,3 +23,71 @@ class XPathXRange(object):
     return len(self._data)
   def __getitem__ (self, idx):
     return self._klass._fromdom(self._data[idx])
+
+
+class CachedXPathXRange(XPathXRange):
+  """XPathXRange that builds each wrapper object at most once and hands out the same
+  object on subsequent iteration or indexing."""
+
+  def __init__ (self, xp, klass):
+    super(CachedXPathXRange, self).__init__(xp, klass)
+    self._objs = [None] * len(xp)
+
+  def _get (self, idx):
+    obj = self._objs[idx]
+    if obj is None:
+      obj = self._klass._fromdom(self._data[idx])
+      self._objs[idx] = obj
+    return obj
+
+  def __iter__ (self):
+    for idx in range(len(self._data)):
+      yield self._get(idx)
+
+  def __getitem__ (self, idx):
+    if isinstance(idx, slice):
+      return [self._get(i) for i in range(*idx.indices(len(self._data)))]
+    return self._get(idx)
+
+
+def _slotnames (cls):
+  names = cls.__dict__.get("_slotnames_cache")
+  if names is None:
+    names = []
+    for klass in reversed(cls.__mro__):
+      for name in klass.__dict__.get("__slots__", ()):
+        if name not in names:
+          names.append(name)
+    names = tuple(names)
+    setattr(cls, "_slotnames_cache", names)
+  return names
+
+
+class SlottedObject(object):
+  """Base for compact (`__slots__`) parsed rspec wrapper objects.
+
+  Subclasses that keep a reference to the element they were parsed from store it in
+  an `_elem` slot; :py:meth:`detach` drops it so the source tree can be freed, and it
+  is never pickled."""
+
+  __slots__ = ()
+
+  def detach (self):
+    """Drop the reference to the source XML element, if any.  Returns `self`."""
+    if "_elem" in _slotnames(type(self)):
+      self._elem = None
+    return self
+
+  def __getstate__ (self):
+    # Positional slot values keep the pickled form small
+    return tuple([None if name == "_elem" else getattr(self, name, None) for name in _slotnames(type(self))])
+
+  def __setstate__ (self, state):
+    if isinstance(state, dict):
+      if "_elem" in _slotnames(type(self)):
+        self._elem = None
+      state = state.items()
+    else:
+      state = zip(_slotnames(type(self)), state)
+    for (name, val) in state:
+      setattr(self, name, val)
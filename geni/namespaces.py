@@ -21,5 +21,5 @@ OFv4 = Namespace("openflow", "http://www.geni.net/resources/rspec/ext/openflow/4
 SVLAN = Namespace("sharedvlan", "http://www.geni.net/resources/rspec/ext/shared-vlan/1",
                   "http://www.geni.net/resources/rspec/ext/shared-vlan/1/request.xsd")
 OPSTATE = Namespace("opstate", "http://www.geni.net/resources/rspec/ext/opstate/1",
-                    "http://http://www.geni.net/resources/rspec/ext/opstate/1/ad.xsd")
+                    "http://www.geni.net/resources/rspec/ext/opstate/1/ad.xsd")
 USER = Namespace("user", "http://www.geni.net/resources/rspec/ext/user/1")
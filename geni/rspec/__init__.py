@@ -6,9 +6,36 @@
 
 from __future__ import absolute_import
 
+import hashlib
+
 from lxml import etree as ET
+import six
+
 import geni.namespaces as GNS
 
+def canonicalXML (xml):
+  """Returns the Exclusive XML Canonicalization (C14N) of `xml` (element, or XML text as `bytes`
+  or `str`), with the `xsi:schemaLocation` pairs in sorted order.  Documents that differ only
+  in attribute order, namespace declaration order, or namespaces declared but not used
+  canonicalize to the same bytes."""
+  if isinstance(xml, six.text_type):
+    xml = xml.encode("utf-8")
+  if isinstance(xml, bytes):
+    root = ET.fromstring(xml)
+  else:
+    root = xml
+
+  attr = "{%s}schemaLocation" % (GNS.XSNS.name)
+  locs = root.get(attr)
+  if locs is not None:
+    toks = locs.split()
+    pairs = sorted(set(zip(toks[0::2], toks[1::2])))
+    if root is xml:
+      root = ET.fromstring(ET.tostring(root))
+    root.set(attr, " ".join(["%s %s" % pair for pair in pairs]))
+
+  return ET.tostring(root, method = "c14n", exclusive = True, with_comments = False)
+
 class RSpec (object):
   def __init__ (self, rtype):
     self.NSMAP = {}
@@ -39,6 +66,15 @@ class RSpec (object):
     else:
       return ET.tostring(rspec, pretty_print = pretty_print)
 
+  def toCanonicalXML (self):
+    """Returns the canonical serialization of this rspec (see :py:func:`canonicalXML`)."""
+    return canonicalXML(self.toXMLString())
+
+  def digest (self, algorithm = "sha256"):
+    """Returns a hex digest of :py:meth:`toCanonicalXML`, which is stable across processes and
+    across the order in which resources' attributes and namespaces were added."""
+    return hashlib.new(algorithm, self.toCanonicalXML()).hexdigest()
+
   def getDOM (self):
     rspec = ET.Element("rspec", nsmap = self.NSMAP)
     rspec.attrib["{%s}schemaLocation" % (GNS.XSNS.name)] = " ".join(self._loclist)
@@ -0,0 +1,41 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Precompiled XPath evaluators shared by the rspec parsers
+
+from __future__ import absolute_import
+
+import threading
+
+from lxml import etree as ET
+
+class XPathSet(object):
+  """Compiled `etree.XPath` objects for one rspec dialect (namespace prefix map).
+
+  Each expression is compiled the first time it is used and reused afterwards, so
+  parsers can keep writing `_XP(elem, 'g:sliver_type')` in per-element loops in place
+  of `elem.xpath('g:sliver_type', namespaces = ...)`, which recompiles on every call.
+  Keyword arguments are passed through as XPath variables (`$name`).
+  """
+
+  def __init__ (self, namespaces):
+    self.namespaces = dict(namespaces)
+    self._compiled = {}
+    self._lock = threading.Lock()
+
+  def compile (self, expr):
+    xp = self._compiled.get(expr)
+    if xp is None:
+      with self._lock:
+        xp = self._compiled.get(expr)
+        if xp is None:
+          xp = ET.XPath(expr, namespaces = self.namespaces)
+          self._compiled[expr] = xp
+    return xp
+
+  def __call__ (self, elem, expr, **variables):
+    return self.compile(expr)(elem, **variables)
+
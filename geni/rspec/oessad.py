@@ -12,15 +12,19 @@ import six
 from .. import namespaces as GNS
 from .pg import Namespaces as PGNS
 from . import stitching
+from ._xpath import XPathSet
 
 _XPNS = {'g' : GNS.REQUEST.name, 'e' : PGNS.EMULAB.name, 't' : stitching.STITCHNS.name}
+_XP = XPathSet(_XPNS)
 
 class Advertisement(object):
   def __init__ (self, path = None, xml = None):
     if path:
       self._root = ET.parse(open(path))
+    elif ET.iselement(xml):
+      self._root = xml
     elif xml:
-      if six.PY3:
+      if isinstance(xml, six.text_type):
         self._root = ET.fromstring(bytes(xml, "utf-8"))
       else:
         self._root = ET.fromstring(xml)
@@ -29,7 +33,7 @@ class Advertisement(object):
   def stitchinfo (self):
     """Reference to the stitching info in the manifest, if present."""
     try:
-      elem = self._root.xpath('/g:rspec/t:stitching', namespaces=_XPNS)[0]
+      elem = _XP(self._root, '/g:rspec/t:stitching')[0]
       return stitching.AdInfo(elem)
     except IndexError:
       return None
@@ -11,10 +11,12 @@ import six
 
 import geni.namespaces as GNS
 from .pgad import Location
+from ._xpath import XPathSet
 
 TOPO = GNS.Namespace("topo", "http://geni.bssoftworks.com/rspec/ext/topo/1")
 
 XPNS = {'g' : GNS.REQUEST.name, 'o' : GNS.OFv3.name, 't' : TOPO.name}
+_XP = XPathSet(XPNS)
 
 class Attachment(object):
   def __init__ (self):
@@ -49,7 +51,7 @@ class Port(object):
     p = Port()
     p.name = elem.get("name")
     p.number = elem.get("number")
-    for ofa in elem.xpath('t:geni-of', namespaces = XPNS):
+    for ofa in _XP(elem, 't:geni-of'):
       p.topo.append(OFAttachment._fromdom(ofa))
     return p
 
@@ -67,11 +69,11 @@ class Datapath(object):
     d.dpid = elem.get("dpid")
     d.component_id = elem.get("component_id")
 
-    ports = elem.xpath('o:port', namespaces = XPNS)
+    ports = _XP(elem, 'o:port')
     for pelem in ports:
       d.ports.append(Port._fromdom(pelem))
 
-    lelem = elem.xpath('o:location', namespaces = XPNS)
+    lelem = _XP(elem, 'o:location')
     if lelem:
       d.location = Location._fromdom(lelem[0])
 
@@ -82,8 +84,10 @@ class Advertisement(object):
   def __init__ (self, path = None, xml = None):
     if path:
       self._root = ET.parse(open(path))
+    elif ET.iselement(xml):
+      self._root = xml
     elif xml:
-      if six.PY3:
+      if isinstance(xml, six.text_type):
         self._root = ET.fromstring(bytes(xml, "utf-8"))
       else:
         self._root = ET.fromstring(xml)
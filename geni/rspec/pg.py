@@ -27,11 +27,29 @@ class DuplicateExtensionError(Exception):
   def __str__ (self):
     return "Extension (%s) can only be added to a parent object once" % self.klass.__name__
 
+class _ExtensionHost(object):
+  """Makes the constructors registered in the class `EXTENSIONS` list available as
+  attributes.  Each one is bound (with `_wrapext`) the first time it is used on an
+  instance, rather than for every extension whenever an object is created."""
+
+  def __getattr__ (self, name):
+    if not name.startswith("__"):
+      for (ename, ext) in getattr(type(self), "EXTENSIONS", ()):
+        if ename == name:
+          self._wrapext(name, ext)
+          return self.__dict__[name]
+    raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+  def __dir__ (self):
+    names = set(super(_ExtensionHost, self).__dir__())
+    names.update([name for (name, _) in getattr(type(self), "EXTENSIONS", ())])
+    return sorted(names)
+
 ################################################
 # Base Request - Must be at top for EXTENSIONS #
 ################################################
 
-class Request(geni.rspec.RSpec):
+class Request(_ExtensionHost, geni.rspec.RSpec):
   EXTENSIONS = []
 
   def __init__ (self):
@@ -44,8 +62,6 @@ class Request(geni.rspec.RSpec):
     self.addNamespace(Namespaces.CLIENT)
 
     self._ext_children = []
-    for name,ext in Request.EXTENSIONS:
-      self._wrapext(name,ext)
 
   def _wrapext (self, name, klass):
     @functools.wraps(klass.__init__)
@@ -69,6 +85,69 @@ class Request(geni.rspec.RSpec):
   def resources(self):
     return self._resources + self._ext_children
 
+  def addNodes (self, count, template = None, name_fmt = "node-%d", start = 0, **attrs):
+    """Create `count` nodes and add them to this request.
+
+    Args:
+      count (int): Number of nodes
+      template (callable): Node class (or factory) called with each client ID (default :py:class:`RawPC`)
+      name_fmt (str): Client ID format, applied to the node index
+      start (int): Index of the first node
+      **attrs: Attributes to set on every node (e.g. `disk_image`, `hardware_type`)
+
+    Returns:
+      list: The new nodes
+    """
+    if template is None:
+      template = RawPC
+    attrs = list(attrs.items())
+
+    nodes = []
+    for name in [name_fmt % idx for idx in range(start, start + count)]:
+      node = template(name)
+      for (key, val) in attrs:
+        setattr(node, key, val)
+      self.addResource(node)
+      nodes.append(node)
+    return nodes
+
+  def _connect (self, pairs, template, name_fmt, start):
+    if template is None:
+      template = Link
+    links = []
+    for (idx, (a, b)) in enumerate(pairs, start):
+      lnk = template(None if name_fmt is None else name_fmt % idx)
+      lnk.addInterface(a.addInterface())
+      lnk.addInterface(b.addInterface())
+      self.addResource(lnk)
+      links.append(lnk)
+    return links
+
+  def connectLinear (self, nodes, template = None, name_fmt = None, start = 0):
+    """Connect each node to the next one in `nodes` with a point-to-point link.
+
+    Args:
+      nodes (list): Nodes, in chain order
+      template (callable): Link class (or factory) called with each client ID (default :py:class:`Link`)
+      name_fmt (str): Link client ID format, applied to the link index (default: automatic link IDs)
+      start (int): Index of the first link
+
+    Returns:
+      list: The new links
+    """
+    nodes = list(nodes)
+    return self._connect(zip(nodes, nodes[1:]), template, name_fmt, start)
+
+  def connectStar (self, hub, nodes, template = None, name_fmt = None, start = 0):
+    """Connect `hub` to each node in `nodes` with a point-to-point link.  Arguments and
+    return value are as for :py:meth:`connectLinear`."""
+    return self._connect([(hub, node) for node in nodes], template, name_fmt, start)
+
+  def connectFullMesh (self, nodes, template = None, name_fmt = None, start = 0):
+    """Connect every pair of nodes in `nodes` with a point-to-point link.  Arguments and
+    return value are as for :py:meth:`connectLinear`."""
+    return self._connect(itertools.combinations(nodes, 2), template, name_fmt, start)
+
   def addTour (self, tour):
     self.addNamespace(Namespaces.EMULAB)
     self.addNamespace(Namespaces.JACKS)
@@ -85,15 +164,59 @@ class Request(geni.rspec.RSpec):
     in the GENIv3 format."""
 
     if path is None:
-      f = sys.stdout
+      sys.stdout.write(self.toXMLString(True, ucode = True))
     else:
-      f = open(path, "w+")
-
-    buf = self.toXMLString(True)
-    f.write(buf)
-
-    if path is not None:
-      f.close()
+      self.writeXMLStream(path, True)
+
+  def writeXMLStream (self, out, pretty_print = False):
+    """Serialize the current request contents as a GENIv3 rspec, writing each resource's
+    elements to `out` as soon as they are built, so that the document never exists in memory
+    as a whole DOM or string.  The output is byte-for-byte the same as :py:meth:`toXMLString`.
+
+    Args:
+      out: Path, or binary file-like object with a `write` method (e.g. an open file
+        or `socket.makefile("wb")`)
+      pretty_print (bool): Indent the output
+    """
+
+    if not hasattr(out, "write"):
+      with open(out, "wb") as f:
+        self.writeXMLStream(f, pretty_print)
+      return
+
+    # Each batch of elements is serialized under a copy of the document root, so that
+    # namespace declarations and indentation come out exactly as they do for the whole
+    # document, and the root start and end tags are trimmed off
+    scratch = self.getDOM()
+    started = False
+    writers = [self.tour] if self.tour else []
+    writers.extend(self._resources)
+    writers.extend(self._ext_children)
+    writers.append(None)
+    for obj in writers:
+      if obj is None:
+        for elem in self._raw_elements:
+          scratch.append(elem)
+      else:
+        obj._write(scratch)
+      if not len(scratch):
+        continue
+      buf = ET.tostring(scratch, pretty_print = pretty_print)
+      del scratch[:]
+      head = buf.index(b">") + 1
+      tail = buf.rindex(b"</")
+      if not started:
+        out.write(buf[:head])
+        started = True
+      # Pretty printing puts a newline before the end tag, which is only written once at the end
+      body = buf[head:tail]
+      trim = pretty_print and body.endswith(b"\n")
+      out.write(body[:-1] if trim else body)
+
+    if not started:
+      out.write(ET.tostring(scratch, pretty_print = pretty_print))
+    else:
+      out.write(buf[tail - 1:] if trim else buf[tail:])
 
   def toXMLString (self, pretty_print = False, ucode = False):
     """Return the current request contents as an XML string that represents an rspec
@@ -122,7 +245,7 @@ class Request(geni.rspec.RSpec):
 
 
 
-class Resource(object):
+class Resource(_ExtensionHost):
   def __init__ (self):
     self.namespaces = []
     self._ext_children = []
@@ -215,6 +338,25 @@ class IPv4Address(Address):
     return ip
 
 
+class _InterfaceList(list):
+  """`Node.interfaces`: a list that records whether it was modified other than by
+  :py:meth:`Node.addInterface`, so the node knows when to rebuild its interface names."""
+  _dirty = True
+
+def _intfListMutator (name):
+  method = getattr(list, name)
+  @functools.wraps(method)
+  def wrap (self, *args):
+    self._dirty = True
+    return method(self, *args)
+  return wrap
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "__setitem__",
+              "__delitem__", "__iadd__", "__imul__"):
+  setattr(_InterfaceList, _name, _intfListMutator(_name))
+del _name
+
+
 class Interface(object):
   class InvalidAddressTypeError(Exception):
     def __init__ (self, addr):
@@ -234,6 +376,18 @@ class Interface(object):
     if address:
       self.addAddress(address)
 
+  @property
+  def client_id (self):
+    return self._client_id
+
+  @client_id.setter
+  def client_id (self, value):
+    self._client_id = value
+    # Renames invalidate the owning node's set of interface names
+    node = getattr(self, "node", None)
+    if node is not None and getattr(node, "_intf_names", None) is not None:
+      node._intf_names = None
+
   @property
   def name (self):
     return self.client_id
@@ -297,9 +451,6 @@ class Link(Resource):
     self.latency = Link.DEFAULT_LAT
     self.plr = Link.DEFAULT_PLR
 
-    for name,ext in Link.EXTENSIONS:
-      self._wrapext(name,ext)
-
   def _wrapext (self, name, klass):
     @functools.wraps(klass.__init__)
     def wrap(*args, **kw):
@@ -539,16 +690,16 @@ class Node(Resource):
     self.disk_image = None
     self.type = ntype
     self.hardware_type = None
-    self.interfaces = []
+    self.interfaces = _InterfaceList()
     self.services = []
     self.routable_control_ip = False
     self.component_id = component_id
     self.component_manager_id = None
     self._ext_children = []
-    for name,ext in Node.EXTENSIONS:
-      self._wrapext(name,ext)
-
     self._raw_elements = []
+    self._intf_names = None
+    self._intf_next = 0
+    self._intf_list = None
 
   class DuplicateInterfaceName(Exception):
     def __str__ (self):
@@ -626,25 +777,40 @@ class Node(Resource):
 
     return nd
 
+  def _interfaceNames (self):
+    # Rebuild if `interfaces` was replaced or modified without going through
+    # addInterface(), or if an interface was renamed
+    intfs = self.interfaces
+    if not isinstance(intfs, _InterfaceList):
+      intfs = self.interfaces = _InterfaceList(intfs)
+    if self._intf_names is None or intfs._dirty or intfs is not self._intf_list:
+      self._intf_names = set([x.name for x in intfs])
+      self._intf_next = 0
+      self._intf_list = intfs
+      intfs._dirty = False
+    return self._intf_names
+
   def addInterface (self, name = None, address = None):
-    existingNames = [x.name for x in self.interfaces]
+    existingNames = self._interfaceNames()
     if name is not None:
       if name.find(":") > 0:
         intfName = name
       else:
         intfName = "%s:%s" % (self.client_id, name)
-        pass
+      if intfName in existingNames:
+        raise Node.DuplicateInterfaceName()
     else:
-      for i in range(0, 100):
-        intfName = "%s:if%i" % (self.client_id, i)
-        if intfName not in existingNames:
-          break
-
-    if intfName in existingNames:
-      raise Node.DuplicateInterfaceName()
+      # Lowest free ifN; every index below _intf_next is known to be taken
+      idx = self._intf_next
+      intfName = "%s:if%d" % (self.client_id, idx)
+      while intfName in existingNames:
+        idx += 1
+        intfName = "%s:if%d" % (self.client_id, idx)
+      self._intf_next = idx + 1
 
     intf = Interface(intfName, self, address)
-    self.interfaces.append(intf)
+    list.append(self.interfaces, intf)
+    existingNames.add(intfName)
     return intf
 
   def addService (self, svc):
@@ -6,6 +6,9 @@
 
 from __future__ import absolute_import
 
+import io
+import zlib
+
 from lxml import etree as ET
 import six
 
@@ -13,12 +16,16 @@ from .. import namespaces as GNS
 from .pg import Namespaces as PGNS
 from . import pg
 from . import stitching
-from ..model.util import XPathXRange
+from ..model.util import XPathXRange, CachedXPathXRange, SlottedObject, internstr
+from ._xpath import XPathSet
 
 _XPNS = {'g' : GNS.REQUEST.name, 's' : GNS.SVLAN.name,
          'e' : PGNS.EMULAB.name, 't' : stitching.STITCHNS.name}
+_XP = XPathSet(_XPNS)
+
+class Image(SlottedObject):
+  __slots__ = ("name", "os", "version", "description", "url")
 
-class Image(object):
   def __init__ (self):
     self.name = None
     self.os = None
@@ -31,10 +38,12 @@ class Image(object):
                                                                                    self.description, self.url)
 
   def __hash__ (self):
-    return hash("%s-%s" % (self.name, self.url))
+    return hash((self.name, self.url))
 
   def __eq__ (self, other):
-    return hash(self) == hash(other)
+    if not isinstance(other, Image):
+      return NotImplemented
+    return self.name == other.name and self.url == other.url
 
   def __ne__ (self, other):
     return not self == other
@@ -42,17 +51,19 @@ class Image(object):
   @classmethod
   def _fromdom (cls, elem):
     i = Image()
-    i.name = elem.get("name")
+    i.name = internstr(elem.get("name"))
+    i.url = internstr(elem.get("url"))
     if i.name is None:
-      i.name = elem.get("url")
-    i.os = elem.get("os")
-    i.version = elem.get("version")
-    i.description = elem.get("description")
-    i.url = elem.get("url")
+      i.name = i.url
+    i.os = internstr(elem.get("os"))
+    i.version = internstr(elem.get("version"))
+    i.description = internstr(elem.get("description"))
     return i
 
 
-class Location(object):
+class Location(SlottedObject):
+  __slots__ = ("latitude", "longitude")
+
   def __init__ (self):
     self.latitude = None
     self.longitude = None
@@ -84,19 +95,19 @@ class AdInterface(pg.Interface):
 
   @classmethod
   def _fromdom (cls, elem):
-    eie = elem.xpath('e:interface', namespaces = _XPNS)
+    eie = _XP(elem, 'e:interface')
     name = elem.get("component_id")
     if len(eie) > 0:
       name = eie[0].get("name")
     intf = AdInterface(name)
 
     intf.component_id = elem.get("component_id")
-    intf.role = elem.get("role")
+    intf.role = internstr(elem.get("role"))
 
     return intf
 
 
-class AdNode(object):
+class AdNode(SlottedObject):
   """Wrapper object for a Node in a GENIv3 advertisement.
 
   .. note::
@@ -120,6 +131,9 @@ class AdNode(object):
       cpu (int): Maximum Per-core CPU speed in Mhz.  `None` if not available.
   """
 
+  __slots__ = ("component_id", "component_manager_id", "name", "exclusive", "available", "hardware_types",
+               "sliver_types", "images", "shared", "interfaces", "location", "ram", "cpu", "_elem")
+
   def __init__ (self):
     self.component_id = None
     self.component_manager_id = None
@@ -143,30 +157,30 @@ class AdNode(object):
     node._elem = elem
     node.component_id = elem.get("component_id")
     node.name = elem.get("component_name")
-    node.component_manager_id = elem.get("component_manager_id")
+    node.component_manager_id = internstr(elem.get("component_manager_id"))
     if elem.get("exclusive") == "false":
       node.exclusive = False
 
-    avelem = elem.xpath('g:available', namespaces = _XPNS)
+    avelem = _XP(elem, 'g:available')
     if avelem and avelem[0].get("now") == "true":
       node.available = True
 
-    stypes = elem.xpath('g:sliver_type', namespaces = _XPNS)
+    stypes = _XP(elem, 'g:sliver_type')
     for stype in stypes:
-      sliver_name = stype.get("name")
+      sliver_name = internstr(stype.get("name"))
       node.sliver_types.add(sliver_name)
       node.images[sliver_name] = []
-      ims = stype.xpath('g:disk_image', namespaces = _XPNS)
+      ims = _XP(stype, 'g:disk_image')
       for im in ims:
         node.images[sliver_name].append(Image._fromdom(im))
 
-    htypes = elem.xpath('g:hardware_type', namespaces = _XPNS)
+    htypes = _XP(elem, 'g:hardware_type')
     for htype in htypes:
-      nts = htype.xpath('e:node_type', namespaces = _XPNS)
+      nts = _XP(htype, 'e:node_type')
       if nts:
-        node.hardware_types[htype.get("name")] = nts[0].get("type_slots")
+        node.hardware_types[internstr(htype.get("name"))] = internstr(nts[0].get("type_slots"))
 
-    fds = elem.xpath('e:fd', namespaces = _XPNS)
+    fds = _XP(elem, 'e:fd')
     for fd in fds:
       name = fd.get("name")
       if name == 'pcshared':
@@ -176,10 +190,10 @@ class AdNode(object):
       elif name == 'ram':
         node.ram = int(fd.get("weight"))
 
-    for intf in elem.xpath('g:interface', namespaces = _XPNS):
+    for intf in _XP(elem, 'g:interface'):
       node.interfaces.append(AdInterface._fromdom(intf))
 
-    locelem = elem.xpath('g:location', namespaces = _XPNS)
+    locelem = _XP(elem, 'g:location')
     if locelem:
       node.location = Location._fromdom(locelem[0])
 
@@ -190,7 +204,9 @@ class AdNode(object):
     return ET.tostring(self._root, pretty_print=True, encoding="unicode")
 
 
-class AdLink(object):
+class AdLink(SlottedObject):
+  __slots__ = ("component_id", "link_types", "_elem", "interface_refs")
+
   def __init__ (self):
     self.component_id = None
     self.link_types = set()
@@ -203,11 +219,11 @@ class AdLink(object):
     link._elem = elem
     link.component_id = elem.get("component_id")
 
-    ltypes = elem.xpath('g:link_type', namespaces = _XPNS)
+    ltypes = _XP(elem, 'g:link_type')
     for ltype in ltypes:
-      link.link_types.add(ltype.get("name"))
+      link.link_types.add(internstr(ltype.get("name")))
 
-    irefs = elem.xpath('g:interface_ref', namespaces = _XPNS)
+    irefs = _XP(elem, 'g:interface_ref')
     for iref in irefs:
       link.interface_refs.append(iref.get("component_id"))
 
@@ -232,6 +248,400 @@ class AdSharedVLAN(object):
     return svlan
 
 
+TABLE_COLUMNS = ("aggregate", "component_id", "name", "available", "exclusive", "shared", "raw_pc",
+                 "ram", "cpu", "latitude", "longitude", "hardware_types", "sliver_types")
+_TABLE_BOOL = frozenset(["available", "exclusive", "shared", "raw_pc"])
+_TABLE_FLOAT = frozenset(["ram", "cpu", "latitude", "longitude"])
+_TABLE_STR = frozenset(["aggregate", "component_id", "name"])
+
+def _useNumpy (arrays):
+  if arrays is False:
+    return False
+  try:
+    import numpy # pylint: disable=unused-import
+    return True
+  except ImportError:
+    if arrays:
+      raise
+    return False
+
+def _tableColumns (cols, arrays):
+  if not _useNumpy(arrays):
+    return cols
+
+  import numpy as np
+  out = {}
+  for (name, vals) in cols.items():
+    if name in _TABLE_BOOL:
+      out[name] = np.array(vals, dtype = bool)
+    elif name in _TABLE_FLOAT:
+      out[name] = np.array([np.nan if v is None else v for v in vals], dtype = float)
+    elif name in _TABLE_STR:
+      out[name] = np.array(["" if v is None else v for v in vals], dtype = str)
+    else:
+      arr = np.empty(len(vals), dtype = object)
+      for (idx, val) in enumerate(vals):
+        arr[idx] = val
+      out[name] = arr
+  return out
+
+def concatTables (tables):
+  """Concatenate tables returned by :py:meth:`Advertisement.toTable` (all NumPy, or all lists)
+  into a single table."""
+  tables = list(tables)
+  if not tables:
+    return dict([(name, []) for name in TABLE_COLUMNS])
+  if isinstance(tables[0]["name"], list):
+    out = dict([(name, []) for name in TABLE_COLUMNS])
+    for table in tables:
+      for name in TABLE_COLUMNS:
+        out[name].extend(table[name])
+    return out
+
+  import numpy as np
+  return dict([(name, np.concatenate([t[name] for t in tables])) for name in TABLE_COLUMNS])
+
+def tableFromAdvertisements (ads, arrays = None):
+  """Build one table for many aggregates from a `{ name : advertisement }` mapping (as returned by
+  :py:func:`geni.util.getAdvertisements`; `None` values are skipped).  The `aggregate` column holds
+  the name each row came from."""
+  return concatTables([ad.toTable(label = name, arrays = arrays) for (name, ad) in ads.items() if ad is not None])
+
+
+class AvailabilityCounts(object):
+  """Node counts for one hardware type (or a whole aggregate).
+
+  Attributes:
+    total (int): Nodes advertised
+    available (int): Nodes currently available
+    raw_pc (int): Exclusive nodes supporting the `raw-pc` sliver type
+    raw_pc_available (int): Currently available `raw_pc` nodes
+  """
+
+  def __init__ (self):
+    self.total = 0
+    self.available = 0
+    self.raw_pc = 0
+    self.raw_pc_available = 0
+
+  def _add (self, available, raw_pc):
+    self.total += 1
+    if available:
+      self.available += 1
+    if raw_pc:
+      self.raw_pc += 1
+      if available:
+        self.raw_pc_available += 1
+
+  def __repr__ (self):
+    return "<AvailabilityCounts total=%d available=%d raw_pc=%d raw_pc_available=%d>" % (
+      self.total, self.available, self.raw_pc, self.raw_pc_available)
+
+
+class AvailabilitySummary(object):
+  """Availability facts for an advertisement, as returned by :py:func:`summarizeAvailability`.
+
+  Attributes:
+    nodes (AvailabilityCounts): Counts over all nodes
+    hardware_types (dict): Mapping of `{ type_name : AvailabilityCounts, ... }` (a node with several
+      hardware types is counted under each of them)
+    available_raw_pcs (list): Component IDs of the currently available raw PCs
+  """
+
+  def __init__ (self):
+    self.nodes = AvailabilityCounts()
+    self.hardware_types = {}
+    self.available_raw_pcs = []
+
+  def __repr__ (self):
+    return "<AvailabilitySummary nodes=%d available=%d raw_pc_available=%d hardware_types=%d>" % (
+      self.nodes.total, self.nodes.available, self.nodes.raw_pc_available, len(self.hardware_types))
+
+
+class AvailabilityScanner(object):
+  """Incremental parser (lxml `feed()`/`close()` interface) that only looks at the availability,
+  exclusivity, sliver type and hardware type of each node, discarding the XML as it goes.
+  `close()` returns an :py:class:`AvailabilitySummary`.  Usable as a streaming parser factory for
+  :py:meth:`geni.aggregate.apis.AMAPIv2.listresources`."""
+
+  _NODE = "{%s}node" % (GNS.REQUEST.name)
+  _AVAILABLE = "{%s}available" % (GNS.REQUEST.name)
+  _SLIVER_TYPE = "{%s}sliver_type" % (GNS.REQUEST.name)
+  _HARDWARE_TYPE = "{%s}hardware_type" % (GNS.REQUEST.name)
+
+  def __init__ (self, encoding = None):
+    self._parser = ET.XMLPullParser(events = ("end",), tag = self._NODE, encoding = encoding, huge_tree = True)
+    self.summary = AvailabilitySummary()
+
+  def feed (self, data):
+    self._parser.feed(data)
+    self._drain()
+
+  def close (self):
+    self._parser.close()
+    self._drain()
+    return self.summary
+
+  def _drain (self):
+    for (_, elem) in self._parser.read_events():
+      self._count(elem)
+      elem.clear()
+      parent = elem.getparent()
+      if parent is not None:
+        while elem.getprevious() is not None:
+          del parent[0]
+
+  def _count (self, elem):
+    available = False
+    raw_pc = False
+    hwtypes = []
+    for child in elem:
+      tag = child.tag
+      if tag == self._AVAILABLE:
+        available = child.get("now") == "true"
+      elif tag == self._SLIVER_TYPE:
+        if child.get("name") == "raw-pc":
+          raw_pc = True
+      elif tag == self._HARDWARE_TYPE:
+        hwtypes.append(child.get("name"))
+    raw_pc = raw_pc and elem.get("exclusive") != "false"
+
+    summary = self.summary
+    summary.nodes._add(available, raw_pc)
+    for hwtype in hwtypes:
+      counts = summary.hardware_types.get(hwtype)
+      if counts is None:
+        counts = summary.hardware_types[hwtype] = AvailabilityCounts()
+      counts._add(available, raw_pc)
+    if raw_pc and available:
+      summary.available_raw_pcs.append(elem.get("component_id"))
+
+
+def summarizeAvailability (path = None, xml = None):
+  """Count available nodes per hardware type in an advertisement document without building
+  :py:class:`AdNode` objects or the whole document tree.
+
+  Args:
+    path (str): Path to (or file object for) an advertisement document
+    xml (str, bytes): In-memory advertisement document
+
+  Returns:
+    AvailabilitySummary
+  """
+  if path:
+    source = open(path, "rb") if isinstance(path, six.string_types) else path
+    try:
+      scanner = AvailabilityScanner()
+      data = source.read(1024 * 1024)
+      while data:
+        scanner.feed(data)
+        data = source.read(1024 * 1024)
+      return scanner.close()
+    finally:
+      if source is not path:
+        source.close()
+
+  if isinstance(xml, six.text_type):
+    scanner = AvailabilityScanner("utf-8")
+    scanner.feed(xml.encode("utf-8"))
+  else:
+    scanner = AvailabilityScanner()
+    scanner.feed(xml)
+  return scanner.close()
+
+
+class ImageLocation(object):
+  """One place an image can be booted, as returned by :py:meth:`ImageCatalog.locate`.
+
+  Attributes:
+    aggregate (str): Aggregate name the advertisement was added under
+    sliver_type (str): Sliver type the image is offered for
+    hardware_type (str): Hardware type of the nodes (`None` for nodes without one)
+    nodes (int): Number of nodes of this hardware type offering the image
+    available (int): How many of those nodes were available when advertised
+  """
+
+  __slots__ = ("aggregate", "sliver_type", "hardware_type", "nodes", "available")
+
+  def __init__ (self, aggregate, sliver_type, hardware_type, nodes, available):
+    self.aggregate = aggregate
+    self.sliver_type = sliver_type
+    self.hardware_type = hardware_type
+    self.nodes = nodes
+    self.available = available
+
+  def __repr__ (self):
+    return "<ImageLocation: %s, %s, %s, nodes: %d, available: %d>" % (self.aggregate, self.sliver_type,
+                                                                       self.hardware_type, self.nodes, self.available)
+
+
+def _imageAliases (name):
+  # "urn:publicid:IDN+auth+image+project:NAME" -> "project:NAME", "NAME"
+  if "+image+" not in name:
+    return []
+  short = name.rsplit("+image+", 1)[1]
+  if ":" in short:
+    return [short, short.split(":", 1)[1]]
+  return [short]
+
+
+class ImageCatalog(object):
+  """Federation-wide index of the disk images offered by many advertisements.
+
+  Each image (keyed by its advertised name, normally the image URN) maps to the aggregates,
+  sliver types and hardware types that offer it, with node counts, so questions like "where
+  can I boot image X on hardware Y" don't need to rescan any advertisement.  Images can also
+  be looked up by short name (`project:NAME` or `NAME`).
+
+  Catalogs are built incrementally with :py:meth:`add` (re-adding an aggregate replaces its
+  entries) and can be merged with :py:meth:`update` or `|`.
+
+  Usage::
+
+    ads = geni.util.getAdvertisements(context, ams)
+    catalog = ImageCatalog.fromAdvertisements(ads)
+    catalog.locate("UBUNTU22-64-STD", hardware_type = "d430")
+  """
+
+  def __init__ (self):
+    self._sites = {}      # image name -> { aggregate : { (sliver_type, hardware_type) : [nodes, available] } }
+    self._images = {}     # image name -> Image
+    self._aliases = {}    # short name -> set(image name)
+    self._aggregates = {} # aggregate -> set(image name)
+
+  @classmethod
+  def fromAdvertisements (cls, ads):
+    """Build a catalog from a `{ name : advertisement }` mapping (as returned by
+    :py:func:`geni.util.getAdvertisements`; `None` values are skipped)."""
+    catalog = cls()
+    for (name, ad) in ads.items():
+      if ad is not None:
+        catalog.add(name, ad)
+    return catalog
+
+  def add (self, aggregate, ad):
+    """Index the images in advertisement `ad` under the name `aggregate`."""
+    self.remove(aggregate)
+    entries = {}
+    for node in ad.nodes:
+      hwtypes = list(node.hardware_types) or [None]
+      available = node.available
+      for (stype, images) in node.images.items():
+        for image in images:
+          if image.name not in self._images:
+            self._addImage(image)
+          counts = entries.setdefault(image.name, {})
+          for hwtype in hwtypes:
+            cnt = counts.get((stype, hwtype))
+            if cnt is None:
+              cnt = counts[(stype, hwtype)] = [0, 0]
+            cnt[0] += 1
+            if available:
+              cnt[1] += 1
+    self._store(aggregate, entries)
+
+  def _addImage (self, image):
+    self._images[image.name] = image
+    for alias in _imageAliases(image.name):
+      self._aliases.setdefault(alias, set()).add(image.name)
+
+  def _store (self, aggregate, entries):
+    for (name, counts) in entries.items():
+      self._sites.setdefault(name, {})[aggregate] = counts
+    self._aggregates[aggregate] = set(entries)
+
+  def remove (self, aggregate):
+    """Drop all entries for `aggregate`."""
+    for name in self._aggregates.pop(aggregate, ()):
+      sites = self._sites[name]
+      del sites[aggregate]
+      if not sites:
+        del self._sites[name]
+        del self._images[name]
+        for alias in _imageAliases(name):
+          names = self._aliases[alias]
+          names.discard(name)
+          if not names:
+            del self._aliases[alias]
+
+  def update (self, other):
+    """Merge the entries of catalog `other` into this one (aggregates present in both are
+    replaced by `other`'s entries)."""
+    if other is self:
+      return
+    for aggregate in other._aggregates:
+      self.remove(aggregate)
+    for (name, image) in other._images.items():
+      if name not in self._images:
+        self._addImage(image)
+    for (aggregate, names) in other._aggregates.items():
+      self._store(aggregate, dict([(name, other._sites[name][aggregate]) for name in names]))
+
+  def __or__ (self, other):
+    catalog = ImageCatalog()
+    catalog.update(self)
+    catalog.update(other)
+    return catalog
+
+  def _resolve (self, image):
+    if isinstance(image, Image):
+      image = image.name
+    if image in self._sites:
+      return [image]
+    return sorted(self._aliases.get(image, ()))
+
+  def __contains__ (self, image):
+    return bool(self._resolve(image))
+
+  def __iter__ (self):
+    return iter(self._images.values())
+
+  def __len__ (self):
+    return len(self._images)
+
+  @property
+  def aggregates (self):
+    """Names of the aggregates in this catalog."""
+    return set(self._aggregates)
+
+  def image (self, name):
+    """Returns the :py:class:`Image` for `name` (URN or short name), or `None`."""
+    names = self._resolve(name)
+    if names:
+      return self._images[names[0]]
+    return None
+
+  def imagesAt (self, aggregate):
+    """Returns the :py:class:`Image` objects offered at `aggregate`."""
+    return [self._images[name] for name in self._aggregates.get(aggregate, ())]
+
+  def locate (self, image, hardware_type = None, sliver_type = None, available = False):
+    """Where can `image` be booted?
+
+    Args:
+      image (str, Image): Image URN, short name or :py:class:`Image`
+      hardware_type (str): Only nodes of this hardware type
+      sliver_type (str): Only this sliver type
+      available (bool): Only locations with currently available nodes
+
+    Returns:
+      list: :py:class:`ImageLocation` objects, sorted by aggregate
+    """
+    out = []
+    for name in self._resolve(image):
+      for (aggregate, counts) in self._sites[name].items():
+        for ((stype, hwtype), (nodes, avail)) in counts.items():
+          if hardware_type is not None and hwtype != hardware_type:
+            continue
+          if sliver_type is not None and stype != sliver_type:
+            continue
+          if available and not avail:
+            continue
+          out.append(ImageLocation(aggregate, stype, hwtype, nodes, avail))
+    out.sort(key = lambda x: (x.aggregate, x.sliver_type, x.hardware_type or ""))
+    return out
+
+
 class RoutableAddresses(object):
   def __init__ (self):
     self.available = 0
@@ -247,25 +657,73 @@ class Advertisement(object):
 
   Only one argument can be supplied (if both are provided `path` will be used)
 
+  Advertisements can be pickled.  The pickled form carries fully parsed node, link and shared
+  VLAN objects (which are then served without touching XML), plus a compressed copy of the
+  document that is only re-parsed if XML-level access (`text`, `stitchinfo`, ...) is needed.
+
   Args:
     path (str, unicode): Path to XML file on disk containing an advertisement
-    xml (str, unicode): In-memory XML byte stream containing an advertisement
+    xml (str, unicode, lxml.etree._Element): In-memory XML byte stream, or parsed root element, containing an advertisement
   """
 
   def __init__ (self, path = None, xml = None):
+    self._rootelem = None
+    self._zxml = None
     if path:
-      self._root = ET.parse(open(path, "rb"))
+      self._rootelem = ET.parse(open(path, "rb"))
+    elif ET.iselement(xml):
+      self._rootelem = xml
     elif xml:
-      if six.PY3:
-        self._root = ET.fromstring(bytes(xml, "utf-8"))
+      if isinstance(xml, six.text_type):
+        self._rootelem = ET.fromstring(bytes(xml, "utf-8"))
       else:
-        self._root = ET.fromstring(xml)
+        self._rootelem = ET.fromstring(xml)
     self._routable_addresses = None
-    self._images = set()
+    self._images = None
+    self._nodes = None
+    self._links = None
+    self._shared_vlans = None
+    self._node_index = None
+    self._link_index = None
+
+  @property
+  def _root (self):
+    if self._rootelem is None and self._zxml is not None:
+      self._rootelem = ET.fromstring(zlib.decompress(self._zxml))
+    return self._rootelem
+
+  def __getstate__ (self):
+    state = self.__dict__.copy()
+    state["_nodes"] = list(self.nodes)
+    state["_links"] = list(self.links)
+    state["_shared_vlans"] = list(self.shared_vlans)
+    state["_routable_addresses"] = self.routable_addresses
+    state["_images"] = set(self.images)
+    if self._zxml is None:
+      state["_zxml"] = zlib.compress(ET.tostring(self._root), 1)
+    state["_rootelem"] = None
+    state["_node_index"] = None
+    state["_link_index"] = None
+    return state
+
+  def __setstate__ (self, state):
+    self.__dict__.update(state)
+
+  def detach (self):
+    """Build all node, link and shared VLAN objects, detach them from the XML tree and drop the
+    tree, so that only the wrapper objects (and a compressed copy of the document, re-parsed on
+    demand by :py:attr:`text` and :py:attr:`stitchinfo`) are kept in memory.  Returns `self`."""
+    state = self.__getstate__()
+    for obj in state["_nodes"]:
+      obj.detach()
+    for obj in state["_links"]:
+      obj.detach()
+    self.__setstate__(state)
+    return self
 
   def _parse_routable (self):
     try:
-      elem = self._root.xpath('/g:rspec/e:rspec_routable_addresses', namespaces=_XPNS)[0]
+      elem = _XP(self._root, '/g:rspec/e:rspec_routable_addresses')[0]
       ra = RoutableAddresses()
       ra.available = int(elem.get("available"))
       ra.configured = int(elem.get("configured"))
@@ -282,35 +740,179 @@ class Advertisement(object):
 
   @property
   def nodes (self):
-    """An indexable iterator over the AdNode objects in this advertisement."""
-    return XPathXRange(self._root.findall("{%s}node" % (GNS.REQUEST.name)), AdNode)
+    """An indexable iterator over the AdNode objects in this advertisement.  Each node is parsed on
+    first access and the same object is returned thereafter."""
+    if self._nodes is None:
+      self._nodes = CachedXPathXRange(self._root.findall("{%s}node" % (GNS.REQUEST.name)), AdNode)
+    return self._nodes
 
   @property
   def links (self):
-    """An indexable iterator over the AdLink objects in this advertisement."""
-    return XPathXRange(self._root.findall("{%s}link" % (GNS.REQUEST.name)), AdLink)
+    """An indexable iterator over the AdLink objects in this advertisement.  Each link is parsed on
+    first access and the same object is returned thereafter."""
+    if self._links is None:
+      self._links = CachedXPathXRange(self._root.findall("{%s}link" % (GNS.REQUEST.name)), AdLink)
+    return self._links
 
   @property
   def shared_vlans (self):
     """An indexable iterator of the shared vlan names found in this advertisement."""
-    return XPathXRange(self._root.xpath('/g:rspec/s:rspec_shared_vlan/s:available', namespaces=_XPNS), AdSharedVLAN)
+    if self._shared_vlans is not None:
+      return self._shared_vlans
+    return XPathXRange(_XP(self._root, '/g:rspec/s:rspec_shared_vlan/s:available'), AdSharedVLAN)
+
+  @staticmethod
+  def _iterparse (path, xml, tag, klass):
+    if path:
+      source = path
+    elif isinstance(xml, six.text_type):
+      source = io.BytesIO(xml.encode("utf-8"))
+    else:
+      source = io.BytesIO(xml)
+
+    for (_, elem) in ET.iterparse(source, events = ("end",), tag = tag, huge_tree = True):
+      obj = klass._fromdom(elem)
+      obj.detach()
+      yield obj
+      # Drop this element and everything before it, so memory use stays bounded
+      elem.clear()
+      parent = elem.getparent()
+      if parent is not None:
+        while elem.getprevious() is not None:
+          del parent[0]
+
+  @staticmethod
+  def iternodes (path = None, xml = None):
+    """Scan an advertisement without building the whole document tree, yielding an :py:class:`AdNode`
+    for each node as it is parsed.  Processed XML is discarded, so memory use does not grow with
+    the size of the advertisement.  The yielded nodes are detached from the XML (`_elem` is `None`).
+
+    Args:
+      path (str): Path to (or file object for) an advertisement document
+      xml (str, bytes): In-memory advertisement document
+    """
+    return Advertisement._iterparse(path, xml, "{%s}node" % (GNS.REQUEST.name), AdNode)
+
+  @staticmethod
+  def iterlinks (path = None, xml = None):
+    """As :py:meth:`iternodes`, yielding an :py:class:`AdLink` for each link."""
+    return Advertisement._iterparse(path, xml, "{%s}link" % (GNS.REQUEST.name), AdLink)
+
+  def _buildNodeIndex (self):
+    by_id = {}
+    by_name = {}
+    by_hw = {}
+    by_stype = {}
+    for node in self.nodes:
+      by_id[node.component_id] = node
+      by_name[node.name] = node
+      for hwtype in node.hardware_types:
+        by_hw.setdefault(hwtype, []).append(node)
+      for stype in node.sliver_types:
+        by_stype.setdefault(stype, []).append(node)
+    self._node_index = (by_id, by_name, by_hw, by_stype)
+    return self._node_index
+
+  def _nodeIndex (self, which):
+    index = self._node_index
+    if index is None:
+      index = self._buildNodeIndex()
+    return index[which]
+
+  def nodeByID (self, component_id):
+    """Returns the :py:class:`AdNode` with the given component ID URN, or `None`."""
+    return self._nodeIndex(0).get(str(component_id))
+
+  def nodeByName (self, name):
+    """Returns the :py:class:`AdNode` with the given component name, or `None`."""
+    return self._nodeIndex(1).get(name)
+
+  def nodesWithHardware (self, hwtype):
+    """Returns a list of the :py:class:`AdNode` objects that advertise hardware type `hwtype`."""
+    return list(self._nodeIndex(2).get(hwtype, []))
+
+  def nodesWithSliverType (self, stype):
+    """Returns a list of the :py:class:`AdNode` objects that support sliver type `stype`."""
+    return list(self._nodeIndex(3).get(stype, []))
+
+  @property
+  def hardware_types (self):
+    """A set of all the hardware type names advertised by nodes in this advertisement."""
+    return set(self._nodeIndex(2))
+
+  def linkByID (self, component_id):
+    """Returns the :py:class:`AdLink` with the given component ID URN, or `None`."""
+    if self._link_index is None:
+      self._link_index = dict([(link.component_id, link) for link in self.links])
+    return self._link_index.get(str(component_id))
 
   @property
   def images (self):
     """An iterable of the unique images found in this advertisement."""
-    if not self._images:
+    if self._images is None:
+      images = set()
       for node in self.nodes:
         for image_list in node.images.values():
-          for image in image_list:
-            self._images.add(image)
+          images.update(image_list)
+      self._images = images
     for image in self._images:
       yield image
 
+  def toTable (self, label = None, arrays = None):
+    """Returns the nodes in this advertisement as a columnar table, for vectorized queries.
+
+    The table is a dict mapping column name to a column with one entry per node:
+
+    ==================  ==========================================================
+    `aggregate`         `label` (for identifying rows after :py:func:`concatTables`)
+    `component_id`      Component ID URN
+    `name`              Component name
+    `available`         bool
+    `exclusive`         bool
+    `shared`            bool
+    `raw_pc`            bool, node supports the `raw-pc` sliver type
+    `ram`, `cpu`        Available RAM (MB) and CPU speed (Mhz)
+    `latitude`,         Location
+    `longitude`
+    `hardware_types`    Tuple of hardware type names
+    `sliver_types`      Tuple of sliver type names
+    ==================  ==========================================================
+
+    Args:
+      label (str): Value for the `aggregate` column
+      arrays (bool): Return NumPy arrays (missing numeric values are `nan`).  If `None`, NumPy
+        is used when it can be imported; if `False` the columns are plain lists (missing values
+        are `None`).
+
+    Returns:
+      dict: Mapping of column name to column
+    """
+    cols = dict([(name, []) for name in TABLE_COLUMNS])
+    for node in self.nodes:
+      cols["aggregate"].append(label)
+      cols["component_id"].append(node.component_id)
+      cols["name"].append(node.name)
+      cols["available"].append(node.available)
+      cols["exclusive"].append(node.exclusive)
+      cols["shared"].append(node.shared)
+      cols["raw_pc"].append("raw-pc" in node.sliver_types)
+      cols["ram"].append(node.ram)
+      cols["cpu"].append(node.cpu)
+      if node.location is not None:
+        cols["latitude"].append(node.location.latitude)
+        cols["longitude"].append(node.location.longitude)
+      else:
+        cols["latitude"].append(None)
+        cols["longitude"].append(None)
+      cols["hardware_types"].append(tuple(node.hardware_types))
+      cols["sliver_types"].append(tuple(node.sliver_types))
+    return _tableColumns(cols, arrays)
+
   @property
   def stitchinfo (self):
     """Reference to the stitching info in the manifest, if present."""
     try:
-      elem = self._root.xpath('/g:rspec/t:stitching', namespaces=_XPNS)[0]
+      elem = _XP(self._root, '/g:rspec/t:stitching')[0]
       return stitching.AdInfo(elem)
     except IndexError:
       return None
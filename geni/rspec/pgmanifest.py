@@ -6,7 +6,7 @@
 
 from __future__ import absolute_import
 
-import os
+import zlib
 
 from lxml import etree as ET
 import six
@@ -14,10 +14,12 @@ import six
 from .pg import Link
 from .. import namespaces as GNS
 from .pg import Namespaces as PGNS
-from ..model.util import XPathXRange
+from ..model.util import CachedXPathXRange, SlottedObject, internstr
+from ._xpath import XPathSet
 
 _XPNS = {'g' : GNS.REQUEST.name, 's' : GNS.SVLAN.name, 'e' : PGNS.EMULAB.name,
          'i' : PGNS.INFO.name, 'p' : PGNS.PARAMS.name, 'u' : GNS.USER.name}
+_XP = XPathSet(_XPNS)
 
 class ManifestLink(Link):
   def __init__ (self):
@@ -35,11 +37,11 @@ class ManifestLink(Link):
     lnk.sliver_id = elem.get("sliver_id")
     lnk.vlan = elem.get("vlantag", None)
 
-    refs = elem.xpath('g:interface_ref', namespaces = _XPNS)
+    refs = _XP(elem, 'g:interface_ref')
     for ref in refs:
       lnk.interface_refs.append(ref.get("sliver_id"))
 
-    svlans = elem.xpath('s:link_shared_vlan', namespaces = _XPNS)
+    svlans = _XP(elem, 's:link_shared_vlan')
     if svlans:
       # TODO: Can a link be attached to more than one shared vlan?
       # Don't believe PG supports trunks, but the rspec doesn't really forbid it
@@ -47,12 +49,30 @@ class ManifestLink(Link):
 
     return lnk
 
+  def detach (self):
+    """Drop the reference to the source XML element.  Returns `self`."""
+    self._elem = None
+    return self
+
+  # Only the manifest fields are pickled; the request-side Link attributes are restored to defaults
+  _STATE = ("client_id", "sliver_id", "vlan", "interface_refs")
+
+  def __getstate__ (self):
+    return tuple([getattr(self, name) for name in ManifestLink._STATE])
+
+  def __setstate__ (self, state):
+    self.__init__()
+    for (name, val) in zip(ManifestLink._STATE, state):
+      setattr(self, name, val)
+
   @property
   def text (self):
     return ET.tostring(self._root, pretty_print=True, encoding="unicode")
 
 
-class ManifestSvcLogin(object):
+class ManifestSvcLogin(SlottedObject):
+  __slots__ = ("auth", "hostname", "port", "username")
+
   def __init__ (self):
     self.auth = None
     self.hostname = None
@@ -62,7 +82,7 @@ class ManifestSvcLogin(object):
   @classmethod
   def _fromdom (cls, elem):
     n = ManifestSvcLogin()
-    n.auth = elem.get("authentication")
+    n.auth = internstr(elem.get("authentication"))
     n.hostname = elem.get("hostname")
     n.port = int(elem.get("port"))
     n.username = elem.get("username")
@@ -70,7 +90,9 @@ class ManifestSvcLogin(object):
     return n
 
 
-class ManifestSvcUser(object):
+class ManifestSvcUser(SlottedObject):
+  __slots__ = ("login", "public_key")
+
   def __init__ (self):
     self.login = None
     self.public_key = None
@@ -79,14 +101,16 @@ class ManifestSvcUser(object):
   def _fromdom (cls, elem):
     n = cls()
     n.login = elem.get("login")
-    pkelems = elem.xpath('u:public_key', namespaces = _XPNS)
+    pkelems = _XP(elem, 'u:public_key')
     if pkelems:
       n.public_key = pkelems[0].text.strip()
     return n
 
 
-class ManifestNode(object):
-  class Interface(object):
+class ManifestNode(SlottedObject):
+  class Interface(SlottedObject):
+    __slots__ = ("client_id", "mac_address", "sliver_id", "address_info", "component_id")
+
     def __init__ (self):
       self.client_id = None
       self.mac_address = None
@@ -94,6 +118,9 @@ class ManifestNode(object):
       self.address_info = None
       self.component_id = None
 
+  __slots__ = ("logins", "users", "interfaces", "client_id", "component_id", "sliver_id", "_elem",
+               "_hostfqdn", "_hostipv4")
+
   def __init__ (self):
     super(ManifestNode, self).__init__()
     self.logins = []
@@ -123,7 +150,9 @@ class ManifestNode(object):
     return self._hostipv4
 
   def _populateHostInfo (self):
-    host = self._elem.xpath('g:host', namespaces = _XPNS)
+    if self._elem is None:
+      return
+    host = _XP(self._elem, 'g:host')
     if host:
       self._hostfqdn = host[0].get("name", None)
       self._hostipv4 = host[0].get("ipv4", None)
@@ -136,17 +165,17 @@ class ManifestNode(object):
     n.component_id = elem.get("component_id")
     n.sliver_id = elem.get("sliver_id")
 
-    logins = elem.xpath('g:services/g:login', namespaces = _XPNS)
+    logins = _XP(elem, 'g:services/g:login')
     for lelem in logins:
       l = ManifestSvcLogin._fromdom(lelem)
       n.logins.append(l)
 
-    users = elem.xpath('g:services/u:services_user', namespaces = _XPNS)
+    users = _XP(elem, 'g:services/u:services_user')
     for uelem in users:
       u = ManifestSvcUser._fromdom(uelem)
       n.users.append(u)
 
-    interfaces = elem.xpath('g:interface', namespaces = _XPNS)
+    interfaces = _XP(elem, 'g:interface')
     for ielem in interfaces:
       i = ManifestNode.Interface()
       i.client_id = ielem.get("client_id")
@@ -154,7 +183,7 @@ class ManifestNode(object):
       i.component_id = ielem.get("component_id")
       i.mac_address = ielem.get("mac_address")
       try:
-        ipelem = ielem.xpath('g:ip', namespaces = _XPNS)[0]
+        ipelem = _XP(ielem, 'g:ip')[0]
         i.address_info = (ipelem.get("address"), ipelem.get("netmask"))
       except Exception:
         pass
@@ -162,6 +191,18 @@ class ManifestNode(object):
 
     return n
 
+  def __getstate__ (self):
+    if self._elem is not None and not self._hostfqdn:
+      self._populateHostInfo()
+    return super(ManifestNode, self).__getstate__()
+
+  def detach (self):
+    """Read the host information and drop the reference to the source XML element.  Returns `self`."""
+    if self._elem is not None and not self._hostfqdn:
+      self._populateHostInfo()
+    self._elem = None
+    return self
+
   @property
   def text (self):
     return ET.tostring(self._root, pretty_print=True, encoding="unicode")
@@ -180,33 +221,74 @@ class ManifestParameter(object):
 
 
 class Manifest(object):
+  """Wrapper object for a GENIv3 XML manifest.
+
+  Manifests can be pickled (and so returned from process pool workers): the pickled form
+  holds the already-parsed node, link and login records and a compressed copy of the document,
+  which is only re-parsed if the XML tree itself is needed again."""
+
   def __init__ (self, path = None, xml = None):
+    self._rootelem = None
+    self._zxml = None
     if path:
-      self._xml = open(path, "r").read()
+      with open(path, "rb") as f:
+        self._rootelem = ET.fromstring(f.read())
     elif xml:
-      if six.PY3:
-        self._xml = bytes(xml, "utf-8")
-      else:
-        self._xml = xml
-    self._root = ET.fromstring(self._xml)
-    self._pid = os.getpid()
+      if isinstance(xml, six.text_type):
+        xml = bytes(xml, "utf-8")
+      self._rootelem = ET.fromstring(xml)
+    self._resetIndexes()
+
+  def _resetIndexes (self):
+    self._nodes = None
+    self._links = None
+    self._node_index = None
+    self._link_index = None
+
+  @property
+  def _root (self):
+    if self._rootelem is None and self._zxml is not None:
+      self._rootelem = ET.fromstring(zlib.decompress(self._zxml))
+    return self._rootelem
 
   @property
   def root (self):
-    if os.getpid() != self._pid:
-      self._root = ET.fromstring(self._xml)
-      self._pid = os.getpid()
     return self._root
 
+  def __getstate__ (self):
+    state = self.__dict__.copy()
+    state["_nodes"] = list(self.nodes)
+    state["_links"] = list(self.links)
+    if self._zxml is None:
+      state["_zxml"] = zlib.compress(ET.tostring(self._root), 1)
+    state["_rootelem"] = None
+    state["_node_index"] = None
+    state["_link_index"] = None
+    return state
+
+  def __setstate__ (self, state):
+    self.__dict__.update(state)
+
+  def detach (self):
+    """Build all node and link objects, detach them from the XML tree and drop the tree, keeping
+    a compressed copy of the document that is re-parsed on demand.  Returns `self`."""
+    state = self.__getstate__()
+    for obj in state["_nodes"]:
+      obj.detach()
+    for obj in state["_links"]:
+      obj.detach()
+    self.__setstate__(state)
+    return self
+
   @property
   def latitude (self):
-    loc = self._root.xpath('i:site_info/i:location', namespaces = _XPNS)
+    loc = _XP(self._root, 'i:site_info/i:location')
     if loc:
       return loc[0].get("latitude")
 
   @property
   def longitude (self):
-    loc = self._root.xpath('i:site_info/i:location', namespaces = _XPNS)
+    loc = _XP(self._root, 'i:site_info/i:location')
     if loc:
       return loc[0].get("longitude")
 
@@ -216,11 +298,89 @@ class Manifest(object):
 
   @property
   def links (self):
-    return XPathXRange(self.root.findall("{%s}link" % (GNS.REQUEST)), ManifestLink)
+    """An indexable iterator over the :py:class:`ManifestLink` objects in this manifest.  Each link
+    is parsed on first access and the same object is returned thereafter."""
+    if self._links is None:
+      self._links = CachedXPathXRange(self._root.findall("{%s}link" % (GNS.REQUEST)), ManifestLink)
+    return self._links
 
   @property
   def nodes (self):
-    return XPathXRange(self.root.findall("{%s}node" % (GNS.REQUEST)), ManifestNode)
+    """An indexable iterator over the :py:class:`ManifestNode` objects in this manifest.  Each node
+    is parsed on first access and the same object is returned thereafter."""
+    if self._nodes is None:
+      self._nodes = CachedXPathXRange(self._root.findall("{%s}node" % (GNS.REQUEST)), ManifestNode)
+    return self._nodes
+
+  def _buildNodeIndex (self):
+    by_cid = {}
+    by_sid = {}
+    by_intf = {}
+    logins = []
+    for node in self.nodes:
+      by_cid[node.client_id] = node
+      by_sid[node.sliver_id] = node
+      for intf in node.interfaces:
+        by_intf[intf.sliver_id] = (node, intf)
+      logins.extend([(node.client_id, x.username, x.hostname, x.port) for x in node.logins])
+    self._node_index = (by_cid, by_sid, by_intf, logins)
+    return self._node_index
+
+  def _nodeIndex (self, which):
+    index = self._node_index
+    if index is None:
+      index = self._buildNodeIndex()
+    return index[which]
+
+  def _linkIndex (self, which):
+    if self._link_index is None:
+      self._link_index = (dict([(link.client_id, link) for link in self.links]),
+                          dict([(link.sliver_id, link) for link in self.links]))
+    return self._link_index[which]
+
+  def nodeByClientID (self, client_id):
+    """Returns the :py:class:`ManifestNode` with the given client ID, or `None`."""
+    return self._nodeIndex(0).get(client_id)
+
+  def nodeBySliverID (self, sliver_id):
+    """Returns the :py:class:`ManifestNode` with the given sliver ID URN, or `None`."""
+    return self._nodeIndex(1).get(str(sliver_id))
+
+  def interfaceBySliverID (self, sliver_id):
+    """Returns a `(ManifestNode, ManifestNode.Interface)` tuple for the interface with the given
+    sliver ID URN, or `None`."""
+    return self._nodeIndex(2).get(str(sliver_id))
+
+  def linkByClientID (self, client_id):
+    """Returns the :py:class:`ManifestLink` with the given client ID, or `None`."""
+    return self._linkIndex(0).get(client_id)
+
+  def linkBySliverID (self, sliver_id):
+    """Returns the :py:class:`ManifestLink` with the given sliver ID URN, or `None`."""
+    return self._linkIndex(1).get(str(sliver_id))
+
+  def linkEndpoints (self, link):
+    """Returns a list of `(ManifestNode, ManifestNode.Interface)` tuples for the interfaces
+    attached to `link` (a :py:class:`ManifestLink` or link client ID).  Interfaces that are not
+    in this manifest are skipped."""
+    if not isinstance(link, ManifestLink):
+      link = self.linkByClientID(link)
+      if link is None:
+        return []
+    by_intf = self._nodeIndex(2)
+    return [by_intf[ref] for ref in link.interface_refs if ref in by_intf]
+
+  @property
+  def logins (self):
+    """A list of `(client_id, username, hostname, port)` tuples for every login service in this manifest."""
+    return list(self._nodeIndex(3))
+
+  def loginsFor (self, client_id):
+    """Returns the :py:class:`ManifestSvcLogin` objects for the node with the given client ID."""
+    node = self.nodeByClientID(client_id)
+    if node is None:
+      return []
+    return list(node.logins)
 
   @property
   def parameters (self):
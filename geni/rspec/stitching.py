@@ -13,10 +13,12 @@ from lxml import etree as ET
 from . import pg
 from .. import namespaces
 from ..model.util import XPathXRange
+from ._xpath import XPathSet
 
 STITCHNS = namespaces.Namespace("stitch", "http://hpn.east.isi.edu/rspec/ext/stitch/0.1/")
 
 _XPNS = {'t' : STITCHNS.name}
+_XP = XPathSet(_XPNS)
 
 class StitchInfo(pg.Resource):
   def __init__ (self):
@@ -137,7 +139,7 @@ class AdInfo(object):
   @property
   def aggregates (self):
     if not self._aggregates:
-      for elem in self._root.xpath('t:aggregate', namespaces=_XPNS):
+      for elem in _XP(self._root, 't:aggregate'):
         info = AggInfo(elem)
         self._aggregates[info.urn] = info
     return self._aggregates
@@ -151,21 +153,21 @@ class AggInfo(object):
 
   @property
   def mode (self):
-    return self._root.xpath("t:stitchingmode", namespaces=_XPNS)[0].text
+    return _XP(self._root, "t:stitchingmode")[0].text
 
   @property
   def scheduledservices (self):
-    t = self._root.xpath("t:scheduledservices", namespaces=_XPNS)[0].text
+    t = _XP(self._root, "t:scheduledservices")[0].text
     return coerceBool(t)
 
   @property
   def negotiatedservices (self):
-    t = self._root.xpath("t:negotiatedservices", namespaces=_XPNS)[0].text
+    t = _XP(self._root, "t:negotiatedservices")[0].text
     return coerceBool(t)
 
   @property
   def nodes (self):
-    n = self._root.xpath("t:node", namespaces=_XPNS)
+    n = _XP(self._root, "t:node")
     return XPathXRange(n, AggNode)
 
 
@@ -176,7 +178,7 @@ class AggNode(object):
 
   @property
   def ports (self):
-    p = self._root.xpath("t:port", namespaces=_XPNS)
+    p = _XP(self._root, "t:port")
     return XPathXRange(p, AggPort)
 
   @classmethod
@@ -195,7 +197,7 @@ class AggPort(object):
 
   @property
   def links (self):
-    l = self._root.xpath("t:link", namespaces=_XPNS)
+    l = _XP(self._root, "t:link")
     return XPathXRange(l, AggLink)
 
   @classmethod
@@ -203,7 +205,7 @@ class AggPort(object):
     port = AggPort()
     port._root = elem
     port.id = elem.get("id")
-    port.capacity = int((elem.xpath("t:capacity", namespaces=_XPNS)[0].text).strip("kbps"))
+    port.capacity = int((_XP(elem, "t:capacity")[0].text).strip("kbps"))
     return port
 
 
@@ -227,5 +229,5 @@ class AggLink(object):
     link = AggLink()
     link._root = elem
     link.id = elem.get("id")
-    link.remote_urn = elem.xpath("t:remoteLinkId", namespaces=_XPNS)[0].text
+    link.remote_urn = _XP(elem, "t:remoteLinkId")[0].text
     return link
@@ -0,0 +1,257 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Compiled request templates: serialize a request once with placeholder slots, then render
+it for many parameter values by splicing the values into the cached XML.
+
+Usage::
+
+  def build (params):
+    req = pg.Request()
+    nodes = req.addNodes(params.count, hardware_type = params.hwtype, disk_image = params.image)
+    for lnk in req.connectLinear(nodes):
+      lnk.bandwidth = params.bw
+    return req
+
+  tmpl = RequestTemplate(build, slots = [Slot("hwtype"), Slot("image"), Slot("bw", int)],
+                         structural = ["count"])
+  rspec = tmpl.render(count = 10, hwtype = "d430", image = IMAGE_URN, bw = 1000000)
+  am.createsliver(context, "myslice", rspec)
+"""
+
+from __future__ import absolute_import
+
+import collections
+import os
+import re
+import threading
+from argparse import Namespace
+
+import six
+
+_NONCE = os.urandom(4).hex()
+_MARKER = "@@geni-slot:%s:%%s@@" % (_NONCE)
+_MARKER_RE = re.compile(("@@geni-slot:%s:([A-Za-z_][A-Za-z0-9_.-]*)@@" % (_NONCE)).encode("ascii"))
+_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_.-]*$")
+
+_UNSET = object()
+
+class InvalidSlotNameError(Exception):
+  def __init__ (self, name):
+    super(InvalidSlotNameError, self).__init__()
+    self.name = name
+  def __str__ (self):
+    return "Invalid slot name (%s): must be a letter or underscore followed by letters, digits, '_', '.' or '-'" % (self.name)
+
+class MissingSlotValueError(Exception):
+  def __init__ (self, name):
+    super(MissingSlotValueError, self).__init__()
+    self.name = name
+  def __str__ (self):
+    return "No value given for slot (%s), and it has no default" % (self.name)
+
+class UnknownSlotError(Exception):
+  def __init__ (self, name):
+    super(UnknownSlotError, self).__init__()
+    self.name = name
+  def __str__ (self):
+    return "Value given for unknown slot (%s)" % (self.name)
+
+
+class Slot(str):
+  """Placeholder for a template parameter.
+
+  A `Slot` is a string (holding a unique marker) that can be assigned anywhere the request
+  takes a string or number that is written out as-is (`hardware_type`, `disk_image`,
+  `Link.bandwidth`, etc.), or concatenated into a longer string.  It must not be compared,
+  converted or used in arithmetic: anything that changes the shape of the request must be
+  a structural parameter of the :py:class:`RequestTemplate` instead.
+
+  Args:
+    name (str): Parameter name
+    typ (callable): Converts values for this slot (e.g. `str`, `int`, `float`, `bool`), or
+      a :py:class:`geni.portal.ParameterType` constant
+    default: Value used when none is given at render time
+  """
+
+  def __new__ (cls, name, typ = str, default = _UNSET):
+    if not _NAME_RE.match(name):
+      raise InvalidSlotNameError(name)
+    obj = super(Slot, cls).__new__(cls, _MARKER % (name))
+    obj.name = name
+    obj.type = typ
+    obj.default = default
+    return obj
+
+  def __reduce__ (self):
+    # Rebuild through __new__ only, so an unset default stays the _UNSET sentinel
+    if self.default is _UNSET:
+      return (type(self), (self.name, self.type))
+    return (type(self), (self.name, self.type, self.default))
+
+  def render (self, value):
+    """Returns `value` converted for this slot, as escaped UTF-8 for an XML attribute or text node."""
+    typ = self.type
+    if isinstance(typ, six.string_types):
+      from ..portal import ParameterType
+      typ = ParameterType.argparsemap[typ]
+    if typ is bool:
+      if isinstance(value, six.string_types):
+        value = value.lower() == "true"
+      text = "true" if value else "false"
+    else:
+      text = str(typ(value) if typ is not None else value)
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return text.encode("utf-8")
+
+  def __repr__ (self):
+    return "Slot(%r)" % (self.name)
+
+
+class CompiledRequest(object):
+  """A request serialized once, with the positions of its :py:class:`Slot` markers recorded.
+
+  Rendering replaces only the fragments whose slot value changed since the previous render
+  and joins them with the serialized bytes of everything else.
+
+  Args:
+    request: Request object (e.g. :py:class:`geni.rspec.pg.Request`) containing slots
+    slots (list): The :py:class:`Slot` objects that may appear in the request
+    pretty_print (bool): Indent the serialized request
+  """
+
+  def __init__ (self, request, slots, pretty_print = False):
+    self.slots = dict([(slot.name, slot) for slot in slots])
+    data = request.toXMLString(pretty_print)
+    if not isinstance(data, bytes):
+      data = data.encode("utf-8")
+
+    pieces = _MARKER_RE.split(data)
+    self._parts = pieces[:]
+    self._positions = {}
+    for idx in range(1, len(pieces), 2):
+      name = pieces[idx].decode("ascii")
+      if name not in self.slots:
+        raise UnknownSlotError(name)
+      self._parts[idx] = None
+      self._positions.setdefault(name, []).append(idx)
+    self._current = {}
+    self._lock = threading.Lock()
+
+  @property
+  def used (self):
+    """Names of the slots that appear in the serialized request."""
+    return set(self._positions)
+
+  def render (self, values):
+    """Returns the serialized request (UTF-8 bytes) with `values` (dict) substituted for its slots."""
+    for name in values:
+      if name not in self.slots:
+        raise UnknownSlotError(name)
+
+    with self._lock:
+      for (name, positions) in self._positions.items():
+        slot = self.slots[name]
+        value = values.get(name, slot.default)
+        if value is _UNSET:
+          raise MissingSlotValueError(name)
+        text = slot.render(value)
+        if self._current.get(name) != text:
+          for idx in positions:
+            self._parts[idx] = text
+          self._current[name] = text
+      return b"".join(self._parts)
+
+
+class RenderedRequest(object):
+  """Output of :py:meth:`RequestTemplate.render`, usable where a request object is expected
+  (e.g. :py:meth:`geni.aggregate.core.AM.createsliver`)."""
+
+  def __init__ (self, data):
+    self.data = data
+
+  def toXMLString (self, pretty_print = False, ucode = False): # pylint: disable=unused-argument
+    """Returns the rendered request (indented only if the template was compiled with `pretty_print`)."""
+    if ucode:
+      return self.data.decode("utf-8")
+    return self.data
+
+  def writeXML (self, path):
+    with open(path, "wb") as f:
+      f.write(self.data)
+
+
+class RequestTemplate(object):
+  """Reusable request template built by a user function.
+
+  `build(params)` is called with an `argparse.Namespace` holding the real values of the
+  structural parameters and the :py:class:`Slot` objects for everything else, and must
+  return a request.  The compiled result is cached per distinct set of structural values,
+  so rendering a new parameter set only rebuilds the request when one of those changes.
+
+  Args:
+    build (callable): Request builder
+    slots (list): :py:class:`Slot` objects for the value parameters
+    structural (list): Names of parameters that change the structure of the request
+      (e.g. node count) and are passed to `build` as-is
+    pretty_print (bool): Indent the rendered requests
+    cache_size (int): Compiled requests kept (least recently used are dropped first)
+  """
+
+  def __init__ (self, build, slots = (), structural = (), pretty_print = False, cache_size = 32):
+    self._build = build
+    self.slots = list(slots)
+    self.structural = list(structural)
+    self.pretty_print = pretty_print
+    self.cache_size = cache_size
+    self._compiled = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def compile (self, **structural):
+    """Returns the :py:class:`CompiledRequest` for the given structural parameter values."""
+    for name in structural:
+      if name not in self.structural:
+        raise UnknownSlotError(name)
+    key = tuple([structural.get(name) for name in self.structural])
+
+    with self._lock:
+      compiled = self._compiled.get(key)
+      if compiled is not None:
+        self._compiled.move_to_end(key)
+        return compiled
+
+    params = Namespace()
+    for slot in self.slots:
+      setattr(params, slot.name, slot)
+    for name in self.structural:
+      setattr(params, name, structural.get(name))
+    compiled = CompiledRequest(self._build(params), self.slots, self.pretty_print)
+
+    with self._lock:
+      self._compiled[key] = compiled
+      while len(self._compiled) > self.cache_size:
+        self._compiled.popitem(last = False)
+    return compiled
+
+  def render (self, **values):
+    """Render the request for `values` (structural and slot parameters, by name).
+
+    Returns:
+      RenderedRequest: The rendered request
+    """
+    structural = {}
+    slotvals = {}
+    for (name, value) in values.items():
+      if name in self.structural:
+        structural[name] = value
+      else:
+        slotvals[name] = value
+    return RenderedRequest(self.compile(**structural).render(slotvals))
+
+  def clear (self):
+    """Drop all compiled requests."""
+    with self._lock:
+      self._compiled.clear()
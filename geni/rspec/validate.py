@@ -0,0 +1,314 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Offline XSD validation of requests and manifests.
+
+Schemas are read from local mirrors of the published GENI schema locations, laid out by
+host and path (for example `<dir>/www.geni.net/resources/rspec/3/request.xsd`), and are
+never fetched at validation time.  geni-lib bundles the GENIv3 request, manifest and
+advertisement schemas (and the shared VLAN extension), so validation works out of the box;
+:py:func:`fetchSchemas` mirrors the published copies (and extension schemas), which take
+precedence over the bundled ones.
+"""
+
+from __future__ import absolute_import
+
+import os
+import os.path
+import threading
+
+from lxml import etree as ET
+import six
+from six.moves.urllib.parse import urljoin, urlparse
+
+import geni.namespaces as GNS
+
+SCHEMA_PATH = [os.path.expanduser("~/.bssw/geni/schemas")]
+"""Directories searched (in order) for schema mirrors.  Directories listed in the
+`GENILIB_SCHEMA_PATH` environment variable are searched first, and the schemas bundled with
+geni-lib last."""
+
+BUNDLED_SCHEMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemas")
+
+RSPEC_LOCATIONS = {
+  "request" : "http://www.geni.net/resources/rspec/3/request.xsd",
+  "manifest" : "http://www.geni.net/resources/rspec/3/manifest.xsd",
+  "advertisement" : "http://www.geni.net/resources/rspec/3/ad.xsd",
+}
+"""GENIv3 schema used for a document, by rspec `type`, when its `xsi:schemaLocation` does
+not name one."""
+
+_XSD = "http://www.w3.org/2001/XMLSchema"
+_SCHEMA_LOCATION = "{%s}schemaLocation" % (GNS.XSNS.name)
+
+class SchemaNotFoundError(Exception):
+  def __init__ (self, namespace, location):
+    super(SchemaNotFoundError, self).__init__()
+    self.namespace = namespace
+    self.location = location
+  def __str__ (self):
+    return "No local copy of schema (%s) for namespace (%s) - see geni.rspec.validate.fetchSchemas()" % (
+      self.location, self.namespace)
+
+class RSpecValidationError(Exception):
+  def __init__ (self, errors):
+    super(RSpecValidationError, self).__init__()
+    self.errors = errors
+  def __str__ (self):
+    msg = "RSpec failed schema validation:\n  %s" % ("\n  ".join(self.errors[:10]))
+    if len(self.errors) > 10:
+      msg += "\n  ... (%d more)" % (len(self.errors) - 10)
+    return msg
+
+
+def schemaDirs ():
+  """Returns the schema mirror directories that will be searched, in order."""
+  dirs = [x for x in os.environ.get("GENILIB_SCHEMA_PATH", "").split(os.pathsep) if x]
+  return dirs + list(SCHEMA_PATH) + [BUNDLED_SCHEMA_DIR]
+
+def _mirrorPath (url):
+  parts = urlparse(url)
+  if parts.scheme not in ("http", "https") or not parts.netloc:
+    return None
+  return os.path.join(parts.netloc, *[x for x in parts.path.split("/") if x])
+
+def _localPath (url, dirs):
+  rel = _mirrorPath(url)
+  if rel is None:
+    return None
+  for d in dirs:
+    path = os.path.join(d, rel)
+    if os.path.isfile(path):
+      return path
+  return None
+
+
+class _MirrorResolver(ET.Resolver):
+  """Maps remote schema URLs (including those in xs:import/xs:include) to the local mirror."""
+
+  def __init__ (self, dirs):
+    super(_MirrorResolver, self).__init__()
+    self.dirs = dirs
+
+  def resolve (self, system_url, public_id, context):
+    path = _localPath(system_url, self.dirs)
+    if path is None:
+      return None
+    return self.resolve_filename(path, context)
+
+
+class Validator(object):
+  """Validates documents against the schemas their namespaces declare.
+
+  The compiled `lxml.etree.XMLSchema` for each distinct set of `(namespace, location)`
+  pairs is built once and reused, so validating many documents of the same shape costs one
+  schema compilation.  Namespaces without a local schema copy are skipped (the GENI schemas
+  accept extension elements laxly); the document's own rspec schema must be present.
+
+  Args:
+    dirs (list): Schema mirror directories (default: :py:func:`schemaDirs`)
+  """
+
+  def __init__ (self, dirs = None):
+    self._dirs = dirs
+    self._schemas = {}
+    self._lock = threading.Lock()
+
+  @property
+  def dirs (self):
+    if self._dirs is not None:
+      return list(self._dirs)
+    return schemaDirs()
+
+  def _locations (self, root):
+    dirs = self.dirs
+    pairs = []
+    seen = set()
+    toks = (root.get(_SCHEMA_LOCATION) or "").split()
+    for (ns, loc) in zip(toks[0::2], toks[1::2]):
+      if ns not in seen:
+        seen.add(ns)
+        pairs.append((ns, loc))
+
+    rootns = ET.QName(root).namespace
+    if rootns == GNS.REQUEST.name and rootns not in seen and root.get("type") in RSPEC_LOCATIONS:
+      pairs.append((rootns, RSPEC_LOCATIONS[root.get("type")]))
+
+    found = []
+    for (ns, loc) in pairs:
+      if _localPath(loc, dirs) is not None:
+        found.append((ns, loc))
+      elif ns == rootns:
+        raise SchemaNotFoundError(ns, loc)
+    return tuple(sorted(found))
+
+  def schema (self, rspec):
+    """Returns the compiled `lxml.etree.XMLSchema` for `rspec` (anything accepted by :py:meth:`validate`)."""
+    return self._entry(self._locations(_rootOf(rspec)))[0]
+
+  def _entry (self, key):
+    with self._lock:
+      entry = self._schemas.get(key)
+    if entry is not None:
+      return entry
+
+    wrapper = ET.Element("{%s}schema" % (_XSD), nsmap = {"xs" : _XSD})
+    for (ns, loc) in key:
+      ET.SubElement(wrapper, "{%s}import" % (_XSD), namespace = ns, schemaLocation = loc)
+    parser = ET.XMLParser(no_network = True)
+    parser.resolvers.add(_MirrorResolver(self.dirs))
+    doc = ET.fromstring(ET.tostring(wrapper), parser)
+    schema = ET.XMLSchema(doc)
+
+    with self._lock:
+      entry = self._schemas.setdefault(key, (schema, threading.Lock()))
+    return entry
+
+  def validate (self, rspec):
+    """Validate a request, manifest or advertisement.
+
+    Args:
+      rspec: :py:class:`geni.rspec.pg.Request`, :py:class:`geni.rspec.vts.Request`, parsed manifest or
+        advertisement, `lxml` element, XML text (`bytes` or `str`), or path to an XML file
+
+    Returns:
+      list: Error messages (`"line N: message"`), empty if the document is valid
+    """
+    root = _rootOf(rspec)
+    (schema, lock) = self._entry(self._locations(root))
+    # error_log lives on the schema object, so one validation at a time per schema
+    with lock:
+      if schema.validate(root):
+        return []
+      return ["line %d: %s" % (err.line, err.message) for err in schema.error_log]
+
+  def assertValid (self, rspec):
+    """Raises :py:class:`RSpecValidationError` if `rspec` does not validate."""
+    errors = self.validate(rspec)
+    if errors:
+      raise RSpecValidationError(errors)
+
+  def validateMany (self, rspecs):
+    """Validate each document in `rspecs`, yielding `(rspec, errors)` pairs."""
+    for rspec in rspecs:
+      yield (rspec, self.validate(rspec))
+
+  def clear (self):
+    """Drop all compiled schemas (e.g. after updating the schema mirror)."""
+    with self._lock:
+      self._schemas = {}
+
+
+def _rootOf (rspec):
+  if not isinstance(rspec, (ET._Element, ET._ElementTree, six.text_type, bytes)):
+    # Parsed manifests expose `root`, advertisements only `_root` (an ElementTree if read from a file)
+    for attr in ("root", "_root"):
+      root = getattr(rspec, attr, None)
+      if root is not None:
+        rspec = root
+        break
+  if isinstance(rspec, ET._ElementTree):
+    return rspec.getroot()
+  if isinstance(rspec, ET._Element):
+    return rspec
+  if hasattr(rspec, "toXMLString"):
+    rspec = rspec.toXMLString()
+  if isinstance(rspec, six.text_type):
+    if not rspec.lstrip().startswith("<"):
+      return ET.parse(os.path.expanduser(rspec)).getroot()
+    rspec = rspec.encode("utf-8")
+  return ET.fromstring(rspec)
+
+
+_validator = None
+
+def getValidator ():
+  """Returns the shared :py:class:`Validator` used by the module-level functions."""
+  global _validator # pylint: disable=global-statement
+  if _validator is None:
+    _validator = Validator()
+  return _validator
+
+def validate (rspec):
+  """:py:meth:`Validator.validate` using the shared validator."""
+  return getValidator().validate(rspec)
+
+def assertValid (rspec):
+  """:py:meth:`Validator.assertValid` using the shared validator."""
+  getValidator().assertValid(rspec)
+
+
+def _schemaRefs (path, url):
+  refs = []
+  root = ET.parse(path).getroot()
+  for tag in ("include", "import", "redefine"):
+    for elem in root.iter("{%s}%s" % (_XSD, tag)):
+      loc = elem.get("schemaLocation")
+      if loc:
+        refs.append(urljoin(url, loc))
+  return refs
+
+def fetchSchemas (dest = None, locations = None, timeout = 30):
+  """Refresh the schema mirror: download schemas, and the schemas they include or import,
+  from their published locations.  Not required for validation, which falls back to the
+  schemas bundled with geni-lib.
+
+  Schemas that can not be downloaded (or are not well-formed XML) are skipped with a
+  warning, leaving any existing copy in place.
+
+  Args:
+    dest (str): Mirror directory (default: the first entry of :py:data:`SCHEMA_PATH`)
+    locations (list): Schema URLs (default: the GENIv3 request, manifest and advertisement
+      schemas, and every extension schema location known to geni-lib)
+    timeout (int): Per-download timeout in seconds
+
+  Returns:
+    list: Paths of the files written
+  """
+  import warnings
+  import requests
+
+  if dest is None:
+    dest = SCHEMA_PATH[0]
+  if locations is None:
+    locations = list(RSPEC_LOCATIONS.values()) + _knownLocations()
+
+  written = []
+  seen = set()
+  pending = list(locations)
+  while pending:
+    url = pending.pop(0)
+    rel = _mirrorPath(url)
+    if rel is None or url in seen:
+      continue
+    seen.add(url)
+
+    try:
+      resp = requests.get(url, timeout = timeout)
+      resp.raise_for_status()
+      ET.fromstring(resp.content)
+    except (requests.exceptions.RequestException, ET.XMLSyntaxError) as e:
+      warnings.warn("Could not fetch schema %s: %s" % (url, e))
+      continue
+
+    path = os.path.join(dest, rel)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "wb") as f:
+      f.write(resp.content)
+    written.append(path)
+    pending.extend(_schemaRefs(path, url))
+
+  getValidator().clear()
+  return written
+
+def _knownLocations ():
+  from . import pg, vts
+  locs = []
+  for holder in (GNS, pg.Namespaces, vts.Namespaces):
+    for ns in vars(holder).values():
+      if isinstance(ns, GNS.Namespace) and ns.location and _mirrorPath(ns.location) is not None:
+        locs.append(ns.location)
+  return locs
@@ -11,10 +11,12 @@ import six
 
 import geni.namespaces as GNS
 from geni.model.util import XPathXRange
+from geni.rspec._xpath import XPathSet
 
 
 VTSNS = GNS.Namespace("vts", "http://geni.bssoftworks.com/rspec/ext/vts/ad/1")
 _XPNS = {'g' : GNS.REQUEST.name, 'v' : VTSNS.name}
+_XP = XPathSet(_XPNS)
 
 def dumbcoerce (val):
   try:
@@ -40,17 +42,17 @@ class CircuitPlane(object):
   def _fromdom (cls, elem):
     cp = CircuitPlane()
     cp.label = elem.get("label")
-    supported = elem.xpath('v:supported-tunnels/v:tunnel-type', namespaces = _XPNS)
+    supported = _XP(elem, 'v:supported-tunnels/v:tunnel-type')
 
     for tuntyp in supported:
       cp.tunnel_types.append(tuntyp.get("name"))
 
     try:
-      cp.endpoint = elem.xpath('v:endpoint', namespaces = _XPNS)[0].get("value")
+      cp.endpoint = _XP(elem, 'v:endpoint')[0].get("value")
     except IndexError:
       cp.endpoint = None
 
-    for celem in elem.xpath('v:constraints/v:constraint', namespaces = _XPNS):
+    for celem in _XP(elem, 'v:constraints/v:constraint'):
       cp.constraints[celem.get("key")] = dumbcoerce(celem.get("value"))
 
     return cp
@@ -82,19 +84,21 @@ class Advertisement(object):
   def __init__ (self, path = None, xml = None):
     if path:
       self._root = ET.parse(open(path, "rb"))
+    elif ET.iselement(xml):
+      self._root = xml
     elif xml:
-      if six.PY3:
+      if isinstance(xml, six.text_type):
         self._root = ET.fromstring(bytes(xml, "utf-8"))
       else:
         self._root = ET.fromstring(xml)
 
   @property
   def circuit_planes (self):
-    return XPathXRange(self._root.xpath("v:circuit-planes/v:circuit-plane", namespaces = _XPNS), CircuitPlane)
+    return XPathXRange(_XP(self._root, "v:circuit-planes/v:circuit-plane"), CircuitPlane)
 
   @property
   def images (self):
-    return XPathXRange(self._root.xpath("v:images/v:image", namespaces = _XPNS), Image)
+    return XPathXRange(_XP(self._root, "v:images/v:image"), Image)
 
   @property
   def text (self):
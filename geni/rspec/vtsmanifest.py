@@ -6,18 +6,21 @@
 
 from __future__ import absolute_import
 
-import os
+import zlib
 
 from lxml import etree as ET
 import six
 
 import geni.namespaces as GNS
 from .pgmanifest import ManifestSvcLogin, ManifestSvcUser
+from ..model.util import SlottedObject, internstr
+from ._xpath import XPathSet
 
 XPNS = {'g' : GNS.REQUEST.name,
         'u' : GNS.USER.name,
         'v' : "http://geni.bssoftworks.com/rspec/ext/vts/manifest/1",
         's' : "http://geni.bssoftworks.com/rspec/ext/sdn/manifest/1"}
+_XP = XPathSet(XPNS)
 
 class UnhandledPortTypeError(Exception):
   def __init__ (self, typ):
@@ -27,7 +30,9 @@ class UnhandledPortTypeError(Exception):
     return "Port type '%s' isn't supported by port builder.  Perhaps you should contribute some code?" % (self.typ)
 
 
-class GenericPort(object):
+class GenericPort(SlottedObject):
+  __slots__ = ("client_id", "type", "cross_sliver", "_name", "_dpname")
+
   def __init__ (self, typ):
     self.client_id = None
     self.type = typ
@@ -37,7 +42,7 @@ class GenericPort(object):
 
   @classmethod
   def _fromdom (cls, elem):
-    p = GenericPort(elem.get("type"))
+    p = GenericPort(internstr(elem.get("type")))
     p.client_id = elem.get("client_id")
     return p
 
@@ -71,6 +76,8 @@ class InternalContainerPort(GenericPort):
     def __str__ (self):
       return "Port with client_id %s does not have MAC address." % (self._cid)
 
+  __slots__ = ("remote_client_id", "_macaddress", "_alias", "_remote_dpname")
+
   def __init__ (self):
     super(InternalContainerPort, self).__init__("internal")
     self.remote_client_id = None
@@ -114,6 +121,8 @@ class InternalContainerPort(GenericPort):
 
 
 class InternalPort(GenericPort):
+  __slots__ = ("remote_client_id", "_remote_dpname", "_vlan_id", "vlan_id")
+
   def __init__ (self):
     super(InternalPort, self).__init__("internal")
     self.remote_client_id = None
@@ -140,6 +149,8 @@ class InternalPort(GenericPort):
 
 
 class GREPort(GenericPort):
+  __slots__ = ("circuit_plane", "local_endpoint", "remote_endpoint")
+
   def __init__ (self):
     super(GREPort, self).__init__("gre")
     self.circuit_plane = None
@@ -150,14 +161,16 @@ class GREPort(GenericPort):
   def _fromdom (cls, elem):
     p = GREPort()
     p.client_id = elem.get("client_id")
-    endpe = elem.xpath("v:endpoint", namespaces=XPNS)[0]
-    p.circuit_plane = endpe.get("circuit-plane")
+    endpe = _XP(elem, "v:endpoint")[0]
+    p.circuit_plane = internstr(endpe.get("circuit-plane"))
     p.local_endpoint = endpe.get("local")
     p.remote_endpoint = endpe.get("remote")
     return p
 
 
 class PGLocalPort(GenericPort):
+  __slots__ = ("shared_vlan",)
+
   def __init__ (self):
     super(PGLocalPort, self).__init__("pg-local")
     self.shared_vlan = None
@@ -166,11 +179,13 @@ class PGLocalPort(GenericPort):
   def _fromdom (cls, elem):
     p = PGLocalPort()
     p.client_id = elem.get("client_id")
-    p.shared_vlan = elem.get("shared-lan")
+    p.shared_vlan = internstr(elem.get("shared-lan"))
     return p
 
 
 class VFPort(GenericPort):
+  __slots__ = ("remote_client_id",)
+
   def __init__ (self):
     super(VFPort, self).__init__("vf")
     self.remote_client_id = None
@@ -226,22 +241,22 @@ class ManifestContainer(object):
     c.image = elem.get("image")
     c.sliver_id = elem.get("sliver_id")
 
-    logins = elem.xpath('g:services/g:login', namespaces = XPNS)
+    logins = _XP(elem, 'g:services/g:login')
     for lelem in logins:
       l = ManifestSvcLogin._fromdom(lelem)
       c.logins.append(l)
 
-    users = elem.xpath('g:services/u:services_user', namespaces = XPNS)
+    users = _XP(elem, 'g:services/u:services_user')
     for uelem in users:
       u = ManifestSvcUser._fromdom(uelem)
       c.users.append(u)
 
-    ports = elem.xpath('v:port', namespaces = XPNS)
+    ports = _XP(elem, 'v:port')
     for cport in ports:
       p = Manifest._buildPort(cport, True)
       c.ports.append(p)
 
-    mounts = elem.xpath('v:mount', namespaces = XPNS)
+    mounts = _XP(elem, 'v:mount')
     for melem in mounts:
       m = ManifestMount._fromdom(melem)
       c.mounts.append(m)
@@ -281,15 +296,15 @@ class ManifestDatapath(object):
     dp.image = elem.get("image")
     dp.sliver_id = elem.get("sliver_id")
 
-    mirror = elem.xpath('v:mirror', namespaces = XPNS)
+    mirror = _XP(elem, 'v:mirror')
     if mirror:
       dp.mirror = mirror[0].get("target")
 
-    stp = elem.xpath('v:stp', namespaces = XPNS)
+    stp = _XP(elem, 'v:stp')
     if stp:
       dp.stp_mode = stp[0].get("type")
 
-    ports = elem.xpath('v:port', namespaces = XPNS)
+    ports = _XP(elem, 'v:port')
     for port in ports:
       p = Manifest._buildPort(port)
       dp.ports.append(p)
@@ -314,23 +329,25 @@ class SSLVPNFunction(ManifestFunction):
     return vpn
 
 class Manifest(object):
-  """Wrapper object for GENI XML manifest rspec, providing a pythonic API to the contained data"""
+  """Wrapper object for GENI XML manifest rspec, providing a pythonic API to the contained data.
+
+  Manifests can be pickled; the document is carried compressed and re-parsed on first use."""
 
   def __init__ (self, path = None, xml = None):
+    self._rootelem = None
+    self._zxml = None
     if path:
-      self._root = ET.parse(open(path, "rb"))
-      self._xml = ET.tostring(self._root)
+      with open(path, "rb") as f:
+        self._rootelem = ET.fromstring(f.read())
     elif xml:
-      if six.PY3:
-        self._xml = bytes(xml, "utf-8")
-      else:
-        self._xml = xml
-      self._root = ET.fromstring(self._xml)
-    self._pid = os.getpid()
+      if isinstance(xml, six.text_type):
+        xml = bytes(xml, "utf-8")
+      self._rootelem = ET.fromstring(xml)
     self._info = {}
+    self._index = None
 
   def _populate_info (self):
-    ielems = self._root.xpath('v:info', namespaces = XPNS)
+    ielems = _XP(self._root, 'v:info')
     if ielems:
       self._info["host"] = ielems[0].get("host")
       self._info["slice"] = ielems[0].get("slice")
@@ -339,13 +356,55 @@ class Manifest(object):
   def __getitem__ (self, key):
     return self.findTarget(key)
 
+  @property
+  def _root (self):
+    if self._rootelem is None and self._zxml is not None:
+      self._rootelem = ET.fromstring(zlib.decompress(self._zxml))
+    return self._rootelem
+
   @property
   def root (self):
-    if os.getpid() != self._pid:
-      self._root = ET.fromstring(self._xml)
-      self._pid = os.getpid()
     return self._root
 
+  def __getstate__ (self):
+    state = self.__dict__.copy()
+    if self._zxml is None:
+      state["_zxml"] = zlib.compress(ET.tostring(self._root), 1)
+    state["_rootelem"] = None
+    state["_index"] = None
+    return state
+
+  def __setstate__ (self, state):
+    self.__dict__.update(state)
+
+  def _buildIndex (self):
+    datapaths = [ManifestDatapath._fromdom(elem) for elem in _XP(self._root, "v:datapath")]
+    containers = [ManifestContainer._fromdom(elem) for elem in _XP(self._root, "v:container")]
+    functions = [ManifestFunction._fromdom(elem) for elem in _XP(self._root, "v:functions/v:function")]
+
+    targets = {}
+    dpports = {}
+    owners = {}
+    for dp in datapaths:
+      targets[dp.client_id] = dp
+      for port in dp.ports:
+        dpports[port.client_id] = port
+        owners[port.client_id] = dp
+    for ctr in containers:
+      targets.setdefault(ctr.client_id, ctr)
+      for port in ctr.ports:
+        owners.setdefault(port.client_id, ctr)
+
+    self._index = {"datapaths" : datapaths, "containers" : containers, "functions" : functions,
+                   "targets" : targets, "dpports" : dpports, "owners" : owners, "graph" : None}
+    return self._index
+
+  def _getIndex (self, which):
+    index = self._index
+    if index is None:
+      index = self._buildIndex()
+    return index[which]
+
   @property
   def text (self):
     """String representation of original XML content, with added whitespace for easier reading"""
@@ -354,7 +413,7 @@ class Manifest(object):
   @property
   def pg_circuits (self):
     """Iterator for allocated circuit names on the local PG circuit plane (as strings)."""
-    elems = self._root.xpath("v:datapath/v:port[@shared-lan]", namespaces = XPNS)
+    elems = _XP(self._root, "v:datapath/v:port[@shared-lan]")
     for elem in elems:
       yield elem.get("shared-lan")
 
@@ -373,23 +432,17 @@ class Manifest(object):
   @property
   def containers (self):
     """Iterator over all allocated containers as :py:class:`ManifestContainer` objects."""
-    elems = self._root.xpath("v:container", namespaces = XPNS)
-    for elem in elems:
-      yield ManifestContainer._fromdom(elem)
+    return iter(self._getIndex("containers"))
 
   @property
   def functions (self):
     """Iterator over all allocated functions as :py:class:`ManifestFunction` objects."""
-    elems = self._root.xpath("v:functions/v:function", namespaces = XPNS)
-    for elem in elems:
-      yield ManifestFunction._fromdom(elem)
+    return iter(self._getIndex("functions"))
 
   @property
   def datapaths (self):
     """Iterator over all allocated datapaths as :py:class:`ManifestDatapath` objects."""
-    elems = self._root.xpath("v:datapath", namespaces = XPNS)
-    for elem in elems:
-      yield ManifestDatapath._fromdom(elem)
+    return iter(self._getIndex("datapaths"))
 
   @property
   def host (self):
@@ -418,14 +471,7 @@ class Manifest(object):
     Returns:
       :py:class:`ManifestDatapath`, :py:class:`ManifestContainer`, or `None`
     """
-      
-    dpelems = self._root.xpath("v:datapath[@client_id='%s']" % (client_id), namespaces = XPNS)
-    if dpelems:
-      return ManifestDatapath._fromdom(dpelems[0])
-
-    ctelems = self._root.xpath("v:container[@client_id='%s']" % (client_id), namespaces = XPNS)
-    if ctelems:
-      return ManifestContainer._fromdom(ctelems[0])
+    return self._getIndex("targets").get(client_id)
 
   def findPort (self, client_id):
     """Get the datapath port object representing the given `client_id`.
@@ -436,9 +482,78 @@ class Manifest(object):
     Returns:
       :py:class:`GenericPort` or `None`
     """
-    pelems = self._root.xpath("v:datapath/v:port[@client_id='%s']" % (client_id), namespaces = XPNS)
-    if pelems:
-      return Manifest._buildPort(pelems[0])
+    return self._getIndex("dpports").get(client_id)
+
+  def portOwner (self, port):
+    """Get the datapath or container that a port belongs to.
+
+    Args:
+      port: :py:class:`GenericPort` object or port `client_id`
+
+    Returns:
+      :py:class:`ManifestDatapath`, :py:class:`ManifestContainer`, or `None`
+    """
+    if isinstance(port, GenericPort):
+      port = port.client_id
+    return self._getIndex("owners").get(port)
+
+  @staticmethod
+  def _remoteName (port):
+    if isinstance(port, (InternalPort, InternalContainerPort)):
+      if port.remote_client_id is None:
+        return None
+      return port.remote_dpname
+    if isinstance(port, VFPort):
+      return port.remote_client_id
+    if isinstance(port, PGLocalPort):
+      return port.shared_vlan
+    return None
+
+  def remoteTarget (self, port):
+    """Get the datapath or container on the far side of an internal port.
+
+    Args:
+      port: :py:class:`GenericPort` object or datapath port `client_id`
+
+    Returns:
+      :py:class:`ManifestDatapath`, :py:class:`ManifestContainer`, or `None` (also for ports that
+      don't lead to another datapath or container, such as GRE and PG local ports)
+    """
+    if not isinstance(port, GenericPort):
+      port = self.findPort(port)
+      if port is None:
+        return None
+    return self.findTarget(Manifest._remoteName(port))
+
+  @property
+  def edges (self):
+    """List of `(client_id, port, remote_name)` tuples, one per datapath or container port that
+    leads somewhere: `remote_name` is the remote datapath for internal ports, the function for
+    VF ports and the circuit name for PG local ports."""
+    edges = []
+    for (cid, target) in self._getIndex("targets").items():
+      for port in target.ports:
+        remote = Manifest._remoteName(port)
+        if remote is not None:
+          edges.append((cid, port, remote))
+    return edges
+
+  @property
+  def graph (self):
+    """Adjacency map of the topology, `{ name : set(neighbour_name, ...), ... }`, over datapath,
+    container, function and circuit names (built from :py:attr:`edges`, undirected)."""
+    graph = self._getIndex("graph")
+    if graph is None:
+      graph = {}
+      for (cid, _, remote) in self.edges:
+        graph.setdefault(cid, set()).add(remote)
+        graph.setdefault(remote, set()).add(cid)
+      self._index["graph"] = graph
+    return graph
+
+  def neighbors (self, client_id):
+    """Names adjacent to `client_id` in :py:attr:`graph`."""
+    return set(self.graph.get(client_id, ()))
 
   @staticmethod
   def _buildPort (elem, container = False):
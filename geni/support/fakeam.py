@@ -0,0 +1,748 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+"""Local stand-in for GENI aggregates and clearinghouses.
+
+:py:class:`FakeAMServer` is an HTTPS XML-RPC server implementing enough of AM API v2, AM API v3
+and CH API v2 to drive :py:class:`geni.aggregate.core.AM`, :py:class:`geni.aggregate.protogeni.PGCompute`
+and :py:class:`geni.aggregate.frameworks.CHAPI2` without network access.  Response latency,
+error injection and advertisement size are configurable, so that throughput and latency of the
+client stack can be measured offline::
+
+  from geni.support import fakeam
+
+  with fakeam.FakeAMServer(nodes = 5000, latency = 0.05) as srv:
+    context = srv.makeContext()
+    ad = srv.aggregate().listresources(context)
+"""
+
+from __future__ import absolute_import
+
+import base64
+import datetime
+import itertools
+import os
+import random
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import zlib
+
+from six.moves import xmlrpc_client as xmlrpclib
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.xmlrpc_server import (MultiPathXMLRPCServer, SimpleXMLRPCDispatcher,
+                                     SimpleXMLRPCRequestHandler)
+
+from lxml import etree as ET
+
+from ..aggregate.frameworks import CHAPI2
+
+AUTHORITY = "fake.geni"
+
+GENI_NS = "http://www.geni.net/resources/rspec/3"
+EMULAB_NS = "http://www.protogeni.net/resources/rspec/ext/emulab/1"
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+
+AM2_PATH = "/am/2.0"
+AM3_PATH = "/am/3.0"
+SA_PATH = "/sa"
+MA_PATH = "/ma"
+
+# ProtoGENI error codes used by injected failures
+PG_BUSY = 14
+GENI_ERROR = 2
+GENI_SEARCHFAILED = 12
+
+DATE_FMT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def makeCertificate (directory, user = "tester", days = 30):
+  """Write a self-signed certificate and unencrypted key for a fake user to `directory`.
+
+  The certificate carries a `urn:publicid` subjectAltName so that
+  :py:attr:`geni.aggregate.frameworks.Framework.userurn` works, and is used as both the server and
+  client certificate by :py:class:`FakeAMServer`.
+
+  Returns:
+    tuple: `(cert_path, key_path, user_urn)`
+  """
+  from cryptography import x509
+  from cryptography.hazmat.backends import default_backend
+  from cryptography.hazmat.primitives import hashes, serialization
+  from cryptography.hazmat.primitives.asymmetric import rsa
+  from cryptography.x509.oid import NameOID
+  import ipaddress
+
+  urn = "urn:publicid:IDN+%s+user+%s" % (AUTHORITY, user)
+  key = rsa.generate_private_key(public_exponent = 65537, key_size = 2048, backend = default_backend())
+  name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, u"localhost")])
+  now = datetime.datetime.utcnow()
+  cert = (x509.CertificateBuilder()
+          .subject_name(name)
+          .issuer_name(name)
+          .public_key(key.public_key())
+          .serial_number(x509.random_serial_number())
+          .not_valid_before(now - datetime.timedelta(days = 1))
+          .not_valid_after(now + datetime.timedelta(days = days))
+          .add_extension(x509.SubjectAlternativeName([x509.UniformResourceIdentifier(urn),
+                                                      x509.DNSName(u"localhost"),
+                                                      x509.IPAddress(ipaddress.ip_address(u"127.0.0.1"))]),
+                         critical = False)
+          .sign(key, hashes.SHA256(), default_backend()))
+
+  cpath = os.path.join(directory, "%s-cert.pem" % (user))
+  kpath = os.path.join(directory, "%s-key.pem" % (user))
+  with open(cpath, "wb") as f:
+    f.write(cert.public_bytes(serialization.Encoding.PEM))
+  with open(kpath, "wb") as f:
+    f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+                              serialization.NoEncryption()))
+  return (cpath, kpath, urn)
+
+
+def compress (data):
+  """Encode `data` (bytes) the way aggregates return `geni_compressed` results."""
+  return base64.b64encode(zlib.compress(data)).decode("ascii")
+
+
+def makeCredential (owner_urn, target_urn, days = 30):
+  """Returns an (unsigned) SFA credential document with the fields geni-lib inspects."""
+  exp = (datetime.datetime.utcnow() + datetime.timedelta(days = days)).strftime(DATE_FMT)
+  return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<signed-credential><credential xml:id=\"ref0\">"
+          "<type>privilege</type><serial>1</serial><owner_gid/><owner_urn>%s</owner_urn>"
+          "<target_gid/><target_urn>%s</target_urn><uuid/><expires>%s</expires>"
+          "<privileges><privilege><name>*</name><can_delegate>true</can_delegate></privilege></privileges>"
+          "</credential><signatures/></signed-credential>\n" % (owner_urn, target_urn, exp))
+
+
+def makeAdvertisement (nodes = 100, links = 0, interfaces = 2, available = 0.8, exclusive = 0.9,
+                       images = 3, seed = 0, available_only = False):
+  """Generate a synthetic ProtoGENI-style GENIv3 advertisement.
+
+  Args:
+    nodes (int): Number of nodes
+    links (int): Number of links (each joins interfaces on two random nodes)
+    interfaces (int): Interfaces per node
+    available (float): Fraction of nodes that are currently available
+    exclusive (float): Fraction of nodes that are exclusive (raw-pc capable)
+    images (int): Number of disk images listed per sliver type
+    seed (int): Seed for the (deterministic) generator
+    available_only (bool): Omit unavailable nodes (as for `geni_available`)
+
+  Returns:
+    bytes: UTF-8 encoded advertisement document
+  """
+  rnd = random.Random(seed)
+  cmid = "urn:publicid:IDN+%s+authority+cm" % (AUTHORITY)
+  hwtypes = ["pc3000", "d430", "d710", "m400", "c220g2"]
+  out = ["<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n",
+         "<rspec xmlns=\"%s\" xmlns:emulab=\"%s\" xmlns:xsi=\"%s\" type=\"advertisement\" "
+         "generated=\"%s\" expires=\"%s\">\n" % (GENI_NS, EMULAB_NS, XSI_NS,
+                                                 datetime.datetime.utcnow().strftime(DATE_FMT),
+                                                 datetime.datetime.utcnow().strftime(DATE_FMT))]
+  imgs = "".join(["<disk_image name=\"urn:publicid:IDN+%s+image+emulab-ops:UBUNTU%d-64-STD\" os=\"Linux\" "
+                  "version=\"%d\" description=\"Ubuntu %d\"/>" % (AUTHORITY, 16 + 2 * i, i, 16 + 2 * i)
+                  for i in range(images)])
+  for n in range(nodes):
+    avail = rnd.random() < available
+    excl = rnd.random() < exclusive
+    if available_only and not avail:
+      continue
+    hw = hwtypes[n % len(hwtypes)]
+    name = "pc%d" % (n)
+    ncid = "urn:publicid:IDN+%s+node+%s" % (AUTHORITY, name)
+    out.append("<node component_manager_id=\"%s\" component_name=\"%s\" component_id=\"%s\" exclusive=\"%s\">"
+               % (cmid, name, ncid, "true" if excl else "false"))
+    out.append("<hardware_type name=\"%s\"><emulab:node_type type_slots=\"1\"/></hardware_type>" % (hw))
+    out.append("<hardware_type name=\"pc\"><emulab:node_type type_slots=\"1\"/></hardware_type>")
+    if excl:
+      out.append("<sliver_type name=\"raw-pc\">%s</sliver_type>" % (imgs))
+    out.append("<sliver_type name=\"emulab-xen\">%s</sliver_type>" % (imgs))
+    out.append("<available now=\"%s\"/>" % ("true" if avail else "false"))
+    out.append("<location country=\"US\" longitude=\"-111.84\" latitude=\"40.76\"/>")
+    for i in range(interfaces):
+      out.append("<interface component_id=\"%s:eth%d\" role=\"%s\"/>"
+                 % (ncid, i, "control" if i == 0 else "experimental"))
+    out.append("<emulab:fd name=\"cpu\" weight=\"2400\"/><emulab:fd name=\"ram\" weight=\"16384\"/>")
+    out.append("</node>\n")
+  for l in range(links):
+    (a, b) = (rnd.randrange(nodes), rnd.randrange(nodes))
+    out.append("<link component_id=\"urn:publicid:IDN+%s+link+link%d\" component_name=\"link%d\">"
+               "<component_manager name=\"%s\"/>"
+               "<interface_ref component_id=\"urn:publicid:IDN+%s+interface+pc%d:eth1\"/>"
+               "<interface_ref component_id=\"urn:publicid:IDN+%s+interface+pc%d:eth1\"/>"
+               "<link_type name=\"ethernet\"/></link>\n" % (AUTHORITY, l, l, cmid, AUTHORITY, a, AUTHORITY, b))
+  out.append("</rspec>\n")
+  return "".join(out).encode("utf-8")
+
+
+class Fault(object):
+  """Error injection rule for :py:class:`FakeAMServer`.
+
+  Args:
+    kind (str): One of `"busy"` (ProtoGENI `am_code` 14), `"error"` (generic `geni_code` 2),
+      `"fault"` (XML-RPC fault), `"http503"` (HTTP 503 response), `"drop"` (close the connection
+      without responding) or `"hang"` (sleep `delay` seconds before responding normally)
+    rate (float): Probability that a matching call is affected
+    method (str): Only affect this XML-RPC method (`None` for all).  Ignored for HTTP-level kinds.
+    path (str): Only affect calls to this path (`None` for all)
+    count (int): Stop after this many injections (`None` for unlimited)
+    delay (float): Sleep for `"hang"`
+  """
+
+  HTTP_KINDS = frozenset(["http503", "drop", "hang"])
+
+  def __init__ (self, kind, rate = 1.0, method = None, path = None, count = None, delay = 30.0):
+    self.kind = kind
+    self.rate = rate
+    self.method = method
+    self.path = path
+    self.count = count
+    self.delay = delay
+    self.injected = 0
+
+  def matches (self, rnd, path, method = None):
+    if self.count is not None and self.injected >= self.count:
+      return False
+    if self.path is not None and self.path != path:
+      return False
+    if method is not None and self.method is not None and self.method != method:
+      return False
+    return rnd.random() < self.rate
+
+
+class _Service(object):
+  """Base for XML-RPC service instances; applies latency and method-level fault injection."""
+
+  def __init__ (self, server, path):
+    self.server = server
+    self.path = path
+
+  def _dispatch (self, method, params):
+    if method.startswith("_"):
+      raise xmlrpclib.Fault(1, "Unknown method %s" % (method))
+    func = getattr(self, method, None)
+    if func is None:
+      raise xmlrpclib.Fault(1, "Unknown method %s" % (method))
+
+    self.server._delay(method)
+    fault = self.server._pickFault(self.path, method, http = False)
+    if fault is not None:
+      if fault.kind == "fault":
+        raise xmlrpclib.Fault(GENI_ERROR, "Injected fault in %s" % (method))
+      return self._error(fault.kind, method)
+
+    self.server._count(method)
+    return func(*params)
+
+  def _error (self, kind, method):
+    raise NotImplementedError()
+
+
+class _AMService(_Service):
+  API_VERSION = 2
+
+  @staticmethod
+  def _ok (value):
+    return {"code" : {"geni_code" : 0, "am_type" : "protogeni", "am_code" : 0,
+                      "protogeni_error_url" : ""},
+            "value" : value, "output" : ""}
+
+  def _error (self, kind, method):
+    if kind == "busy":
+      return {"code" : {"geni_code" : GENI_ERROR, "am_type" : "protogeni", "am_code" : PG_BUSY,
+                        "protogeni_error_url" : ""},
+              "value" : "Slice is busy; try again later (%s)" % (method),
+              "output" : "Slice is busy; try again later (%s)" % (method)}
+    # Like ProtoGENI, error responses carry the message as a string value
+    return {"code" : {"geni_code" : GENI_ERROR, "am_type" : "protogeni", "am_code" : GENI_ERROR,
+                      "protogeni_error_url" : ""},
+            "value" : "Injected error in %s" % (method), "output" : "Injected error in %s" % (method)}
+
+  @staticmethod
+  def _notfound (urn):
+    return {"code" : {"geni_code" : GENI_SEARCHFAILED, "am_type" : "protogeni", "am_code" : GENI_SEARCHFAILED,
+                      "protogeni_error_url" : ""},
+            "value" : "No such slice here: %s" % (urn), "output" : "No such slice here: %s" % (urn)}
+
+  def GetVersion (self, options = None):
+    return self._ok({"geni_api" : self.API_VERSION,
+                     "geni_api_versions" : {"2" : self.server.url(AM2_PATH), "3" : self.server.url(AM3_PATH)},
+                     "geni_request_rspec_versions" : [{"type" : "GENI", "version" : "3"}],
+                     "geni_ad_rspec_versions" : [{"type" : "GENI", "version" : "3"}],
+                     "geni_single_allocation" : 0,
+                     "geni_allocate" : "geni_many"})
+
+
+class _AMv2Service(_AMService):
+  API_VERSION = 2
+
+  def ListResources (self, creds, options):
+    surn = options.get("geni_slice_urn")
+    compressed = bool(options.get("geni_compressed"))
+    if surn:
+      sliver = self.server._sliver(surn)
+      if sliver is None:
+        return self._notfound(surn)
+      if compressed:
+        return self._ok(compress(sliver.manifest))
+      return self._ok(sliver.manifest.decode("utf-8"))
+
+    data = self.server.advertisement(bool(options.get("geni_available")), compressed)
+    if compressed:
+      return self._ok(data)
+    return self._ok(data.decode("utf-8"))
+
+  def CreateSliver (self, slice_urn, creds, rspec, users, options = None):
+    sliver = self.server._allocate(slice_urn, rspec, users)
+    return self._ok(sliver.manifest.decode("utf-8"))
+
+  def SliverStatus (self, slice_urn, creds, options = None):
+    sliver = self.server._sliver(slice_urn)
+    if sliver is None:
+      return self._notfound(slice_urn)
+    return self._ok({"geni_urn" : slice_urn, "geni_status" : "ready", "pg_status" : "ready",
+                     "geni_resources" : [{"geni_urn" : s, "geni_status" : "ready", "geni_error" : "",
+                                          "pg_status" : "ready"} for s in sliver.slivers]})
+
+  def RenewSliver (self, slice_urn, creds, expiration, options = None):
+    sliver = self.server._sliver(slice_urn)
+    if sliver is None:
+      return self._notfound(slice_urn)
+    return self._ok(True)
+
+  def DeleteSliver (self, slice_urn, creds, options = None):
+    if self.server._delete(slice_urn) is None:
+      return self._notfound(slice_urn)
+    return self._ok(True)
+
+
+class _AMv3Service(_AMService):
+  API_VERSION = 3
+
+  def _sliverList (self, sliver, alloc = "geni_provisioned", op = "geni_ready"):
+    return [{"geni_sliver_urn" : s, "geni_expires" : sliver.expires, "geni_allocation_status" : alloc,
+             "geni_operational_status" : op, "geni_error" : ""} for s in sliver.slivers]
+
+  def _lookup (self, urns):
+    for urn in urns:
+      sliver = self.server._sliver(urn)
+      if sliver is not None:
+        return (urn, sliver)
+    return (urns[0] if urns else None, None)
+
+  def Allocate (self, slice_urn, creds, rspec, options = None):
+    sliver = self.server._allocate(slice_urn, rspec, [])
+    return self._ok({"geni_rspec" : sliver.manifest.decode("utf-8"),
+                     "geni_slivers" : self._sliverList(sliver, "geni_allocated", "geni_notready")})
+
+  def Provision (self, urns, creds, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    return self._ok({"geni_rspec" : sliver.manifest.decode("utf-8"), "geni_slivers" : self._sliverList(sliver)})
+
+  def Describe (self, urns, creds, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    return self._ok({"geni_rspec" : sliver.manifest.decode("utf-8"), "geni_urn" : urn,
+                     "geni_slivers" : self._sliverList(sliver)})
+
+  def Status (self, urns, creds, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    return self._ok({"geni_urn" : urn, "geni_slivers" : self._sliverList(sliver)})
+
+  def PerformOperationalAction (self, urns, creds, action, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    if action == "geni_console_url":
+      return self._ok([{"geni_sliver_urn" : s, "geni_value" : "https://localhost/console/%d" % (i)}
+                       for (i, s) in enumerate(sliver.slivers)])
+    return self._ok(self._sliverList(sliver))
+
+  def PerformAggregateAction (self, action, options = None):
+    return self._ok({})
+
+  def Renew (self, urns, creds, expiration, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    return self._ok(self._sliverList(sliver))
+
+  def Delete (self, urns, creds, options = None):
+    (urn, sliver) = self._lookup(urns)
+    if sliver is None:
+      return self._notfound(urn)
+    self.server._delete(urn)
+    return self._ok(self._sliverList(sliver, "geni_unallocated", "geni_notready"))
+
+
+class _CHService(_Service):
+  """Minimal CH API v2 (SA and MA) service."""
+
+  @staticmethod
+  def _ok (value):
+    return {"code" : 0, "value" : value, "output" : ""}
+
+  def _error (self, kind, method):
+    return {"code" : GENI_ERROR, "value" : None, "output" : "Injected error in %s" % (method)}
+
+  def get_version (self):
+    return self._ok({"VERSION" : "2", "SERVICES" : ["SLICE", "MEMBER", "KEY", "PROJECT"],
+                     "CREDENTIAL_TYPES" : [{"type" : "geni_sfa", "version" : "3"}]})
+
+  def get_credentials (self, target_urn, creds, options = None):
+    return self._ok([{"geni_type" : "geni_sfa", "geni_version" : "3",
+                      "geni_value" : makeCredential(self.server.user_urn, target_urn)}])
+
+  def lookup (self, typ, creds, options = None):
+    match = (options or {}).get("match", {})
+    if typ == "SERVICE":
+      return self._ok([{"SERVICE_URN" : "urn:publicid:IDN+%s+authority+cm" % (AUTHORITY),
+                        "SERVICE_URL" : self.server.url(AM2_PATH), "SERVICE_TYPE" : "AGGREGATE_MANAGER",
+                        "SERVICE_NAME" : "fake-am"}])
+    if typ == "MEMBER":
+      urn = match.get("MEMBER_URN", self.server.user_urn)
+      return self._ok({urn : {"MEMBER_URN" : urn, "MEMBER_UID" : "0", "MEMBER_USERNAME" : "tester",
+                              "MEMBER_EMAIL" : "tester@%s" % (AUTHORITY)}})
+    if typ == "KEY":
+      return self._ok({})
+    if typ == "SLICE":
+      return self._ok({})
+    return self._ok({})
+
+  def lookup_for_member (self, typ, member_urn, creds, options = None):
+    return self._ok([])
+
+  def lookup_members (self, typ, urn, creds, options = None):
+    return self._ok([{"%s_MEMBER" % (typ) : self.server.user_urn, "%s_ROLE" % (typ) : "LEAD"}])
+
+  def create (self, typ, creds, options = None):
+    fields = (options or {}).get("fields", {})
+    if typ == "SLICE":
+      urn = "urn:publicid:IDN+%s+slice+%s" % (AUTHORITY, fields.get("SLICE_NAME"))
+      return self._ok({"SLICE_URN" : urn, "SLICE_NAME" : fields.get("SLICE_NAME"),
+                       "SLICE_EXPIRATION" : fields.get("SLICE_EXPIRATION")})
+    return self._ok(fields)
+
+  def update (self, typ, urn, creds, options = None):
+    return self._ok(None)
+
+  def modify_membership (self, typ, urn, creds, options = None):
+    return self._ok(None)
+
+
+class _Sliver(object):
+  def __init__ (self, manifest, slivers, expires):
+    self.manifest = manifest
+    self.slivers = slivers
+    self.expires = expires
+
+
+class _RequestHandler(SimpleXMLRPCRequestHandler):
+  protocol_version = "HTTP/1.1"
+  rpc_paths = ()
+
+  def do_POST (self):
+    fault = self.server._pickFault(self.path, None, http = True)
+    if fault is not None:
+      if fault.kind == "hang":
+        time.sleep(fault.delay)
+      else:
+        length = int(self.headers.get("content-length", 0))
+        self.rfile.read(length)
+        if fault.kind == "drop":
+          self.close_connection = True
+          return
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return
+    SimpleXMLRPCRequestHandler.do_POST(self)
+
+  def log_message (self, fmt, *args): # pylint: disable=arguments-differ
+    pass
+
+
+class FakeAMServer(ThreadingMixIn, MultiPathXMLRPCServer):
+  """In-process HTTPS XML-RPC server posing as a ProtoGENI aggregate (AM API v2 at `/am/2.0`,
+  v3 at `/am/3.0`) and a CH API v2 clearinghouse (`/sa`, `/ma`).
+
+  Requests are served on a thread per connection with HTTP/1.1 keep-alive; TLS handshakes happen
+  on the connection thread, not the accept loop.  Client certificates are accepted but not verified.
+
+  Args:
+    host (str): Address to bind
+    port (int): Port to bind (0 picks a free port)
+    certdir (str): Directory to hold the generated certificate/key (a temporary directory if `None`)
+    latency (float or callable): Added delay per call in seconds, or a `callable(method) -> seconds`
+    faults (list): :py:class:`Fault` rules
+    nodes (int): Number of nodes in the synthetic advertisement
+    links (int): Number of links in the synthetic advertisement
+    seed (int): Seed for advertisement generation and fault injection
+    ad_options (dict): Additional keyword arguments for :py:func:`makeAdvertisement`
+  """
+
+  daemon_threads = True
+  request_queue_size = 256
+  allow_reuse_address = True
+
+  def __init__ (self, host = "127.0.0.1", port = 0, certdir = None, latency = 0, faults = None,
+                nodes = 100, links = 0, seed = 0, ad_options = None):
+    MultiPathXMLRPCServer.__init__(self, (host, port), requestHandler = _RequestHandler, logRequests = False,
+                                   allow_none = True, use_builtin_types = False)
+    self._tmpdir = None
+    if certdir is None:
+      self._tmpdir = tempfile.mkdtemp(prefix = "fakeam-")
+      certdir = self._tmpdir
+    (self.cert, self.key, self.user_urn) = makeCertificate(certdir)
+
+    self._sslctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    self._sslctx.load_cert_chain(self.cert, self.key)
+
+    self.latency = latency
+    self.faults = list(faults or [])
+    self.ad_options = dict(ad_options or {})
+    self.ad_options.setdefault("nodes", nodes)
+    self.ad_options.setdefault("links", links)
+    self.ad_options.setdefault("seed", seed)
+
+    self._rnd = random.Random(seed)
+    self._lock = threading.Lock()
+    self._ads = {}
+    self._slices = {}
+    self._ids = itertools.count(1)
+    self.calls = {}
+    self._thread = None
+
+    for (path, klass) in ((AM2_PATH, _AMv2Service), (AM3_PATH, _AMv3Service),
+                          (SA_PATH, _CHService), (MA_PATH, _CHService)):
+      disp = SimpleXMLRPCDispatcher(allow_none = True, encoding = "utf-8")
+      disp.register_instance(klass(self, path))
+      self.add_dispatcher(path, disp)
+
+  def __enter__ (self):
+    return self.start()
+
+  def __exit__ (self, *args):
+    self.stop()
+
+  @property
+  def port (self):
+    return self.server_address[1]
+
+  def url (self, path = AM2_PATH):
+    return "https://%s:%d%s" % (self.server_address[0], self.port, path)
+
+  def start (self):
+    """Serve requests on a background daemon thread.  Returns `self`."""
+    self._thread = threading.Thread(target = self.serve_forever, kwargs = {"poll_interval" : 0.1})
+    self._thread.daemon = True
+    self._thread.start()
+    return self
+
+  def stop (self):
+    self.shutdown()
+    self.server_close()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+    if self._tmpdir:
+      shutil.rmtree(self._tmpdir, ignore_errors = True)
+      self._tmpdir = None
+
+  def aggregate (self, name = "fake-am"):
+    """Returns a :py:class:`geni.aggregate.protogeni.PGCompute` pointed at this server."""
+    from ..aggregate.protogeni import PGCompute
+    return PGCompute(name, self.server_address[0], "urn:publicid:IDN+%s+authority+cm" % (AUTHORITY),
+                     url = self.url(AM2_PATH))
+
+  def framework (self):
+    """Returns a CH API v2 framework pointed at this server, using the generated certificate."""
+    return FakeFramework(self)
+
+  def makeContext (self, datadir = None, project = "bench"):
+    """Build a :py:class:`geni.aggregate.context.Context` (with one user and SSH key) that talks to this server.
+
+    Credentials are downloaded into `datadir` (a temporary directory if `None`) on first use.
+    """
+    from ..aggregate.context import Context
+    from ..aggregate.user import User
+
+    if datadir is None:
+      datadir = tempfile.mkdtemp(prefix = "fakeam-ctx-", dir = self._tmpdir)
+
+    pubkey = os.path.join(datadir, "id_rsa.pub")
+    with open(pubkey, "w") as f:
+      f.write("ssh-rsa AAAAB3NzaC1yc2EAAAADAQABAAABAQ tester@%s\n" % (AUTHORITY))
+
+    user = User()
+    user.name = "tester"
+    user.urn = self.user_urn
+    user.addKey(pubkey)
+
+    context = Context()
+    context.addUser(user)
+    context.cf = self.framework()
+    context.project = project
+    context.datadir = datadir
+    return context
+
+  def resetStats (self):
+    with self._lock:
+      self.calls = {}
+
+  def finish_request (self, request, client_address):
+    try:
+      request = self._sslctx.wrap_socket(request, server_side = True)
+    except (ssl.SSLError, socket.error):
+      return
+    try:
+      MultiPathXMLRPCServer.finish_request(self, request, client_address)
+    finally:
+      try:
+        request.close()
+      except (ssl.SSLError, socket.error):
+        pass
+
+  def handle_error (self, request, client_address):
+    pass
+
+  def advertisement (self, available_only = False, compressed = False):
+    """Returns the (cached) advertisement bytes, or its base64 `geni_compressed` encoding."""
+    key = (available_only, compressed)
+    with self._lock:
+      ad = self._ads.get(key)
+      if ad is not None:
+        return ad
+    if compressed:
+      ad = compress(self.advertisement(available_only))
+    else:
+      ad = makeAdvertisement(available_only = available_only, **self.ad_options)
+    with self._lock:
+      self._ads[key] = ad
+    return ad
+
+  def _count (self, method):
+    with self._lock:
+      self.calls[method] = self.calls.get(method, 0) + 1
+
+  def _delay (self, method):
+    lat = self.latency(method) if callable(self.latency) else self.latency
+    if lat:
+      time.sleep(lat)
+
+  def _pickFault (self, path, method, http):
+    with self._lock:
+      for fault in self.faults:
+        if (fault.kind in Fault.HTTP_KINDS) != http:
+          continue
+        if fault.matches(self._rnd, path, method):
+          fault.injected += 1
+          return fault
+    return None
+
+  def _sliver (self, slice_urn):
+    with self._lock:
+      return self._slices.get(slice_urn)
+
+  def _delete (self, slice_urn):
+    with self._lock:
+      return self._slices.pop(slice_urn, None)
+
+  def _allocate (self, slice_urn, rspec, users):
+    if isinstance(rspec, xmlrpclib.Binary):
+      rspec = rspec.data
+    if not isinstance(rspec, bytes):
+      rspec = rspec.encode("utf-8")
+    root = ET.fromstring(rspec, ET.XMLParser(huge_tree = True))
+    root.set("type", "manifest")
+    # Like real aggregates, point the manifest at the manifest schema
+    loc = root.get("{%s}schemaLocation" % (XSI_NS))
+    if loc:
+      root.set("{%s}schemaLocation" % (XSI_NS), loc.replace("%s/request.xsd" % (GENI_NS), "%s/manifest.xsd" % (GENI_NS)))
+    cmid = "urn:publicid:IDN+%s+authority+cm" % (AUTHORITY)
+    expires = (datetime.datetime.utcnow() + datetime.timedelta(hours = 6)).strftime(DATE_FMT)
+    root.set("expires", expires)
+
+    usernames = [u["urn"].split("+")[-1] for u in users if isinstance(u, dict) and "urn" in u] or ["tester"]
+    slivers = []
+    intf_slivers = {}
+
+    def sliverid (kind):
+      return "urn:publicid:IDN+%s+sliver+%s%d" % (AUTHORITY, kind, next(self._ids))
+
+    for (nidx, node) in enumerate(root.iterfind("{%s}node" % (GENI_NS))):
+      sid = sliverid("n")
+      slivers.append(sid)
+      node.set("sliver_id", sid)
+      node.set("component_manager_id", cmid)
+      if node.get("component_id") is None:
+        node.set("component_id", "urn:publicid:IDN+%s+node+pc%d" % (AUTHORITY, nidx))
+      hostname = "%s.%s" % (node.get("client_id"), AUTHORITY)
+      host = ET.SubElement(node, "{%s}host" % (GENI_NS))
+      host.set("name", hostname)
+      host.set("ipv4", "10.%d.%d.%d" % ((nidx >> 16) & 255, (nidx >> 8) & 255, nidx & 255))
+      svcs = node.find("{%s}services" % (GENI_NS))
+      if svcs is None:
+        svcs = ET.SubElement(node, "{%s}services" % (GENI_NS))
+      for uname in usernames:
+        login = ET.SubElement(svcs, "{%s}login" % (GENI_NS))
+        login.set("authentication", "ssh-keys")
+        login.set("hostname", hostname)
+        login.set("port", "22")
+        login.set("username", uname)
+      for (iidx, intf) in enumerate(node.iterfind("{%s}interface" % (GENI_NS))):
+        intf.set("sliver_id", sliverid("i"))
+        intf_slivers[intf.get("client_id")] = intf.get("sliver_id")
+        intf.set("component_id", "%s:eth%d" % (node.get("component_id"), iidx + 1))
+        intf.set("mac_address", "02%010x" % ((nidx << 8) + iidx))
+
+    for link in root.iterfind("{%s}link" % (GENI_NS)):
+      sid = sliverid("l")
+      slivers.append(sid)
+      link.set("sliver_id", sid)
+      link.set("vlantag", str(256 + (next(self._ids) % 3800)))
+      for ref in link.iterfind("{%s}interface_ref" % (GENI_NS)):
+        if ref.get("client_id") in intf_slivers:
+          ref.set("sliver_id", intf_slivers[ref.get("client_id")])
+
+    sliver = _Sliver(ET.tostring(root, xml_declaration = True, encoding = "UTF-8"), slivers, expires)
+    with self._lock:
+      self._slices[slice_urn] = sliver
+    return sliver
+
+
+class FakeFramework(CHAPI2):
+  """CH API v2 framework bound to a :py:class:`FakeAMServer`."""
+
+  def __init__ (self, server):
+    super(FakeFramework, self).__init__("fake-ch")
+    self._authority = AUTHORITY
+    self._ch = server.url(SA_PATH)
+    self._sa = server.url(SA_PATH)
+    self._ma = server.url(MA_PATH)
+    self.cert = server.cert
+    self.key = server.key
+
+  @property
+  def projecturn (self):
+    return self.projectNameToURN(self.project)
+
+  def projectNameToURN (self, name):
+    return "urn:publicid:IDN+%s+project+%s" % (AUTHORITY, name)
+
+  def sliceNameToURN (self, name, project = None):
+    if not project:
+      project = self.project
+    return "urn:publicid:IDN+%s:%s+slice+%s" % (AUTHORITY, project, name)
@@ -9,12 +9,11 @@ from __future__ import absolute_import, print_function
 
 import datetime
 import json
-import multiprocessing as MP
 import os
 import os.path
+import pickle
 import shutil
 import subprocess
-import tempfile
 import time
 import traceback as tb
 import zipfile
@@ -47,8 +46,7 @@ def _corelogininfo (manifest):
 
   linfo = []
   if isinstance(manifest, PGM):
-    for node in manifest.nodes:
-      linfo.extend([(node.client_id, x.username, x.hostname, x.port) for x in node.logins])
+    linfo = manifest.logins
   elif isinstance(manifest, VTSM):
     for container in manifest.containers:
       linfo.extend([(container.client_id, x.username, x.hostname, x.port) for x in container.logins])
@@ -72,93 +70,208 @@ requested from the given aggregate."""
     print("[%s][%s] %s: %d" % (line[0], line[1], line[2], line[3]))
 
 
-# You can't put very much information in a queue before you hang your OS
-# trying to write to the pipe, so we only write the paths and then load
-# them again on the backside
-def _mp_get_manifest (context, site, slc, q):
+class SiteTimeoutError(Exception):
+  def __init__ (self, site, timeout):
+    super(SiteTimeoutError, self).__init__()
+    self.site = site
+    self.timeout = timeout
+
+  def __str__ (self):
+    return "Aggregate %s did not finish within %s seconds" % (self.site.name, self.timeout)
+
+
+class WorkerError(Exception):
+  """Stands in for an exception raised in a worker process that could not be sent back to
+  the parent as-is."""
+  def __init__ (self, exc_type, text):
+    super(WorkerError, self).__init__(exc_type, text)
+    self.exc_type = exc_type
+    self.text = text
+
+  def __str__ (self):
+    return "%s: %s" % (self.exc_type, self.text)
+
+
+_POLL_INTERVAL = 0.25
+_DEFAULT_MAX_WORKERS = 32
+
+def _iterExecute (tasks, max_workers, timeout, processes):
+  """Run `(key, site, func, args)` tasks on a bounded executor, yielding `(key, result_or_exception)` as
+  each task finishes.  `timeout` is measured per task from the time it starts running, not from
+  submission, so tasks queued behind `max_workers` are not penalized."""
+  import concurrent.futures as CF
+
+  if not tasks:
+    return
+
+  if max_workers is None:
+    max_workers = min(len(tasks), _DEFAULT_MAX_WORKERS)
+
+  if processes:
+    executor = CF.ProcessPoolExecutor(max_workers = max_workers)
+  else:
+    executor = CF.ThreadPoolExecutor(max_workers = max_workers)
+
   try:
-    # Don't use geni.tempfile here - we don't want them deleted when the child process ends
-    # TODO: tempfiles should get deleted when the parent process picks them back up
-    mf = site.listresources(context, slc)
-    tf = tempfile.NamedTemporaryFile(delete=False)
-    tf.write(mf.text)
-    path = tf.name
-    tf.close()
-    q.put((site.name, slc, path))
-  except ListResourcesError:
-    q.put((site.name, slc, None))
-  except Exception:
-    tb.print_exc()
-    q.put((site.name, slc, None))
-
-def getManifests (context, ams, slices):
+    futures = {}
+    sites = {}
+    for (key, site, func, args) in tasks:
+      fut = executor.submit(func, *args)
+      futures[fut] = key
+      sites[fut] = site
+
+    started = {}
+    pending = set(futures)
+    while pending:
+      (done, pending) = CF.wait(pending, timeout = _POLL_INTERVAL if timeout else None,
+                                return_when = CF.FIRST_COMPLETED)
+      for fut in done:
+        exc = fut.exception()
+        if exc is not None:
+          yield (futures[fut], exc)
+        else:
+          yield (futures[fut], fut.result())
+
+      if timeout:
+        now = time.time()
+        for fut in list(pending):
+          if fut not in started:
+            if fut.running():
+              started[fut] = now
+          elif (now - started[fut]) > timeout:
+            # We can't interrupt a running call, but we stop waiting on it
+            pending.discard(fut)
+            fut.cancel()
+            yield (futures[fut], SiteTimeoutError(sites[fut], timeout))
+  finally:
+    for fut in futures:
+      fut.cancel()
+    executor.shutdown(wait = False)
+
+
+# Process pool workers return the manifest itself; its pickled form carries the parsed
+# node/link/login records and the compressed document, so the parent doesn't re-parse it
+def _get_manifest (context, site, slc):
+  return site.listresources(context, slc)
+
+def _mp_get_manifest (context, site, slc):
+  # Exceptions are returned rather than raised: one that fails to unpickle in the parent
+  # would break the process pool and lose the results of every other site
+  try:
+    return _get_manifest(context, site, slc)
+  except Exception as e: # pylint: disable=broad-except
+    try:
+      pickle.loads(pickle.dumps(e))
+    except Exception: # pylint: disable=broad-except
+      e = WorkerError("%s.%s" % (type(e).__module__, type(e).__name__), str(e))
+    return e
+
+def iterManifests (context, ams, slices, max_workers = None, timeout = None, processes = False):
+  """Fetch manifests for all provided slices at all the provided sites in parallel, yielding
+`(site_object, slice_name, manifest_or_exception)` tuples in completion order.
+
+Args:
+  context: geni-lib context
+  ams (list): Aggregate objects to query
+  slices (list): Slice names
+  max_workers (int): Maximum number of concurrent requests (defaults to the number of requests, up to 32)
+  timeout (float): Per-request time limit in seconds, measured from when the request starts.  Requests
+    that run over yield a :py:class:`SiteTimeoutError`.
+  processes (bool): Use a process pool instead of threads.  Exceptions that can not be pickled
+    are returned as :py:class:`WorkerError`."""
+
+  func = _mp_get_manifest if processes else _get_manifest
+  tasks = []
+  for site in ams:
+    for slc in slices:
+      tasks.append(((site, slc), site, func, (context, site, slc)))
+
+  for ((site, slc), res) in _iterExecute(tasks, max_workers, timeout, processes):
+    yield (site, slc, res)
+
+def getManifests (context, ams, slices, max_workers = None, timeout = None, processes = False):
   """Returns a two-level dictionary of the form:
 ::
   {slice_name : { site_object : manifest_object, ... }, ...}
 
 Containing the manifests for all provided slices at all the provided
 sites.  Requests are made in parallel and the function blocks until the
-slowest site returns (or times out)."""
-
-  sitemap = {}
-  for am in ams:
-    sitemap[am.name] = am
+slowest site returns (or times out).  Sites that return an error are
+omitted.  Arguments are as for :py:func:`iterManifests`."""
 
-  q = MP.Queue()
-  for site in ams:
-    for slc in slices:
-      p = MP.Process(target=_mp_get_manifest, args=(context, site, slc, q))
-      p.start()
+  d = {}
+  for (site, slc, res) in iterManifests(context, ams, slices, max_workers, timeout, processes):
+    if isinstance(res, Exception):
+      if not isinstance(res, (ListResourcesError, SiteTimeoutError)):
+        tb.print_exception(type(res), res, res.__traceback__)
+      continue
+    d.setdefault(slc, {})[site] = res
 
-  while MP.active_children():
-    time.sleep(0.5)
+  return d
 
-  d = {}
-  while not q.empty():
-    (site,slc,mpath) = q.get()
 
-    if mpath:
-      am = sitemap[site]
-      data = open(mpath).read()
-      mf = am.amtype.parseManifest(data)
-      d.setdefault(slc, {})[sitemap[site]] = mf
+def _get_advertisement (context, site, cache = None, max_age = None):
+  if cache:
+    return site.listresources(context, cache = cache, max_age = max_age)
+  return site.listresources(context)
 
-  return d
+def iterAdvertisements (context, ams, max_workers = None, timeout = None, cache = None, max_age = None):
+  """Fetch advertisements for all the requested aggregates in parallel, yielding
+`(site_object, advertisement_or_exception)` tuples as each site finishes.
 
+Args:
+  context: geni-lib context
+  ams (list): Aggregate objects to query
+  max_workers (int): Maximum number of concurrent requests (defaults to the number of sites, up to 32)
+  timeout (float): Per-site time limit in seconds, measured from when the request starts.  Sites
+    that run over yield a :py:class:`SiteTimeoutError`.
+  cache (str): Advertisement cache policy, as for :py:meth:`geni.aggregate.core.AM.listresources`
+  max_age (int): Maximum age in seconds of cached advertisements"""
 
-def _mp_get_advertisement (context, site, q):
-  try:
-    ad = site.listresources(context)
-    q.put((site.name, ad))
-  except Exception:
-    q.put((site.name, None))
+  tasks = [(site, site, _get_advertisement, (context, site, cache, max_age)) for site in ams]
+  for (site, res) in _iterExecute(tasks, max_workers, timeout, False):
+    yield (site, res)
 
-def getAdvertisements (context, ams):
+def getAdvertisements (context, ams, max_workers = None, timeout = None, cache = None, max_age = None):
   """Returns a dictionary of the form:
 ::
-  { site_object : advertisement_object, ...}
+  { site_name : advertisement_object, ...}
 
 Containing the advertisements for all the requested aggregates.  Requests
 are made in parallel and the function blocks until the slowest site
-returns (or times out).
+returns (or times out).  Sites that fail map to `None`.  Arguments are as
+for :py:func:`iterAdvertisements`."""
 
-.. warning::
-  Particularly large advertisements may break the shared memory queue
-  used by this function."""
+  d = {}
+  for (site, res) in iterAdvertisements(context, ams, max_workers, timeout, cache, max_age):
+    if isinstance(res, Exception):
+      res = None
+    d[site.name] = res
 
+  return d
 
-  q = MP.Queue()
-  for site in ams:
-    p = MP.Process(target=_mp_get_advertisement, args=(context, site, q))
-    p.start()
 
-  while MP.active_children():
-    time.sleep(0.5)
+def iterAvailabilitySummaries (context, ams, max_workers = None, timeout = None):
+  """Fetch availability summaries (see :py:meth:`geni.aggregate.core.AM.availabilitySummary`) for
+all the requested aggregates in parallel, yielding `(site_object, summary_or_exception)` tuples as
+each site finishes.  Arguments are as for :py:func:`iterAdvertisements`."""
+
+  tasks = [(site, site, site.availabilitySummary, (context,)) for site in ams]
+  for (site, res) in _iterExecute(tasks, max_workers, timeout, False):
+    yield (site, res)
+
+def getAvailabilitySummaries (context, ams, max_workers = None, timeout = None):
+  """Returns a dictionary of the form:
+::
+  { site_name : summary_object, ...}
+
+Sites that fail map to `None`.  Arguments are as for :py:func:`iterAdvertisements`."""
 
   d = {}
-  while not q.empty():
-    (site,ad) = q.get()
-    d[site] = ad
+  for (site, res) in iterAvailabilitySummaries(context, ams, max_workers, timeout):
+    if isinstance(res, Exception):
+      res = None
+    d[site.name] = res
 
   return d
 
@@ -224,11 +337,8 @@ def builddot (manifests):
 
   for manifest in manifests:
     if isinstance(manifest, PGM):
-      intf_map = {}
       for node in manifest.nodes:
         dda("\"%s\" [label = \"%s\"]" % (node.sliver_id, node.name))
-        for interface in node.interfaces:
-          intf_map[interface.sliver_id] = (node, interface)
 
       for link in manifest.links:
         label = link.client_id
@@ -241,10 +351,10 @@ def builddot (manifests):
         dda("\"%s\" [label=\"%s\",shape=doublecircle,fontsize=11.0]" % (name, label))
 
         for ref in link.interface_refs:
+          (node, interface) = manifest.interfaceBySliverID(ref)
           dda("\"%s\" -> \"%s\" [taillabel=\"%s\"]" % (
-            intf_map[ref][0].sliver_id, name,
-            intf_map[ref][1].component_id.split(":")[-1]))
-          dda("\"%s\" -> \"%s\"" % (name, intf_map[ref][0].sliver_id))
+            node.sliver_id, name, interface.component_id.split(":")[-1]))
+          dda("\"%s\" -> \"%s\"" % (name, node.sliver_id))
 
 
     elif isinstance(manifest, VTSM.Manifest):
@@ -30,6 +30,8 @@ setup(name = 'geni-lib',
       long_description = open("README.rst", "r").read(),
       packages = pkgs,
       package_dir = {'geni' : 'geni', 'ccloud' : 'ccloud'},
+      package_data = {'geni.rspec' : ['schemas/www.geni.net/resources/rspec/3/*.xsd',
+                                      'schemas/www.geni.net/resources/rspec/ext/*/*/*.xsd']},
       pymodules = ['genish'],
       scripts = ['tools/buildcontext/context-from-bundle',
                  'tools/buildcontext/build-context',
@@ -0,0 +1,37 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+from geni.minigcf import config
+from geni.minigcf import util as MU
+from geni.support import fakeam
+
+
+@pytest.fixture(autouse = True)
+def httpconfig ():
+  """Restores the global MiniGCF configuration, and drops pooled sessions, after each test."""
+  saved = dict([(k, getattr(config.HTTP, k)) for k in dir(config.HTTP) if k.isupper()])
+  for (k, v) in saved.items():
+    if isinstance(v, list):
+      setattr(config.HTTP, k, list(v))
+  yield config.HTTP
+  for (k, v) in saved.items():
+    setattr(config.HTTP, k, v)
+  MU.drainSessions()
+
+@pytest.fixture
+def server ():
+  with fakeam.FakeAMServer(nodes = 20, links = 5) as srv:
+    yield srv
+
+@pytest.fixture
+def context (server):
+  return server.makeContext()
+
+@pytest.fixture
+def am (server):
+  return server.aggregate()
@@ -0,0 +1,72 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import threading
+
+import pytest
+
+import geni.util
+from geni.aggregate import cache as ADC
+from geni.aggregate.protogeni import PGCompute
+
+
+def _calls (server):
+  return server.calls.get("ListResources", 0)
+
+def _nodes (ad):
+  return sorted([n.component_id for n in ad.nodes])
+
+def test_store_load (context, am):
+  cache = ADC.AdvertisementCache(context)
+  assert cache.load(am, False) is None
+  assert cache.store(am, False, {"nodes" : [1, 2]}, "abc")
+  assert cache.load(am, False) == {"nodes" : [1, 2]}
+  assert cache.digest(am, False) == "abc"
+  assert cache.load(am, True) is None
+  os.utime(cache._entryPath(am, False), (0, 0))
+  assert cache.load(am, False, max_age = 60) is None
+  cache.clear()
+  assert cache.digest(am, False) is None
+
+def test_unpicklable (context, am):
+  cache = ADC.AdvertisementCache(context)
+  assert not cache.store(am, False, threading.Lock())
+  assert not os.path.exists(cache.path)
+
+def test_failed_write_leaves_no_tmp (context, am, monkeypatch):
+  cache = ADC.AdvertisementCache(context)
+  def fail (src, dst):
+    raise OSError("disk full")
+  monkeypatch.setattr(ADC.os, "replace", fail)
+  with pytest.raises(OSError):
+    cache.store(am, False, {"a" : 1})
+  assert os.listdir(cache.path) == []
+
+def test_listresources_cache (server, context, am):
+  ad = am.listresources(context, cache = ADC.USE)
+  assert _calls(server) == 1
+  assert _nodes(am.listresources(context, cache = ADC.USE)) == _nodes(ad)
+  assert _calls(server) == 1
+
+  # A refresh that returns the same document revalidates the entry
+  assert _nodes(am.listresources(context, cache = ADC.REFRESH)) == _nodes(ad)
+  assert _calls(server) == 2
+
+  # ...and a stale entry is re-fetched
+  cache = ADC.AdvertisementCache(context)
+  os.utime(cache._entryPath(am, False), (0, 0))
+  am.listresources(context, cache = ADC.USE, max_age = 60)
+  assert _calls(server) == 3
+
+def test_concurrent_store (server, context):
+  ams = [PGCompute("fake-%d" % (x), "127.0.0.1", "urn:publicid:IDN+fake-%d+authority+cm" % (x),
+                   url = server.url()) for x in range(8)]
+  res = geni.util.getAdvertisements(context, ams, max_workers = 8, cache = ADC.REFRESH)
+  assert sorted(res.keys()) == sorted([am.name for am in ams])
+  assert None not in res.values()
+  cache = ADC.AdvertisementCache(context)
+  assert len(os.listdir(cache.path)) == len(ams)
@@ -0,0 +1,88 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+
+import geni.rspec.pg as pg
+from geni.aggregate import apis
+from geni.aggregate.pgutil import ProtoGENIError
+from geni.minigcf import amapi3 as AM3
+from geni.minigcf.aio import amapi3 as AAM3
+from geni.support import fakeam
+
+
+@pytest.fixture
+def url (server):
+  return server.url(fakeam.AM3_PATH)
+
+def _request ():
+  req = pg.Request()
+  req.addNodes(2)
+  return req
+
+def _allocate (context, url, sname):
+  apis.AMAPIv3.allocate(context, url, sname, _request().toXMLString())
+  return context.getSliceInfo(sname).urn
+
+def _delete (mode, *args):
+  if mode == "sync":
+    return apis.AMAPIv3.delete(*args)
+  return asyncio.run(apis.AMAPIv3.adelete(*args))
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_delete (context, url, mode):
+  urn = _allocate(context, url, "slc")
+  res = _delete(mode, context, url, "slc", urn)
+  assert res["code"]["geni_code"] == 0
+
+  # ProtoGENI aggregates raise their own error type either way
+  with pytest.raises(ProtoGENIError):
+    _delete(mode, context, url, "slc", urn)
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_delete_error_class (context, url, mode, monkeypatch):
+  res = {"code" : {"geni_code" : 2}, "value" : None, "output" : "refused"}
+  def fail (*args):
+    return res
+  async def afail (*args):
+    return res
+  monkeypatch.setattr(AM3, "delete", fail)
+  monkeypatch.setattr(AAM3, "delete", afail)
+
+  with pytest.raises(apis.DeleteError) as exc:
+    _delete(mode, context, url, "slc", "urn:publicid:IDN+fake+sliver+1")
+  assert isinstance(exc.value, apis.ProvisionError)
+  assert exc.value.text == "refused"
+
+def test_async_lifecycle (context, am):
+  async def run ():
+    gv = await am.agetversion(context)
+    (ad, cad) = await asyncio.gather(am.alistresources(context), am.alistresources(context, compressed = True))
+    manifest = await am.acreatesliver(context, "aslc", _request())
+    status = await am.asliverstatus(context, "aslc")
+    listed = await am.alistresources(context, "aslc")
+    await am.adeletesliver(context, "aslc")
+    return (gv, ad, cad, manifest, status, listed)
+
+  (gv, ad, cad, manifest, status, listed) = asyncio.run(run())
+  assert gv == am.getversion(context)
+  nodes = sorted([n.component_id for n in am.listresources(context).nodes])
+  assert sorted([n.component_id for n in ad.nodes]) == nodes
+  assert sorted([n.component_id for n in cad.nodes]) == nodes
+  assert [n.client_id for n in manifest.nodes] == ["node-0", "node-1"]
+  assert status["pg_status"] == "ready"
+  assert [n.client_id for n in listed.nodes] == ["node-0", "node-1"]
+  with pytest.raises(ProtoGENIError):
+    am.sliverstatus(context, "aslc")
+
+def test_async_matches_sync_errors (context, am):
+  with pytest.raises(ProtoGENIError) as sync:
+    am.sliverstatus(context, "missing")
+  with pytest.raises(ProtoGENIError) as coro:
+    asyncio.run(am.asliverstatus(context, "missing"))
+  assert str(coro.value) == str(sync.value)
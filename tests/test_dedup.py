@@ -0,0 +1,126 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+
+import geni.rspec.pg as pg
+from geni.aggregate import cache as ADC
+from geni.rspec import canonicalXML
+
+
+def _request (count = 2, hwtype = "d430"):
+  req = pg.Request()
+  req.addNodes(count, hardware_type = hwtype)
+  return req
+
+DOC_A = (b'<r xmlns="urn:a" xmlns:x="urn:x" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+         b' xsi:schemaLocation="urn:a a.xsd urn:b b.xsd" id="1" type="t"><n/></r>')
+DOC_B = (b'<r xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns="urn:a" type="t" id="1"'
+         b' xsi:schemaLocation="urn:b b.xsd urn:a a.xsd"><n></n></r>')
+
+def test_canonical_xml ():
+  assert canonicalXML(DOC_A) == canonicalXML(DOC_B)
+  assert canonicalXML(DOC_A.decode("utf-8")) == canonicalXML(DOC_A)
+  assert b"urn:x" not in canonicalXML(DOC_A)
+  assert canonicalXML(DOC_A) != canonicalXML(DOC_A.replace(b'id="1"', b'id="2"'))
+
+def test_request_digest (tmp_path):
+  req = _request()
+  digest = req.digest()
+  assert digest == _request().digest()
+  assert digest != _request(hwtype = "m510").digest()
+  assert len(req.digest("sha1")) == 40
+
+  path = tmp_path / "req.xml"
+  path.write_bytes(req.toXMLString())
+  assert ADC.requestDigest(req) == digest
+  assert ADC.requestDigest(str(path)) == digest
+  assert ADC.requestDigest(req.toXMLString(ucode = True)) == digest
+
+def test_request_cache_ttl (am, monkeypatch):
+  rc = ADC.RequestCache(ttl = 10)
+  now = [1000.0]
+  monkeypatch.setattr(ADC.time, "time", lambda: now[0])
+  rc.store(am, "slc", "createsliver", "d1", "manifest")
+  assert rc.lookup(am, "slc", "createsliver", "d1") == "manifest"
+  assert rc.lookup(am, "slc", "createsliver", "d2") is None
+  assert rc.lookup(am, "other", "createsliver", "d1") is None
+  now[0] += 11
+  assert rc.lookup(am, "slc", "createsliver", "d1") is None
+  assert len(rc) == 0
+
+def test_createsliver_dedup (server, context, am):
+  am.enableRequestDedup()
+  first = am.createsliver(context, "slc", _request())
+  assert am.createsliver(context, "slc", _request()) is first
+  assert server.calls["CreateSliver"] == 1
+
+  am.createsliver(context, "slc", _request(hwtype = "m510"))
+  assert server.calls["CreateSliver"] == 2
+  am.createsliver(context, "other", _request(hwtype = "m510"))
+  assert server.calls["CreateSliver"] == 3
+
+def test_deletesliver_invalidates (server, context, am):
+  am.enableRequestDedup()
+  am.createsliver(context, "slc", _request())
+  am.deletesliver(context, "slc")
+  am.createsliver(context, "slc", _request())
+  assert server.calls["CreateSliver"] == 2
+
+def test_dedup_disabled (server, context, am):
+  am.createsliver(context, "slc", _request())
+  am.createsliver(context, "slc", _request())
+  assert server.calls["CreateSliver"] == 2
+
+  am.enableRequestDedup()
+  am.createsliver(context, "slc", _request())
+  am.disableRequestDedup()
+  am.createsliver(context, "slc", _request())
+  assert server.calls["CreateSliver"] == 4
+
+def test_failed_request_not_cached (server, context, am):
+  from geni.aggregate.pgutil import ProtoGENIError
+  from geni.support import fakeam
+
+  am.enableRequestDedup()
+  fault = fakeam.Fault("amerror", method = "CreateSliver", count = 1)
+  server.faults.append(fault)
+  with pytest.raises(ProtoGENIError):
+    am.createsliver(context, "slc", _request())
+  assert fault.injected == 1
+  am.createsliver(context, "slc", _request())
+  am.createsliver(context, "slc", _request())
+  assert server.calls["CreateSliver"] == 1
+
+def test_shared_cache_file_request (server, context, tmp_path):
+  rc = ADC.RequestCache()
+  am1 = server.aggregate("am1")
+  am2 = server.aggregate("am2")
+  assert am1.enableRequestDedup(rc) is rc
+  am2.enableRequestDedup(rc)
+
+  path = tmp_path / "req.xml"
+  path.write_bytes(_request().toXMLString())
+  am1.createsliver(context, "slc", str(path))
+  am2.createsliver(context, "slc", _request())
+  # Both aggregates share a URL, so the second request is answered from the cache
+  assert server.calls["CreateSliver"] == 1
+  assert len(rc) == 1
+
+def test_acreatesliver_dedup (server, context, am):
+  async def run ():
+    first = await am.acreatesliver(context, "slc", _request())
+    second = await am.acreatesliver(context, "slc", _request())
+    await am.adeletesliver(context, "slc")
+    await am.acreatesliver(context, "slc", _request())
+    return (first, second)
+
+  am.enableRequestDedup()
+  (first, second) = asyncio.run(run())
+  assert second is first
+  assert server.calls["CreateSliver"] == 2
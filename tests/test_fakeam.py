@@ -0,0 +1,69 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from six.moves import xmlrpc_client as xmlrpclib
+import pytest
+import requests
+
+import geni.rspec.pgad as pgad
+from geni.aggregate.pgutil import ProtoGENIError, ResourceBusyError
+from geni.support import fakeam
+
+
+def test_advertisement ():
+  ad = pgad.Advertisement(xml = fakeam.makeAdvertisement(nodes = 10, links = 3, seed = 1))
+  assert len(list(ad.nodes)) == 10
+  assert len(list(ad.links)) == 3
+  avail = pgad.Advertisement(xml = fakeam.makeAdvertisement(nodes = 10, links = 3, seed = 1, available_only = True))
+  names = set([n.component_id for n in ad.nodes if n.available])
+  assert set([n.component_id for n in avail.nodes]) == names
+  assert fakeam.makeAdvertisement(nodes = 10, seed = 1) == fakeam.makeAdvertisement(nodes = 10, seed = 1)
+
+def test_call_counts (server, context, am):
+  am.listresources(context)
+  am.listresources(context)
+  assert server.calls["ListResources"] == 2
+  server.resetStats()
+  assert server.calls == {}
+
+@pytest.mark.parametrize("kind, exc", [("busy", ResourceBusyError), ("error", ProtoGENIError),
+                                       ("fault", xmlrpclib.Fault), ("http503", requests.exceptions.HTTPError),
+                                       ("drop", requests.exceptions.ConnectionError)])
+def test_faults (server, context, am, kind, exc):
+  am.getversion(context)
+  server.faults.append(fakeam.Fault(kind, method = "ListResources", path = fakeam.AM2_PATH, count = 1))
+  with pytest.raises(exc):
+    am.listresources(context)
+  # The rule is used up
+  assert len(am.listresources(context).nodes) == 20
+
+def test_hang (server, context, am, httpconfig):
+  am.getversion(context)
+  httpconfig.TIMEOUT = 0.2
+  server.faults.append(fakeam.Fault("hang", count = 1, delay = 1.0))
+  with pytest.raises(requests.exceptions.ReadTimeout):
+    am.getversion(context, refresh = True)
+
+def test_fault_filters (server, context, am):
+  server.faults.append(fakeam.Fault("error", method = "SliverStatus"))
+  server.faults.append(fakeam.Fault("error", path = fakeam.AM3_PATH))
+  server.faults.append(fakeam.Fault("error", rate = 0.0))
+  assert len(am.listresources(context).nodes) == 20
+  with pytest.raises(ProtoGENIError):
+    am.sliverstatus(context, "slc")
+  assert server.faults[0].injected == 1
+  assert server.faults[1].injected == 0
+  assert server.faults[2].injected == 0
+
+def test_latency (server, context, am, httpconfig):
+  seen = []
+  httpconfig.POST_CALL_HOOKS.append(seen.append)
+  server.latency = lambda method: 0.2 if method == "GetVersion" else 0
+  am.getversion(context)
+  am.listresources(context)
+  times = dict([(info.method, info.timings["total"]) for info in seen])
+  assert times["GetVersion"] >= 0.2
+  assert times["ListResources"] < 0.2
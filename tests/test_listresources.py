@@ -0,0 +1,141 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import base64
+import gzip
+import zlib
+
+from six.moves import xmlrpc_client as xmlrpclib
+import pytest
+
+import geni.rspec.pg as pg
+from geni.minigcf import util as MU
+
+DOC = b"<rspec xmlns=\"http://www.geni.net/resources/rspec/3\" type=\"advertisement\"/>"
+
+
+@pytest.fixture
+def options (httpconfig):
+  seen = []
+  def hook (info):
+    if info.method == "ListResources":
+      seen.append(xmlrpclib.loads(info.request)[0][-1])
+  httpconfig.PRE_CALL_HOOKS.append(hook)
+  return seen
+
+def _nodes (rspec):
+  return sorted([n.component_id for n in rspec.nodes])
+
+@pytest.mark.parametrize("value", [base64.b64encode(zlib.compress(DOC)).decode("ascii"),
+                                   base64.b64encode(gzip.compress(DOC)).decode("ascii"),
+                                   xmlrpclib.Binary(zlib.compress(DOC))])
+def test_decompress (value):
+  assert MU.decompress(value) == DOC
+
+def test_compressed_advertisement (context, am, options):
+  plain = am.listresources(context)
+  assert am.compression is None
+  compressed = am.listresources(context, compressed = True)
+  assert am.compression is True
+  assert _nodes(compressed) == _nodes(plain)
+  assert [opts["geni_compressed"] for opts in options] == [False, True]
+
+def test_compressed_manifest (context, am):
+  req = pg.Request()
+  req.addNodes(3)
+  am.createsliver(context, "slc", req)
+  manifest = am.listresources(context, "slc", compressed = True)
+  assert [n.client_id for n in manifest.nodes] == ["node-0", "node-1", "node-2"]
+
+def test_compression_unsupported (context, am, options):
+  am.compression = False
+  am.listresources(context, compressed = True)
+  assert options[0]["geni_compressed"] is False
+
+@pytest.mark.parametrize("gv, expected", [({"geni_api" : 2}, True), ({"geni_api" : 1}, False),
+                                          ({"geni_api" : 3, "geni_compressed" : False}, False),
+                                          ({"geni_api" : "x"}, False), ({}, False)])
+def test_version_supports_compression (gv, expected):
+  from geni.aggregate.core import AM
+  assert AM._versionSupportsCompression(gv) == expected
+
+def _parse (body, compressed = False, chunk = 7, parser_factory = None):
+  parser = MU._StreamingResponseParser(compressed, parser_factory)
+  for idx in range(0, len(body), chunk):
+    parser.feed(body[idx:idx + chunk])
+  return parser.close()
+
+def _response (value, **members):
+  res = {"code" : {"geni_code" : 0}, "output" : ""}
+  res.update(members)
+  res["value"] = value
+  return xmlrpclib.dumps((res,), methodresponse = True).encode("utf-8")
+
+SAMPLE = "<?xml version='1.0'?>\n<rspec xmlns=\"http://www.geni.net/resources/rspec/3\">" \
+         "<node component_id=\"a &amp; b\"/>\n<node component_id=\"\xe9\"/></rspec>"
+
+def _ids (root):
+  return [n.get("component_id") for n in root]
+
+@pytest.mark.parametrize("chunk", [1, 7, 4096])
+def test_stream_document (chunk):
+  res = _parse(_response(SAMPLE, extra = [1, {"x" : "y"}]), chunk = chunk)
+  assert res["code"] == {"geni_code" : 0}
+  assert res["extra"] == [1, {"x" : "y"}]
+  assert res["value"].tag == "{http://www.geni.net/resources/rspec/3}rspec"
+  assert _ids(res["value"]) == ["a & b", "\xe9"]
+
+def test_stream_compressed ():
+  value = base64.encodebytes(zlib.compress(SAMPLE.encode("utf-8"))).decode("ascii")
+  res = _parse(_response(value), compressed = True)
+  assert _ids(res["value"]) == ["a & b", "\xe9"]
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_stream_error_message (compressed):
+  res = _parse(_response("No such slice here: urn:x", code = {"geni_code" : 12}), compressed = compressed)
+  assert res["value"] == "No such slice here: urn:x"
+  assert res["code"]["geni_code"] == 12
+
+def test_stream_implicit_string ():
+  body = _response(SAMPLE).replace(b"<string>", b"").replace(b"</string>", b"")
+  res = _parse(body)
+  assert _ids(res["value"]) == ["a & b", "\xe9"]
+  assert res["output"] == ""
+
+def test_stream_member_order ():
+  body = (b"<?xml version='1.0'?><methodResponse><params><param><value><struct>"
+          b"<member><name>value</name><value><string>&lt;rspec/&gt;</string></value></member>"
+          b"<member><name>output</name><value><string>ok</string></value></member>"
+          b"</struct></value></param></params></methodResponse>")
+  res = _parse(body)
+  assert res["value"].tag == "rspec"
+  assert res["output"] == "ok"
+
+def test_stream_fault ():
+  body = xmlrpclib.dumps(xmlrpclib.Fault(2, "broken"), methodresponse = True).encode("utf-8")
+  with pytest.raises(xmlrpclib.Fault):
+    _parse(body)
+
+def test_stream_markup_in_string ():
+  body = _response("x").replace(b"<string>x</string>", b"<string><b/></string>")
+  with pytest.raises(xmlrpclib.ResponseError):
+    _parse(body)
+
+def test_stream_parser_factory ():
+  class Counter(object):
+    def __init__ (self, encoding):
+      self.size = 0
+    def feed (self, data):
+      self.size += len(data)
+    def close (self):
+      return self.size
+  assert _parse(_response(SAMPLE), parser_factory = Counter)["value"] == len(SAMPLE.encode("utf-8"))
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_listresources_stream (context, am, compressed):
+  plain = am.listresources(context)
+  streamed = am.listresources(context, compressed = compressed, stream = True)
+  assert _nodes(streamed) == _nodes(plain)
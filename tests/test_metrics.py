@@ -0,0 +1,67 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+import requests
+
+from geni.aggregate.protogeni import PGCompute
+from geni.minigcf.metrics import Histogram, MetricsCollector
+
+
+@pytest.fixture
+def calls (httpconfig):
+  seen = []
+  httpconfig.POST_CALL_HOOKS.append(seen.append)
+  return seen
+
+def test_connection_timings (context, am, calls):
+  am.listresources(context)
+  am.listresources(context)
+
+  # get_credentials (from the clearinghouse) opens the connection; later calls reuse it
+  first = calls[0]
+  assert first.new_connection
+  assert first.timings["dns"] > 0
+  assert first.timings["connect"] > 0
+  assert first.timings["tls"] > 0
+  assert first.timings["total"] >= first.timings["dns"] + first.timings["connect"] + first.timings["tls"]
+
+  last = calls[-1]
+  assert last.method == "ListResources"
+  assert not last.new_connection
+  assert (last.timings["dns"], last.timings["connect"], last.timings["tls"]) == (0.0, 0.0, 0.0)
+  assert last.timings["first_byte"] > 0
+  assert last.geni_code == 0
+
+def test_connection_failures (context, calls):
+  for url in ("https://127.0.0.1:1/protogeni/xmlrpc/am/2.0", "https://no-such-host.invalid/am/2.0"):
+    site = PGCompute("dead", "dead", "urn:publicid:IDN+dead+authority+cm", url = url)
+    with pytest.raises(requests.exceptions.ConnectionError):
+      site.getversion(context)
+    assert isinstance(calls[-1].error, requests.exceptions.ConnectionError)
+    assert calls[-1].new_connection
+
+def test_collector (context, am, httpconfig):
+  collector = MetricsCollector().install()
+  am.listresources(context)
+  am.listresources(context)
+  rows = dict([(row["method"], row) for row in collector.summary()])
+  assert rows["ListResources"]["count"] == 2
+  assert rows["get_credentials"]["new_connections"] == 1
+  assert set(rows["get_credentials"]["phases"]) == set(["dns", "connect", "tls", "first_byte"])
+  assert rows["get_credentials"]["phases"]["dns"] > 0
+  assert "ListResources" in collector.report()
+  collector.uninstall()
+  assert collector not in httpconfig.POST_CALL_HOOKS
+
+def test_histogram ():
+  h = Histogram((0.1, 1.0))
+  for v in (0.05, 0.5, 0.5, 2.0):
+    h.observe(v)
+  assert h.counts == [1, 2, 1]
+  assert (h.count, h.min, h.max) == (4, 0.05, 2.0)
+  assert h.mean == pytest.approx(0.7625)
+  assert 0.1 <= h.quantile(0.5) <= 1.0
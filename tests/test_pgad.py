@@ -0,0 +1,248 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+
+import pytest
+
+import geni.rspec.pgad as pgad
+import geni.util
+from geni.support import fakeam
+
+
+@pytest.fixture(scope = "module")
+def adxml ():
+  return fakeam.makeAdvertisement(nodes = 40, links = 10, seed = 3)
+
+@pytest.fixture
+def ad (adxml):
+  return pgad.Advertisement(xml = adxml)
+
+def test_nodes_memoized (ad):
+  nodes = ad.nodes
+  assert len(nodes) == 40
+  assert nodes[3] is ad.nodes[3]
+  assert [id(n) for n in ad.nodes] == [id(n) for n in ad.nodes]
+  assert nodes[-1] is nodes[39]
+  assert ad.links[0] is ad.links[0]
+
+def test_node_indexes (ad):
+  nodes = list(ad.nodes)
+  for node in nodes:
+    assert ad.nodeByID(node.component_id) is node
+    assert ad.nodeByName(node.name) is node
+  assert ad.nodeByID("urn:publicid:IDN+fake.geni+node+nope") is None
+  assert ad.nodeByName("nope") is None
+
+  hwtypes = set()
+  for node in nodes:
+    hwtypes.update(node.hardware_types)
+  assert ad.hardware_types == hwtypes
+  for hwtype in hwtypes:
+    assert ad.nodesWithHardware(hwtype) == [n for n in nodes if hwtype in n.hardware_types]
+  assert ad.nodesWithSliverType("raw-pc") == [n for n in nodes if "raw-pc" in n.sliver_types]
+  assert ad.nodesWithHardware("nope") == []
+
+  # Returned lists are copies
+  ad.nodesWithHardware("pc").append(None)
+  assert None not in ad.nodesWithHardware("pc")
+
+def test_link_index (ad):
+  for link in ad.links:
+    assert ad.linkByID(link.component_id) is link
+  assert ad.linkByID("nope") is None
+
+def test_images (ad):
+  images = list(ad.images)
+  assert len(images) == len(set(images)) == 3
+  assert set(images) == set(ad.nodes[0].images["raw-pc"])
+
+def test_table_lists (ad):
+  table = ad.toTable(label = "fake", arrays = False)
+  assert sorted(table.keys()) == sorted(pgad.TABLE_COLUMNS)
+  nodes = list(ad.nodes)
+  assert table["component_id"] == [n.component_id for n in nodes]
+  assert table["aggregate"] == ["fake"] * len(nodes)
+  assert table["available"] == [n.available for n in nodes]
+  assert table["raw_pc"] == ["raw-pc" in n.sliver_types for n in nodes]
+  assert table["latitude"][0] == nodes[0].location.latitude
+  assert table["hardware_types"][0] == tuple(nodes[0].hardware_types)
+
+  both = pgad.tableFromAdvertisements({"a" : ad, "b" : None, "c" : ad}, arrays = False)
+  assert len(both["name"]) == 2 * len(nodes)
+  assert sorted(set(both["aggregate"])) == ["a", "c"]
+  assert pgad.concatTables([])["name"] == []
+
+def test_table_numpy (ad):
+  np = pytest.importorskip("numpy")
+  table = ad.toTable(label = "fake")
+  lists = ad.toTable(label = "fake", arrays = False)
+  assert table["available"].dtype == bool
+  assert table["available"].sum() == sum(lists["available"])
+  assert list(table["component_id"]) == lists["component_id"]
+  assert np.isnan(table["ram"]).sum() == len([x for x in lists["ram"] if x is None])
+  assert len(pgad.concatTables([table, table])["name"]) == 2 * len(lists["name"])
+
+def test_table_numpy_required (ad):
+  try:
+    import numpy # pylint: disable=unused-import
+    pytest.skip("NumPy is installed")
+  except ImportError:
+    pass
+  assert isinstance(ad.toTable()["name"], list)
+  with pytest.raises(ImportError):
+    ad.toTable(arrays = True)
+
+def _nodeSummary (node):
+  return (node.component_id, node.name, node.available, node.exclusive, dict(node.hardware_types),
+          set(node.sliver_types), dict([(k, [i.name for i in v]) for (k, v) in node.images.items()]),
+          [i.component_id for i in node.interfaces], node.ram, node.cpu)
+
+@pytest.mark.parametrize("source", ["bytes", "text", "path"])
+def test_iternodes (ad, adxml, source, tmp_path):
+  if source == "bytes":
+    kw = {"xml" : adxml}
+  elif source == "text":
+    kw = {"xml" : adxml.decode("utf-8")}
+  else:
+    path = tmp_path / "ad.xml"
+    path.write_bytes(adxml)
+    kw = {"path" : str(path)}
+
+  nodes = list(pgad.Advertisement.iternodes(**kw))
+  assert [_nodeSummary(n) for n in nodes] == [_nodeSummary(n) for n in ad.nodes]
+  assert all([n._elem is None for n in nodes])
+
+  links = list(pgad.Advertisement.iterlinks(**kw))
+  assert [(l.component_id, l.interface_refs, l.link_types) for l in links] == \
+         [(l.component_id, l.interface_refs, l.link_types) for l in ad.links]
+
+def _counts (nodes):
+  counts = pgad.AvailabilityCounts()
+  for node in nodes:
+    counts._add(node.available, node.exclusive and "raw-pc" in node.sliver_types)
+  return counts
+
+def _countTuple (counts):
+  return (counts.total, counts.available, counts.raw_pc, counts.raw_pc_available)
+
+def _checkSummary (summary, ad):
+  nodes = list(ad.nodes)
+  assert _countTuple(summary.nodes) == _countTuple(_counts(nodes))
+  assert summary.available_raw_pcs == [n.component_id for n in nodes
+                                       if n.exclusive and n.available and "raw-pc" in n.sliver_types]
+  assert sorted(summary.hardware_types) == sorted(ad.hardware_types)
+  for (hwtype, counts) in summary.hardware_types.items():
+    assert _countTuple(counts) == _countTuple(_counts(ad.nodesWithHardware(hwtype)))
+
+@pytest.mark.parametrize("source", ["bytes", "text", "path"])
+def test_summarize_availability (ad, adxml, source, tmp_path):
+  if source == "bytes":
+    summary = pgad.summarizeAvailability(xml = adxml)
+  elif source == "text":
+    summary = pgad.summarizeAvailability(xml = adxml.decode("utf-8"))
+  else:
+    path = tmp_path / "ad.xml"
+    path.write_bytes(adxml)
+    summary = pgad.summarizeAvailability(path = str(path))
+  assert 0 < summary.nodes.raw_pc_available < summary.nodes.total
+  _checkSummary(summary, ad)
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_availability_summary (server, context, am, compressed):
+  summary = am.availabilitySummary(context, compressed = compressed)
+  _checkSummary(summary, am.listresources(context))
+  assert summary.available_raw_pcs == [n.component_id for n in geni.util.checkavailrawpc(context, am)]
+
+def test_slotted_nodes (ad):
+  node = ad.nodes[0]
+  assert not hasattr(node, "__dict__")
+  with pytest.raises(AttributeError):
+    node.colour = "red"
+  assert not hasattr(node.location, "__dict__")
+  # Repeated attribute values are shared
+  assert ad.nodes[0].component_manager_id is ad.nodes[1].component_manager_id
+
+def test_pickle_advertisement (ad):
+  copy = pickle.loads(pickle.dumps(ad))
+  assert copy._rootelem is None
+  assert [_nodeSummary(n) for n in copy.nodes] == [_nodeSummary(n) for n in ad.nodes]
+  assert all([n._elem is None for n in copy.nodes])
+  assert [l.component_id for l in copy.links] == [l.component_id for l in ad.links]
+  assert set(copy.images) == set(ad.images)
+  # Indexes are rebuilt from the pickled nodes, without touching the XML
+  assert copy.nodeByName(ad.nodes[5].name).component_id == ad.nodes[5].component_id
+  assert copy._rootelem is None
+  # XML-level access re-parses the compressed document
+  assert copy.text == ad.text
+
+def test_pickle_node (ad):
+  node = ad.nodes[2]
+  copy = pickle.loads(pickle.dumps(node))
+  assert _nodeSummary(copy) == _nodeSummary(node)
+  assert copy._elem is None
+  assert node._elem is not None
+
+def test_detach (ad):
+  before = [_nodeSummary(n) for n in ad.nodes]
+  nodes = list(ad.nodes)
+  assert ad.detach() is ad
+  assert ad._rootelem is None
+  assert [_nodeSummary(n) for n in ad.nodes] == before
+  assert all([n._elem is None for n in ad.nodes])
+  assert list(ad.nodes) == nodes
+  assert "component_name" in ad.text
+
+U16 = "urn:publicid:IDN+fake.geni+image+emulab-ops:UBUNTU16-64-STD"
+U20 = "urn:publicid:IDN+fake.geni+image+emulab-ops:UBUNTU20-64-STD"
+
+def test_image_identity (ad):
+  images = ad.nodes[0].images["raw-pc"]
+  same = ad.nodes[1].images["raw-pc"]
+  assert images[0] is not same[0]
+  assert images[0] == same[0]
+  assert hash(images[0]) == hash(same[0])
+  assert images[0] != images[1]
+  assert len(set(images + same)) == len(images)
+
+def _brute (ad, image, hwtype, stype):
+  nodes = [n for n in ad.nodes if hwtype in n.hardware_types and image in [i.name for i in n.images.get(stype, [])]]
+  return (len(nodes), len([n for n in nodes if n.available]))
+
+def test_image_catalog (ad):
+  small = pgad.Advertisement(xml = fakeam.makeAdvertisement(nodes = 10, images = 1, seed = 4))
+  catalog = pgad.ImageCatalog.fromAdvertisements({"big" : ad, "small" : small, "down" : None})
+  assert catalog.aggregates == set(["big", "small"])
+  assert len(catalog) == 3
+  assert U16 in catalog and "emulab-ops:UBUNTU16-64-STD" in catalog and "UBUNTU16-64-STD" in catalog
+  assert "UBUNTU99-64-STD" not in catalog
+  assert catalog.image("UBUNTU20-64-STD").name == U20
+  assert sorted([i.name for i in catalog.imagesAt("small")]) == [U16]
+
+  assert set([loc.aggregate for loc in catalog.locate(U20)]) == set(["big"])
+  for loc in catalog.locate("UBUNTU16-64-STD", sliver_type = "raw-pc"):
+    target = ad if loc.aggregate == "big" else small
+    assert (loc.nodes, loc.available) == _brute(target, U16, loc.hardware_type, "raw-pc")
+  found = catalog.locate(U16, hardware_type = "d430", available = True)
+  assert found and all([loc.hardware_type == "d430" and loc.available for loc in found])
+
+def test_image_catalog_merge (ad):
+  small = pgad.Advertisement(xml = fakeam.makeAdvertisement(nodes = 10, images = 1, seed = 4))
+  a = pgad.ImageCatalog()
+  a.add("big", ad)
+  b = pgad.ImageCatalog()
+  b.add("small", small)
+  merged = a | b
+  whole = pgad.ImageCatalog.fromAdvertisements({"big" : ad, "small" : small})
+  assert [(l.aggregate, l.sliver_type, l.hardware_type, l.nodes) for l in merged.locate(U16)] == \
+         [(l.aggregate, l.sliver_type, l.hardware_type, l.nodes) for l in whole.locate(U16)]
+
+  # Re-adding replaces, removing drops images nobody else offers
+  merged.add("big", small)
+  assert U20 not in merged
+  merged.remove("big")
+  merged.remove("small")
+  assert len(merged) == 0 and merged.locate(U16) == [] and "UBUNTU16-64-STD" not in merged
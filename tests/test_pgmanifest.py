@@ -0,0 +1,95 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+
+import pytest
+
+import geni.rspec.pg as pg
+import geni.util
+from geni.aggregate.pgutil import ProtoGENIError
+from geni.aggregate.protogeni import PGCompute
+
+
+def _request ():
+  req = pg.Request()
+  nodes = req.addNodes(4)
+  req.connectLinear(nodes)
+  return req
+
+@pytest.fixture
+def manifest (context, am):
+  return am.createsliver(context, "slc", _request())
+
+def _summary (mf):
+  return ([(n.client_id, n.sliver_id, n.hostfqdn, [i.client_id for i in n.interfaces]) for n in mf.nodes],
+          [(l.client_id, l.sliver_id, list(l.interface_refs)) for l in mf.links],
+          mf.logins)
+
+def test_pickle_roundtrip (manifest):
+  copy = pickle.loads(pickle.dumps(manifest))
+  assert _summary(copy) == _summary(manifest)
+  assert copy.nodeByClientID("node-1").sliver_id == manifest.nodeByClientID("node-1").sliver_id
+  # The document itself is still available
+  assert copy.text == manifest.text
+
+def test_detach (manifest):
+  before = _summary(manifest)
+  text = manifest.text
+  manifest.detach()
+  assert _summary(manifest) == before
+  assert manifest.text == text
+
+def test_processes_with_failing_sites (context, am, server):
+  am.createsliver(context, "slc", _request())
+  dead = PGCompute("dead-am", "127.0.0.1", "urn:publicid:IDN+dead+authority+cm",
+                   url = "https://127.0.0.1:1/protogeni/xmlrpc/am/2.0")
+
+  res = dict([((site.name, slc), r) for (site, slc, r) in
+              geni.util.iterManifests(context, [dead, am], ["missing", "slc"], max_workers = 2,
+                                      processes = True)])
+  assert isinstance(res[("dead-am", "slc")], Exception)
+  assert isinstance(res[(am.name, "missing")], ProtoGENIError)
+  assert [n.client_id for n in res[(am.name, "slc")].nodes] == ["node-0", "node-1", "node-2", "node-3"]
+
+  mfs = geni.util.getManifests(context, [dead, am], ["missing", "slc"], processes = True)
+  assert list(mfs) == ["slc"]
+  assert [site.name for site in mfs["slc"]] == [am.name]
+
+def test_node_indexes (manifest):
+  for node in manifest.nodes:
+    assert manifest.nodeByClientID(node.client_id) is node
+    assert manifest.nodeBySliverID(node.sliver_id) is node
+    for intf in node.interfaces:
+      assert manifest.interfaceBySliverID(intf.sliver_id) == (node, intf)
+  assert manifest.nodeByClientID("nope") is None
+  assert manifest.nodeBySliverID("urn:nope") is None
+  assert manifest.interfaceBySliverID("urn:nope") is None
+
+def test_link_indexes (manifest):
+  for link in manifest.links:
+    assert manifest.linkByClientID(link.client_id) is link
+    assert manifest.linkBySliverID(link.sliver_id) is link
+    ends = manifest.linkEndpoints(link)
+    assert [intf.sliver_id for (_, intf) in ends] == list(link.interface_refs)
+    assert manifest.linkEndpoints(link.client_id) == ends
+  first = manifest.links[0].client_id
+  assert [node.client_id for (node, _) in manifest.linkEndpoints(first)] == ["node-0", "node-1"]
+  assert manifest.linkEndpoints("nope") == []
+
+def test_logins (manifest):
+  scanned = []
+  for node in manifest.nodes:
+    for login in node.logins:
+      scanned.append((node.client_id, login.username, login.hostname, login.port))
+  assert scanned
+  assert manifest.logins == scanned
+  logins = manifest.loginsFor("node-2")
+  assert [(l.username, l.hostname, l.port) for l in logins] == [x[1:] for x in scanned if x[0] == "node-2"]
+  assert manifest.loginsFor("nope") == []
+  # Callers get their own list
+  manifest.logins.append(None)
+  assert None not in manifest.logins
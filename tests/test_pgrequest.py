@@ -0,0 +1,147 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import io
+
+from lxml import etree as ET
+import pytest
+
+import geni.rspec.igext as IG
+import geni.rspec.pg as pg
+
+
+def _empty ():
+  return pg.Request()
+
+def _linear ():
+  req = pg.Request()
+  nodes = req.addNodes(3)
+  req.connectLinear(nodes)
+  nodes[0].disk_image = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD"
+  nodes[1].addService(pg.Execute(shell = "sh", command = "echo 'a < b' & true"))
+  return req
+
+def _extensions ():
+  req = pg.Request()
+  tour = IG.Tour()
+  tour.Description(IG.Tour.TEXT, "A <small> profile")
+  tour.Instructions(IG.Tour.MARKDOWN, "Log in & look around")
+  req.addTour(tour)
+  node = req.XenVM("vm")
+  bs = node.Blockstore("bs", "/mydata")
+  bs.size = "10GB"
+  node.hardware_type = "d430"
+  raw = ET.Element("{http://example.org/ext/1}thing", nsmap = {"x" : "http://example.org/ext/1"})
+  raw.text = "value"
+  req.addRawElement(raw)
+  return req
+
+BUILDERS = [_empty, _linear, _extensions]
+
+def _stream (req, pretty_print):
+  buf = io.BytesIO()
+  req.writeXMLStream(buf, pretty_print)
+  return buf.getvalue()
+
+def _c14n (data):
+  return ET.tostring(ET.fromstring(data), method = "c14n")
+
+@pytest.mark.parametrize("build", BUILDERS)
+@pytest.mark.parametrize("pretty_print", [False, True])
+def test_stream_matches_string (build, pretty_print):
+  req = build()
+  expected = req.toXMLString(pretty_print)
+  data = _stream(req, pretty_print)
+  assert _c14n(data) == _c14n(expected)
+  assert data == expected
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_write_xml (build, tmp_path):
+  req = build()
+  path = str(tmp_path / "req.xml")
+  req.writeXML(path)
+  with open(path, "rb") as f:
+    data = f.read()
+  assert data == req.toXMLString(True)
+  assert not data.startswith(b"<?xml")
+
+def _intfNames (node):
+  return [intf.client_id for intf in node.interfaces]
+
+def test_add_interface_after_rename ():
+  n = pg.RawPC("n")
+  i0 = n.addInterface()
+  i0.client_id = "n:if1"
+  assert n.addInterface().client_id == "n:if0"
+  assert n.addInterface().client_id == "n:if2"
+  assert len(set(_intfNames(n))) == 3
+
+def test_add_interface_after_list_edits ():
+  n = pg.RawPC("n")
+  first = [n.addInterface() for _ in range(3)]
+  n.interfaces.remove(first[0])
+  assert n.addInterface().client_id == "n:if0"
+
+  n.interfaces.append(pg.Interface("n:if4", n))
+  assert n.addInterface().client_id == "n:if3"
+  assert n.addInterface().client_id == "n:if5"
+
+  n.interfaces = [pg.Interface("n:if0", n)]
+  assert n.addInterface().client_id == "n:if1"
+  assert sorted(_intfNames(n)) == ["n:if0", "n:if1"]
+
+def test_add_interface_duplicate_name ():
+  n = pg.RawPC("n")
+  n.addInterface("eth0")
+  with pytest.raises(pg.Node.DuplicateInterfaceName):
+    n.addInterface("n:eth0")
+
+def test_add_nodes ():
+  req = pg.Request()
+  nodes = req.addNodes(3, template = IG.XenVM, name_fmt = "vm%02d", start = 1,
+                       disk_image = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD")
+  assert [n.client_id for n in nodes] == ["vm01", "vm02", "vm03"]
+  assert all(isinstance(n, IG.XenVM) for n in nodes)
+  assert all(n.disk_image.endswith("UBUNTU22-64-STD") for n in nodes)
+  assert req.resources == nodes
+
+  more = req.addNodes(2)
+  assert [n.client_id for n in more] == ["node-0", "node-1"]
+  assert isinstance(more[0], pg.RawPC)
+  assert len(req.resources) == 5
+
+def _endpoints (lnk):
+  return set(intf.node.client_id for intf in lnk.interfaces)
+
+@pytest.mark.parametrize("connect,count", [("connectLinear", 4), ("connectFullMesh", 10)])
+def test_connect (connect, count):
+  req = pg.Request()
+  nodes = req.addNodes(5)
+  links = getattr(req, connect)(nodes, name_fmt = "lan%d", start = 1)
+  assert len(links) == count
+  assert [l.client_id for l in links] == ["lan%d" % idx for idx in range(1, count + 1)]
+  assert all(len(l.interfaces) == 2 for l in links)
+  assert len(set(frozenset(_endpoints(l)) for l in links)) == count
+  assert sum(len(n.interfaces) for n in nodes) == 2 * count
+  for n in nodes:
+    assert len(set(_intfNames(n))) == len(n.interfaces)
+
+def test_connect_linear_chain ():
+  req = pg.Request()
+  nodes = req.addNodes(3)
+  links = req.connectLinear(iter(nodes))
+  assert [_endpoints(l) for l in links] == [{"node-0", "node-1"}, {"node-1", "node-2"}]
+
+def test_connect_star ():
+  req = pg.Request()
+  hub = req.addNodes(1, name_fmt = "hub%d")[0]
+  leaves = req.addNodes(4)
+  links = req.connectStar(hub, leaves, template = pg.LAN)
+  assert len(links) == 4
+  assert all(isinstance(l, pg.LAN) for l in links)
+  assert len(hub.interfaces) == 4
+  assert all(len(n.interfaces) == 1 for n in leaves)
+  assert all("hub0" in _endpoints(l) for l in links)
@@ -0,0 +1,116 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import asyncio
+
+import pytest
+import requests
+from six.moves import xmlrpc_client as xmlrpclib
+
+from geni.minigcf import util as MU
+from geni.minigcf.aio import util as AU
+from geni.minigcf.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+URL = "https://am.example.net:12369/protogeni/xmlrpc/am/2.0"
+LISTRESOURCES = xmlrpclib.dumps(({},), methodname = "ListResources")
+CREATESLIVER = xmlrpclib.dumps(({},), methodname = "CreateSliver")
+BUSY = {"code" : {"geni_code" : 2, "am_type" : "protogeni", "am_code" : 14}, "value" : None, "output" : "busy"}
+
+
+class _Calls(object):
+  """Fake transport: each call pops the next outcome (an exception to raise, or a result)."""
+  def __init__ (self, *outcomes):
+    self.outcomes = list(outcomes)
+    self.count = 0
+
+  def __call__ (self, url, req_data):
+    self.count += 1
+    outcome = self.outcomes.pop(0)
+    if isinstance(outcome, BaseException):
+      raise outcome
+    return outcome
+
+
+def test_policy_retries_idempotent_transport_errors ():
+  policy = RetryPolicy(max_attempts = 3, jitter = False)
+  exc = requests.exceptions.ConnectionError("reset")
+  assert policy.backoffFor("ListResources", 0, exc = exc) == 0.5
+  assert policy.backoffFor("ListResources", 1, exc = exc) == 1.0
+  assert policy.backoffFor("ListResources", 2, exc = exc) is None
+  assert policy.backoffFor("CreateSliver", 0, exc = exc) is None
+  assert policy.backoffFor("CreateSliver", 0, exc = requests.exceptions.ConnectTimeout()) == 0.5
+  assert policy.backoffFor("CreateSliver", 0, result = BUSY) == 0.5
+  assert policy.backoffFor("CreateSliver", 0, result = {"code" : {"geni_code" : 0}}) is None
+
+def test_withpolicy_retries_then_succeeds (httpconfig):
+  httpconfig.RETRY_POLICY = RetryPolicy(backoff = 0, jitter = False)
+  post = _Calls(requests.exceptions.ConnectionError(), BUSY, "ok")
+  assert MU._withPolicy(post, URL, LISTRESOURCES) == "ok"
+  assert post.count == 3
+
+def test_withpolicy_does_not_resend_unsafe_methods (httpconfig):
+  httpconfig.RETRY_POLICY = RetryPolicy(backoff = 0, jitter = False)
+  post = _Calls(requests.exceptions.ReadTimeout(), "ok")
+  with pytest.raises(requests.exceptions.ReadTimeout):
+    MU._withPolicy(post, URL, CREATESLIVER)
+  assert post.count == 1
+
+def test_breaker_opens_and_recovers ():
+  breaker = CircuitBreaker(failure_threshold = 2, reset_timeout = 0)
+  failure = requests.exceptions.ConnectionError()
+  assert breaker.before(URL) is False
+  breaker.record(URL, failure)
+  assert breaker.before(URL) is False
+  breaker.record(URL, failure)
+
+  # Half-open: one trial at a time
+  assert breaker.before(URL) is True
+  with pytest.raises(CircuitOpenError):
+    breaker.before(URL)
+  breaker.record(URL)
+  assert breaker.before(URL) is False
+
+def test_breaker_rejects_while_open ():
+  breaker = CircuitBreaker(failure_threshold = 1, reset_timeout = 60)
+  breaker.record(URL, requests.exceptions.ConnectTimeout())
+  assert breaker.isOpen(URL)
+  with pytest.raises(CircuitOpenError):
+    breaker.before(URL)
+  # Other endpoints are unaffected
+  assert breaker.before("https://other.example.net/am") is False
+  breaker.reset(URL)
+  assert breaker.before(URL) is False
+
+def test_breaker_ignores_am_errors ():
+  breaker = CircuitBreaker(failure_threshold = 1, reset_timeout = 60)
+  breaker.record(URL, xmlrpclib.Fault(1, "bad"))
+  assert not breaker.isOpen(URL)
+
+def _openBreaker ():
+  breaker = CircuitBreaker(failure_threshold = 1, reset_timeout = 0)
+  breaker.record(URL, requests.exceptions.ConnectionError())
+  return breaker
+
+@pytest.mark.parametrize("exc", [xmlrpclib.Fault(1, "bad"), ValueError("unparseable"), KeyboardInterrupt()])
+def test_trial_never_left_pending (httpconfig, exc):
+  httpconfig.CIRCUIT_BREAKER = _openBreaker()
+  with pytest.raises(type(exc)):
+    MU._withPolicy(_Calls(exc), URL, LISTRESOURCES)
+  assert MU._withPolicy(_Calls("ok"), URL, LISTRESOURCES) == "ok"
+
+@pytest.mark.parametrize("exc", [xmlrpclib.Fault(1, "bad"), asyncio.CancelledError()])
+def test_async_trial_never_left_pending (httpconfig, monkeypatch, exc):
+  httpconfig.CIRCUIT_BREAKER = _openBreaker()
+  calls = _Calls(exc, "ok")
+  async def instrumented (url, req_data, cert, root_bundle):
+    return calls(url, req_data)
+  monkeypatch.setattr(AU, "_instrumented", instrumented)
+
+  async def run ():
+    with pytest.raises(type(exc)):
+      await AU._rpcpost(URL, LISTRESOURCES, None, None)
+    return await AU._rpcpost(URL, LISTRESOURCES, None, None)
+  assert asyncio.run(run()) == "ok"
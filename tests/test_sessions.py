@@ -0,0 +1,78 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import time
+
+from geni.minigcf import util as MU
+
+URL = "https://am.example.net:12369/protogeni/xmlrpc/am/2.0"
+OTHER = "https://other.example.net/xmlrpc"
+CERT = ("/tmp/cert.pem", "/tmp/key.pem")
+
+def _tracking (session, monkeypatch):
+  closed = []
+  monkeypatch.setattr(session, "close", lambda: closed.append(True))
+  return closed
+
+def test_reuse ():
+  pool = MU.SessionPool()
+  with pool.checkout(URL, CERT) as s1:
+    pass
+  with pool.checkout(URL + "?x", CERT) as s2:
+    pass
+  with pool.checkout(URL, ("/tmp/other.pem", "/tmp/key.pem")) as s3:
+    pass
+  assert s1 is s2
+  assert s1 is not s3
+  assert len(pool) == 2
+
+def test_idle_eviction (httpconfig, monkeypatch):
+  httpconfig.POOL_IDLE_TIMEOUT = 0.05
+  pool = MU.SessionPool()
+  with pool.checkout(URL, CERT) as s1:
+    closed = _tracking(s1, monkeypatch)
+  time.sleep(0.1)
+  with pool.checkout(OTHER, CERT):
+    pass
+  assert closed
+  assert len(pool) == 1
+
+def test_busy_session_not_evicted (httpconfig, monkeypatch):
+  httpconfig.POOL_IDLE_TIMEOUT = 0.05
+  pool = MU.SessionPool()
+  with pool.checkout(URL, CERT) as s1:
+    closed = _tracking(s1, monkeypatch)
+    # A long-running call outlives the idle timeout while other calls use the pool
+    time.sleep(0.1)
+    with pool.checkout(OTHER, CERT):
+      pass
+    assert not closed
+    with pool.checkout(URL, CERT) as s2:
+      assert s2 is s1
+
+  # The idle time counts from the release, not the checkout
+  time.sleep(0.03)
+  with pool.checkout(OTHER, CERT):
+    pass
+  assert not closed
+  time.sleep(0.1)
+  with pool.checkout(OTHER, CERT):
+    pass
+  assert closed
+
+def test_release_after_drain ():
+  pool = MU.SessionPool()
+  s1 = pool.get(URL, CERT)
+  pool.drain(close = False)
+  pool.release(URL, CERT, s1)
+  assert len(pool) == 0
+  with pool.checkout(URL, CERT) as s2:
+    assert s2 is not s1
+
+def test_calls_release_sessions (context, am):
+  am.getversion(context)
+  am.listresources(context)
+  assert [entry[2] for entry in MU.SESSIONS._sessions.values()] == [0]
@@ -0,0 +1,115 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+
+import pytest
+
+import geni.rspec.pg as pg
+from geni.rspec import template
+from geni.rspec.template import Slot, RequestTemplate
+
+IMAGE = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD"
+
+def _build (params):
+  req = pg.Request()
+  nodes = req.addNodes(params.count, hardware_type = params.hwtype, disk_image = params.image)
+  for lnk in req.connectLinear(nodes, name_fmt = "link-%d"):
+    lnk.bandwidth = params.bw
+  return req
+
+def _slots ():
+  return [Slot("hwtype"), Slot("image", default = IMAGE), Slot("bw", int)]
+
+def _template (**kwargs):
+  calls = []
+  def build (params):
+    calls.append(params.count)
+    return _build(params)
+  return (RequestTemplate(build, slots = _slots(), structural = ["count"], **kwargs), calls)
+
+def _direct (count, hwtype, image = IMAGE, bw = 0, pretty_print = False):
+  from argparse import Namespace
+  req = _build(Namespace(count = count, hwtype = hwtype, image = image, bw = bw))
+  return req.toXMLString(pretty_print)
+
+
+@pytest.mark.parametrize("pretty_print", [False, True])
+def test_render_matches_direct (pretty_print):
+  (tmpl, _) = _template(pretty_print = pretty_print)
+  for (hwtype, bw) in [("d430", 1000), ("m510", 25000), ("d430", 1000)]:
+    out = tmpl.render(count = 3, hwtype = hwtype, bw = bw)
+    assert out.toXMLString() == _direct(3, hwtype, bw = bw, pretty_print = pretty_print)
+
+def test_compiled_once_per_structure ():
+  (tmpl, calls) = _template(cache_size = 2)
+  tmpl.render(count = 2, hwtype = "a", bw = 1)
+  tmpl.render(count = 2, hwtype = "b", bw = 2)
+  assert calls == [2]
+  tmpl.render(count = 3, hwtype = "a", bw = 1)
+  tmpl.render(count = 2, hwtype = "a", bw = 1)
+  tmpl.render(count = 4, hwtype = "a", bw = 1)
+  assert calls == [2, 3, 4]
+  # count=3 was least recently used and is dropped
+  tmpl.render(count = 3, hwtype = "a", bw = 1)
+  assert calls == [2, 3, 4, 3]
+  tmpl.clear()
+  tmpl.render(count = 2, hwtype = "a", bw = 1)
+  assert calls == [2, 3, 4, 3, 2]
+
+def test_render_escapes_and_converts ():
+  (tmpl, _) = _template()
+  out = tmpl.render(count = 2, hwtype = 'x<"&">', bw = "2500", image = "img")
+  assert out.toXMLString() == _direct(2, 'x<"&">', image = "img", bw = 2500)
+  assert out.toXMLString(ucode = True) == out.toXMLString().decode("utf-8")
+
+def test_bool_slot ():
+  slot = Slot("flag", bool)
+  assert slot.render(True) == b"true"
+  assert slot.render("False") == b"false"
+  assert Slot("n", "integer").render("7") == b"7"
+
+def test_errors ():
+  with pytest.raises(template.InvalidSlotNameError):
+    Slot("1bad")
+  (tmpl, _) = _template()
+  with pytest.raises(template.MissingSlotValueError):
+    tmpl.render(count = 2, bw = 1)
+  with pytest.raises(template.UnknownSlotError):
+    tmpl.render(count = 2, hwtype = "a", bw = 1, colour = "red")
+  with pytest.raises(template.UnknownSlotError):
+    tmpl.compile(size = 2)
+
+def test_unlisted_slot_in_request ():
+  stray = Slot("stray")
+  req = pg.Request()
+  req.addNodes(1, hardware_type = stray)
+  with pytest.raises(template.UnknownSlotError):
+    template.CompiledRequest(req, _slots())
+
+def test_compiled_used ():
+  (tmpl, _) = _template()
+  assert tmpl.compile(count = 1).used == set(["hwtype", "image"])
+  assert tmpl.compile(count = 2).used == set(["hwtype", "image", "bw"])
+
+def test_slot_pickle ():
+  for slot in _slots():
+    copy = pickle.loads(pickle.dumps(slot))
+    assert (copy, copy.name, copy.type, copy.default) == (slot, slot.name, slot.type, slot.default)
+  assert pickle.loads(pickle.dumps(Slot("x"))).render("v") == b"v"
+
+def test_write_xml (tmp_path):
+  (tmpl, _) = _template()
+  out = tmpl.render(count = 2, hwtype = "d430", bw = 10)
+  path = str(tmp_path / "req.xml")
+  out.writeXML(path)
+  with open(path, "rb") as f:
+    assert f.read() == out.toXMLString()
+
+def test_unpickled_slot_without_default ():
+  tmpl = RequestTemplate(_build, slots = pickle.loads(pickle.dumps(_slots())), structural = ["count"])
+  with pytest.raises(template.MissingSlotValueError):
+    tmpl.render(count = 2, bw = 1)
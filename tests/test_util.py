@@ -0,0 +1,85 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+import time
+
+import pytest
+
+import geni.rspec.pg as pg
+import geni.util
+from geni.aggregate.exceptions import AMError
+from geni.aggregate.pgutil import ProtoGENIError
+from geni.aggregate.protogeni import PGCompute
+from geni.support import fakeam
+
+
+class _UnpicklableError(Exception):
+  # Pickles, but fails to unpickle (the constructor needs arguments that aren't in self.args)
+  def __init__ (self, a, b):
+    super(_UnpicklableError, self).__init__()
+    self.a = a
+    self.b = b
+
+def _request ():
+  req = pg.Request()
+  req.RawPC("node")
+  return req
+
+def test_amerror_pickles ():
+  err = pickle.loads(pickle.dumps(ProtoGENIError("No such slice", {"code" : {"geni_code" : 12}})))
+  assert type(err) is ProtoGENIError
+  assert isinstance(err, AMError)
+  assert str(err) == "No such slice"
+  assert err.data == {"code" : {"geni_code" : 12}}
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_getmanifests_failing_site (context, am, processes):
+  am.createsliver(context, "good", _request())
+  res = dict([(slc, r) for (_, slc, r) in
+              geni.util.iterManifests(context, [am], ["missing", "good"], max_workers = 1, processes = processes)])
+  assert isinstance(res["missing"], ProtoGENIError)
+  assert res["good"].nodes[0].client_id == "node"
+
+  mfs = geni.util.getManifests(context, [am], ["missing", "good"], max_workers = 1, processes = processes)
+  assert list(mfs) == ["good"]
+
+def test_worker_unpicklable_exception ():
+  class Site(object):
+    def listresources (self, context, slc):
+      raise _UnpicklableError(1, 2)
+
+  err = geni.util._mp_get_manifest(None, Site(), "slc")
+  assert isinstance(err, geni.util.WorkerError)
+  assert pickle.loads(pickle.dumps(err)).exc_type.endswith("_UnpicklableError")
+
+def test_fresh_context_shared_by_workers (server, am):
+  # Credentials are downloaded on first use by whichever worker gets there first
+  ams = [PGCompute("fake-%d" % (x), "127.0.0.1", am.component_manager_id, url = server.url()) for x in range(8)]
+  for _ in range(5):
+    context = server.makeContext()
+    for (site, res) in geni.util.iterAdvertisements(context, ams, max_workers = 8):
+      assert not isinstance(res, Exception), res
+
+def test_iteradvertisements_streams_and_times_out (server, context, am):
+  slow = fakeam.FakeAMServer(nodes = 5, latency = lambda method: 2.0 if method == "ListResources" else 0)
+  with slow:
+    site = slow.aggregate("slow-am")
+    t0 = time.time()
+    res = [(s.name, r, time.time() - t0) for (s, r) in
+           geni.util.iterAdvertisements(context, [site, am], timeout = 0.5)]
+  assert [name for (name, _, _) in res] == ["fake-am", "slow-am"]
+  assert len(res[0][1].nodes) == 20
+  assert isinstance(res[1][1], geni.util.SiteTimeoutError)
+  assert res[1][2] < 1.5
+
+def test_timeout_counts_from_start (context, server):
+  # Three sites queued behind one worker take longer in total than the per-site timeout
+  server.latency = lambda method: 0.3 if method == "ListResources" else 0
+  ams = [server.aggregate("am-%d" % (x)) for x in range(3)]
+  res = geni.util.getAdvertisements(context, ams, max_workers = 1, timeout = 1.0)
+  assert sorted(res.keys()) == ["am-0", "am-1", "am-2"]
+  assert None not in res.values()
@@ -0,0 +1,112 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os.path
+
+import pytest
+import requests
+
+import geni.rspec.pg as pg
+import geni.rspec.pgad as pgad
+import geni.rspec.vts as vts
+import geni.rspec.validate as V
+from geni.support import fakeam
+
+IMAGE = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD"
+
+
+@pytest.fixture
+def validator (monkeypatch):
+  """A validator that only sees the schemas bundled with geni-lib."""
+  monkeypatch.delenv("GENILIB_SCHEMA_PATH", raising = False)
+  monkeypatch.setattr(V, "SCHEMA_PATH", [])
+  return V.Validator()
+
+def _request ():
+  req = pg.Request()
+  (a, b, c) = req.addNodes(3, disk_image = IMAGE, hardware_type = "d430")
+  a.addService(pg.Execute("sh", "/local/setup.sh"))
+  a.addService(pg.Install("http://example.net/setup.tgz", "/local"))
+  lnk = req.Link("link", members = [a, b])
+  lnk.bandwidth = 10000
+  lnk.vlan_tagging = True
+  shared = req.Link("shared")
+  shared.addInterface(c.addInterface("if0", pg.IPv4Address("10.0.0.1", "255.255.255.0")))
+  shared.shared_vlan = "mesoscale"
+  return req
+
+def test_bundled_request_valid (validator):
+  assert validator.validate(_request()) == []
+
+def test_invalid_request (validator):
+  data = _request().toXMLString().replace(b'exclusive="true"', b'exclusive="maybe"', 1)
+  errors = validator.validate(data)
+  assert len(errors) == 1 and "exclusive" in errors[0]
+  with pytest.raises(V.RSpecValidationError):
+    validator.assertValid(data)
+
+def test_vts_request_valid (validator):
+  req = vts.Request()
+  dp = vts.Datapath(vts.OVSL2Image(), "br0")
+  req.addResource(dp)
+  ct = vts.Container(vts.Image("uh.simple-node"), "c0")
+  req.addResource(ct)
+  vts.connectInternalCircuit(dp, ct)
+  assert validator.validate(req) == []
+
+def test_manifest_and_advertisement (validator, context, am, server, tmp_path):
+  assert validator.validate(am.createsliver(context, "slc", _request())) == []
+  ad = am.listresources(context)
+  assert validator.validate(ad) == []
+
+  path = tmp_path / "ad.xml"
+  path.write_text(ad.text)
+  assert validator.validate(pgad.Advertisement(path = str(path))) == []
+  assert validator.validate(str(path)) == []
+
+def test_createsliver_validate (validator, context, am, monkeypatch):
+  monkeypatch.setattr(V, "_validator", validator)
+  req = _request()
+  am.createsliver(context, "slc", req, validate = True)
+
+  bad = pg.Request()
+  bad.addResource(pg.RawPC("node"))
+  bad.addRawElement(pg.ET.Element("{http://www.geni.net/resources/rspec/3}bogus"))
+  with pytest.raises(V.RSpecValidationError):
+    am.createsliver(context, "bad", bad, validate = True)
+
+def test_missing_schema (tmp_path):
+  with pytest.raises(V.SchemaNotFoundError):
+    V.Validator(dirs = [str(tmp_path)]).validate(_request())
+
+
+class _Response(object):
+  def __init__ (self, url, status, content = b""):
+    self.url = url
+    self.status_code = status
+    self.content = content
+
+  def raise_for_status (self):
+    if self.status_code >= 400:
+      raise requests.exceptions.HTTPError("%d for %s" % (self.status_code, self.url), response = self)
+
+def test_fetchschemas_skips_failures (tmp_path, monkeypatch):
+  base = os.path.join(V.BUNDLED_SCHEMA_DIR, "www.geni.net", "resources", "rspec", "3")
+  def get (url, timeout = None):
+    name = url.rsplit("/", 1)[-1]
+    if name == "ad.xsd":
+      return _Response(url, 404)
+    if name == "manifest.xsd":
+      return _Response(url, 200, b"<html>not a schema")
+    with open(os.path.join(base, name), "rb") as f:
+      return _Response(url, 200, f.read())
+  monkeypatch.setattr(requests, "get", get)
+
+  with pytest.warns(UserWarning) as warned:
+    written = V.fetchSchemas(str(tmp_path), locations = list(V.RSPEC_LOCATIONS.values()))
+  assert len(warned) == 2
+  assert sorted([os.path.basename(x) for x in written]) == ["common.xsd", "request.xsd"]
+  assert V.Validator(dirs = [str(tmp_path)]).validate(_request()) == []
@@ -0,0 +1,69 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+import threading
+
+
+def _calls (server):
+  return server.calls.get("GetVersion", 0)
+
+def test_memory_cache (server, context, am):
+  am.enableVersionCache(ttl = 60)
+  first = am.getversion(context)
+  assert am.getversion(context) == first
+  assert _calls(server) == 1
+  am.getversion(context, refresh = True)
+  assert _calls(server) == 2
+
+def test_persisted_cache (server, context, am):
+  am.enableVersionCache(ttl = 60, persist = True)
+  first = am.getversion(context)
+  assert os.path.exists(am._versionCachePath(context))
+
+  other = server.aggregate()
+  other.enableVersionCache(ttl = 60, persist = True)
+  assert other.getversion(context) == first
+  assert _calls(server) == 1
+
+def test_corrupt_cache_file (server, context, am):
+  am.enableVersionCache(ttl = 60, persist = True)
+  path = am._versionCachePath(context)
+  for junk in (b"<?xml version='1.0'?><methodResponse><params><par", b"\x00garbage", b""):
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    with open(path, "wb") as f:
+      f.write(junk)
+    am.clearVersionCache()
+    before = _calls(server)
+    assert am.getversion(context)
+    assert _calls(server) == before + 1
+
+  # The live result replaced the broken file
+  fresh = server.aggregate()
+  fresh.enableVersionCache(ttl = 60, persist = True)
+  before = _calls(server)
+  fresh.getversion(context)
+  assert _calls(server) == before
+
+def test_concurrent_store (server, context):
+  errors = []
+  def run ():
+    try:
+      am = server.aggregate()
+      am.enableVersionCache(ttl = 60, persist = True)
+      for _ in range(5):
+        am.getversion(context, refresh = True)
+    except Exception as e: # pylint: disable=broad-except
+      errors.append(e)
+
+  threads = [threading.Thread(target = run) for _ in range(8)]
+  for t in threads:
+    t.start()
+  for t in threads:
+    t.join()
+  assert errors == []
+  assert [x for x in os.listdir(os.path.dirname(server.aggregate()._versionCachePath(context)))
+          if x.endswith(".tmp")] == []
@@ -0,0 +1,73 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pickle
+
+import pytest
+
+import geni.rspec.vtsmanifest as VTSM
+
+MANIFEST = """<rspec xmlns="http://www.geni.net/resources/rspec/3"
+  xmlns:v="http://geni.bssoftworks.com/rspec/ext/vts/manifest/1" type="manifest">
+  <v:info host="vts.example.net" slice="urn:publicid:IDN+example+slice+s1" client-topo-name="topo"/>
+  <v:datapath client_id="br0" image="bss:ovs-201" sliver_id="urn:dp0">
+    <v:port client_id="br0:0" type="internal" remote-clientid="br1:0" vlan-id="10"/>
+    <v:port client_id="br0:1" type="pg-local" shared-lan="circuit-a"/>
+    <v:port client_id="br0:2" type="gre"><v:endpoint circuit-plane="geni" local="10.0.0.1" remote="10.0.0.2"/></v:port>
+    <v:port client_id="br0:3" type="vf-port" remote-clientid="vpn0"/>
+  </v:datapath>
+  <v:datapath client_id="br1" image="bss:ovs-201" sliver_id="urn:dp1">
+    <v:port client_id="br1:0" type="internal" remote-clientid="br0:0" vlan-id="10"/>
+    <v:port client_id="br1:1" type="internal" remote-clientid="c0:eth0"/>
+  </v:datapath>
+  <v:container client_id="c0" image="uh.simple-node" sliver_id="urn:c0">
+    <v:port client_id="c0:eth0" type="internal" remote-clientid="br1:1" mac-address="02:00:00:00:00:01" name="eth0"/>
+  </v:container>
+  <v:functions><v:function client_id="vpn0" type="sslvpn" tp-port="1194" local-ip="10.1.0.1">KEY</v:function></v:functions>
+</rspec>
+"""
+
+@pytest.fixture
+def manifest ():
+  return VTSM.Manifest(xml = MANIFEST)
+
+def test_find_target (manifest):
+  assert isinstance(manifest.findTarget("br0"), VTSM.ManifestDatapath)
+  assert manifest.findTarget("br0") is manifest.findTarget("br0")
+  assert manifest["c0"].image == "uh.simple-node"
+  assert isinstance(manifest.findTarget("c0"), VTSM.ManifestContainer)
+  assert manifest.findTarget("nope") is None
+  assert [dp.client_id for dp in manifest.datapaths] == ["br0", "br1"]
+  assert manifest.host == "vts.example.net"
+
+def test_find_port (manifest):
+  port = manifest.findPort("br0:0")
+  assert isinstance(port, VTSM.InternalPort) and port.vlan_id == 10
+  assert isinstance(manifest.findPort("br0:1"), VTSM.PGLocalPort)
+  assert manifest.findPort("br0:2").remote_endpoint == "10.0.0.2"
+  assert isinstance(manifest.findPort("br0:3"), VTSM.VFPort)
+  # Only datapath ports, as before
+  assert manifest.findPort("c0:eth0") is None
+  assert manifest.findPort("nope") is None
+  assert len(list(manifest.ports)) == 7
+
+def test_topology (manifest):
+  assert manifest.portOwner("c0:eth0").client_id == "c0"
+  assert manifest.portOwner(manifest.findPort("br1:0")).client_id == "br1"
+  assert manifest.remoteTarget("br0:0").client_id == "br1"
+  assert manifest.remoteTarget("br1:1").client_id == "c0"
+  assert manifest.remoteTarget("br0:1") is None
+  assert manifest.remoteTarget("nope") is None
+  assert manifest.neighbors("br0") == set(["br1", "circuit-a", "vpn0"])
+  assert manifest.neighbors("c0") == set(["br1"])
+  assert manifest.graph["br1"] == set(["br0", "c0"])
+  assert list(manifest.pg_circuits) == ["circuit-a"]
+
+def test_pickle (manifest):
+  copy = pickle.loads(pickle.dumps(manifest))
+  assert copy.findPort("br0:0").remote_client_id == "br1:0"
+  assert copy.neighbors("br0") == manifest.neighbors("br0")
+  assert copy.text == manifest.text
@@ -0,0 +1,53 @@
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+#  This Source Code Form is subject to the terms of the Mozilla Public
+#  License, v. 2.0. If a copy of the MPL was not distributed with this
+#  file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import threading
+
+from lxml import etree as ET
+
+from geni.rspec._xpath import XPathSet
+from geni.support import fakeam
+
+NS = {"g" : "http://www.geni.net/resources/rspec/3",
+      "e" : "http://www.protogeni.net/resources/rspec/ext/emulab/1"}
+
+ROOT = ET.fromstring(fakeam.makeAdvertisement(nodes = 10, links = 2, seed = 5))
+
+def test_matches_xpath ():
+  xp = XPathSet(NS)
+  for expr in ("g:node", "g:node/g:sliver_type/g:disk_image", "g:node/g:hardware_type/e:node_type/@type_slots",
+               "count(g:link)", "/g:rspec/g:node[g:available/@now='true']/@component_id"):
+    assert xp(ROOT, expr) == ROOT.xpath(expr, namespaces = NS)
+
+def test_compiled_once ():
+  xp = XPathSet(NS)
+  assert xp.compile("g:node") is xp.compile("g:node")
+  assert xp.compile("g:node") is not xp.compile("g:link")
+  # The namespace map is copied
+  ns = dict(NS)
+  xp = XPathSet(ns)
+  ns["g"] = "urn:other"
+  assert len(xp(ROOT, "g:node")) == 10
+
+def test_variables ():
+  xp = XPathSet(NS)
+  name = ROOT.xpath("g:node/@component_name", namespaces = NS)[3]
+  found = xp(ROOT, "g:node[@component_name=$name]", name = name)
+  assert [n.get("component_name") for n in found] == [name]
+  assert xp(ROOT, "g:node[@component_name=$name]", name = "nope") == []
+
+def test_threads ():
+  xp = XPathSet(NS)
+  results = []
+  def run ():
+    results.append([xp.compile("g:node[%d]" % (x)) for x in range(50)])
+  threads = [threading.Thread(target = run) for _ in range(8)]
+  for t in threads:
+    t.start()
+  for t in threads:
+    t.join()
+  for res in results[1:]:
+    assert all([a is b for (a, b) in zip(res, results[0])])
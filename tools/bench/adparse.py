@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Advertisement parse throughput (nodes/sec) on a synthetic ProtoGENI advertisement.
+
+import argparse
+import sys
+import time
+
+from geni.support import fakeam
+from geni.rspec import pgad
+
+def parse_args ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--nodes", type=int, default=5000, help="Nodes in the synthetic advertisement")
+  parser.add_argument("--links", type=int, default=1000, help="Links in the synthetic advertisement")
+  parser.add_argument("--rounds", type=int, default=5, help="Measured rounds (best is reported)")
+  return parser.parse_args()
+
+def best (func, rounds):
+  times = []
+  for _ in range(rounds):
+    t = time.perf_counter()
+    func()
+    times.append(time.perf_counter() - t)
+  return min(times)
+
+def main ():
+  opts = parse_args()
+  xml = fakeam.makeAdvertisement(nodes = opts.nodes, links = opts.links)
+  ad = pgad.Advertisement(xml = xml)
+
+  def nodes ():
+    for node in pgad.CachedXPathXRange(ad._root.xpath("g:node", namespaces = pgad._XPNS), pgad.AdNode):
+      pass
+
+  def links ():
+    for link in pgad.CachedXPathXRange(ad._root.xpath("g:link", namespaces = pgad._XPNS), pgad.AdLink):
+      pass
+
+  def full ():
+    fresh = pgad.Advertisement(xml = xml)
+    for node in fresh.nodes:
+      pass
+    for link in fresh.links:
+      pass
+
+  nodes()
+  t = best(nodes, opts.rounds)
+  sys.stdout.write("AdNode._fromdom  %8d nodes  %8.3fs  %10.0f nodes/s\n" % (opts.nodes, t, opts.nodes / t))
+  t = best(links, opts.rounds)
+  sys.stdout.write("AdLink._fromdom  %8d links  %8.3fs  %10.0f links/s\n" % (opts.links, t, opts.links / t))
+  t = best(full, opts.rounds)
+  sys.stdout.write("parse + wrap all %8d nodes  %8.3fs  %10.0f nodes/s\n" % (opts.nodes, t, opts.nodes / t))
+
+if __name__ == '__main__':
+  main()
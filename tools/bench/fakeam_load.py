@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Throughput / latency of the geni-lib client stack against a local fake aggregate.
+
+import argparse
+import concurrent.futures as CF
+import sys
+import time
+
+from geni.support import fakeam
+from geni.rspec import pg
+
+def parse_args ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--nodes", type=int, default=1000, help="Nodes in the synthetic advertisement")
+  parser.add_argument("--links", type=int, default=0, help="Links in the synthetic advertisement")
+  parser.add_argument("--calls", type=int, default=200, help="Calls per measured operation")
+  parser.add_argument("--workers", type=int, default=8, help="Concurrent client threads")
+  parser.add_argument("--latency", type=float, default=0.0, help="Server-side latency per call (seconds)")
+  parser.add_argument("--busy-rate", type=float, default=0.0, help="Fraction of calls answered with PG busy")
+  parser.add_argument("--compressed", action="store_true", help="Request geni_compressed advertisements")
+  parser.add_argument("--stream", action="store_true", help="Stream-decode advertisements")
+  return parser.parse_args()
+
+def pct (samples, p):
+  samples = sorted(samples)
+  return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+def measure (label, func, calls, workers):
+  lat = []
+  errors = 0
+  def one (_):
+    t = time.perf_counter()
+    func()
+    return time.perf_counter() - t
+  start = time.perf_counter()
+  with CF.ThreadPoolExecutor(workers) as pool:
+    futs = [pool.submit(one, i) for i in range(calls)]
+    for fut in futs:
+      try:
+        lat.append(fut.result())
+      except Exception: # pylint: disable=broad-except
+        errors += 1
+  wall = time.perf_counter() - start
+  if lat:
+    sys.stdout.write("%-16s %6d calls %8.1f/s  p50 %7.1fms  p95 %7.1fms  max %7.1fms  errors %d\n"
+                     % (label, calls, calls / wall, pct(lat, 0.5) * 1000, pct(lat, 0.95) * 1000,
+                        max(lat) * 1000, errors))
+  else:
+    sys.stdout.write("%-16s %6d calls  all failed\n" % (label, calls))
+
+def main ():
+  opts = parse_args()
+  faults = []
+  if opts.busy_rate:
+    faults.append(fakeam.Fault("busy", rate = opts.busy_rate))
+
+  with fakeam.FakeAMServer(nodes = opts.nodes, links = opts.links, latency = opts.latency, faults = faults) as srv:
+    context = srv.makeContext()
+    am = srv.aggregate()
+
+    req = pg.Request()
+    for i in range(4):
+      req.addResource(pg.RawPC("node-%d" % (i)))
+
+    # Warm up credentials and the advertisement cache
+    context.getSliceInfo("bench")
+    am.listresources(context)
+
+    measure("GetVersion", lambda: am.getversion(context), opts.calls, opts.workers)
+    measure("ListResources", lambda: am.listresources(context, compressed = opts.compressed, stream = opts.stream),
+            max(1, opts.calls // 10), opts.workers)
+    measure("CreateSliver", lambda: am.createsliver(context, "bench", req), opts.calls, opts.workers)
+    measure("SliverStatus", lambda: am.sliverstatus(context, "bench"), opts.calls, opts.workers)
+    measure("POA", lambda: am.geniStart(context, "bench"), opts.calls, opts.workers)
+    measure("SliceCredential", lambda: context.cf.getSliceCredentials(context, "bench"), opts.calls, opts.workers)
+
+    sys.stdout.write("server calls: %s\n" % (", ".join(["%s=%d" % kv for kv in sorted(srv.calls.items())])))
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# Copyright (c) 2025  Kent State University CAE-Netlab
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+# Build and serialize a large ProtoGENI request (nodes in a chain, plus a full mesh of hubs).
+
+import argparse
+import gc
+import io
+import sys
+import time
+
+import geni.rspec.pg as pg
+import geni.rspec.igext # pylint: disable=unused-import
+import geni.rspec.emulab # pylint: disable=unused-import
+
+IMAGE = "urn:publicid:IDN+emulab.net+image+emulab-ops:UBUNTU22-64-STD"
+
+def parse_args ():
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--nodes", type=int, default=10000, help="Nodes in the request")
+  parser.add_argument("--mesh", type=int, default=100, help="Hub nodes connected in a full mesh")
+  parser.add_argument("--rounds", type=int, default=3, help="Measured rounds (best is reported)")
+  return parser.parse_args()
+
+def best (func, rounds):
+  times = []
+  for _ in range(rounds):
+    gc.collect()
+    t = time.perf_counter()
+    func()
+    times.append(time.perf_counter() - t)
+  return min(times)
+
+def build_loop (opts):
+  req = pg.Request()
+  nodes = []
+  for idx in range(opts.nodes):
+    node = pg.RawPC("node-%d" % (idx))
+    node.disk_image = IMAGE
+    req.addResource(node)
+    nodes.append(node)
+  for (a, b) in zip(nodes, nodes[1:]):
+    req.addResource(pg.Link(members = [a, b]))
+  hubs = nodes[:opts.mesh]
+  for (idx, a) in enumerate(hubs):
+    for b in hubs[idx+1:]:
+      req.addResource(pg.Link(members = [a, b]))
+  return req
+
+def build_bulk (opts):
+  req = pg.Request()
+  nodes = req.addNodes(opts.nodes, disk_image = IMAGE)
+  req.connectLinear(nodes)
+  req.connectFullMesh(nodes[:opts.mesh])
+  return req
+
+def main ():
+  opts = parse_args()
+  req = build_bulk(opts)
+  links = len(req.resources) - opts.nodes
+
+  t = best(lambda: build_loop(opts), opts.rounds)
+  sys.stdout.write("build (loop)       %6d nodes %7d links  %8.3fs\n" % (opts.nodes, links, t))
+  t = best(lambda: build_bulk(opts), opts.rounds)
+  sys.stdout.write("build (addNodes)   %6d nodes %7d links  %8.3fs\n" % (opts.nodes, links, t))
+  t = best(req.toXMLString, opts.rounds)
+  sys.stdout.write("toXMLString                                 %8.3fs\n" % (t))
+  t = best(lambda: req.writeXMLStream(io.BytesIO()), opts.rounds)
+  sys.stdout.write("writeXMLStream                              %8.3fs\n" % (t))
+
+if __name__ == '__main__':
+  main()